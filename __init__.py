@@ -23,7 +23,7 @@ Reference Cameras add-on
 bl_info = {"name": "Reference Cameras Control Panel",
            "description": "Handles cameras associated with reference photos",
            "author": "Marcelo M. Marques (fork of Witold Jaworski's & Jayanam's projects)",
-           "version": (1, 0, 3),
+           "version": (1, 0, 4),
            "blender": (2, 80, 75),
            "location": "View3D > side panel ([N]), [Cameras] tab",
            "support": "COMMUNITY",
@@ -38,6 +38,12 @@ bl_info = {"name": "Reference Cameras Control Panel",
 # Note: Because the way Blender's Preferences window displays the Addon version number,
 # I am forced to keep this file in sync with the greatest version number of all modules.
 
+# v1.0.4 (10.18.2026)
+# Added: 'reference_alignment' module with the landmark reprojection error scorer for the memory slots
+# Added: 'reference_images' module with the cached edge maps of the reference photos
+# Added: 'bl_ui_shaders' module with the shared registry of builtin shaders for the widgets
+# Added: 'bl_ui_scroll_panel' module with the scrollable container widget, which only draws its visible child widgets
+
 # v1.0.3 (10.31.2021) - by Marcelo M. Marques
 # Chang: updated version with improvements and some clean up
 
@@ -57,6 +63,7 @@ import importlib
 modulesFullNames = {}
 
 modulesNames = ['prefs',
+                'bl_ui_widgets.bl_ui_shaders',
                 'bl_ui_widgets.bl_ui_draw_op',
                 'bl_ui_widgets.bl_ui_widget',
                 'bl_ui_widgets.bl_ui_label',
@@ -67,8 +74,11 @@ modulesNames = ['prefs',
                 'bl_ui_widgets.bl_ui_slider',
                 'bl_ui_widgets.bl_ui_tooltip',
                 'bl_ui_widgets.bl_ui_drag_panel',
+                'bl_ui_widgets.bl_ui_scroll_panel',
                 'addon.drag_panel_op',
                 'addon.reference_cameras',
+                'addon.reference_alignment',
+                'addon.reference_images',
                 ]
 
 for currentModuleName in modulesNames:
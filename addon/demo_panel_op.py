@@ -20,7 +20,7 @@
 bl_info = {"name": "BL UI Widgets",
            "description": "UI Widgets to draw in the 3D view",
            "author": "Marcelo M. Marques (fork of Jayanam's original project)",
-           "version": (1, 0, 2),
+           "version": (1, 0, 3),
            "blender": (2, 80, 75),
            "location": "View3D > viewport area",
            "support": "COMMUNITY",
@@ -32,6 +32,10 @@ bl_info = {"name": "BL UI Widgets",
 
 # --- ### Change log
 
+# v1.0.3 (10.18.2026)
+# Added: 'DP_Demo_Panel' class (derived from 'BL_UI_Widget_Tree') with the panel itself, whereas the operator now just
+#         creates it in 'create_tree' function, so that the demo panel can be open in several 3D views at once.
+
 # v1.0.2 (10.31.2021) - by Marcelo M. Marques
 # Added: 'valid_modes' property to indicate the 'bpy.context.mode' valid values for displaying the panel.
 # Added: 'suppress_rendering' function that can be optionally used to control render bypass of the panel widget.
@@ -57,7 +61,7 @@ from ..bl_ui_widgets.bl_ui_slider import BL_UI_Slider
 from ..bl_ui_widgets.bl_ui_textbox import BL_UI_Textbox
 from ..bl_ui_widgets.bl_ui_button import BL_UI_Button
 from ..bl_ui_widgets.bl_ui_tooltip import BL_UI_Tooltip
-from ..bl_ui_widgets.bl_ui_draw_op import BL_UI_OT_draw_operator
+from ..bl_ui_widgets.bl_ui_draw_op import BL_UI_OT_draw_operator, BL_UI_Widget_Tree
 from ..bl_ui_widgets.bl_ui_drag_panel import BL_UI_Drag_Panel
 
 
@@ -92,6 +96,14 @@ class DP_OT_draw_operator(BL_UI_OT_draw_operator):  # in: bl_ui_draw_op.py ##
         # Show this panel in View_3D only
         return (context.space_data.type == 'VIEW_3D')
 
+    # Overrides base class function
+    def create_tree(self, context):
+        return DP_Demo_Panel()
+
+
+class DP_Demo_Panel(BL_UI_Widget_Tree):  # in: bl_ui_draw_op.py ##
+
+    # --- methods
     def __init__(self):
 
         super().__init__()
@@ -355,7 +367,7 @@ class DP_OT_draw_operator(BL_UI_OT_draw_operator):  # in: bl_ui_draw_op.py ##
     def suppress_rendering(self, area, region):
         '''
             This is a special case 'overriding function' to allow subclass control for displaying (rendering) the panel.
-            Function is defined in class BL_UI_OT_draw_operator (bl_ui_draw_op.py) and available to be inherited here.
+            Function is defined in class BL_UI_Widget_Tree (bl_ui_draw_op.py) and available to be inherited here.
             If not included here the function in the superclass just returns 'False' and rendering is always executed.
             When 'True" is returned below, the rendering of the entire panel is bypassed and it is not drawn on screen.
         '''
@@ -364,7 +376,7 @@ class DP_OT_draw_operator(BL_UI_OT_draw_operator):  # in: bl_ui_draw_op.py ##
     def terminate_execution(self, area, region):
         '''
             This is a special case 'overriding function' to allow subclass control for terminating/closing the panel.
-            Function is defined in class BL_UI_OT_draw_operator (bl_ui_draw_op.py) and available to be inherited here.
+            Function is defined in class BL_UI_Widget_Tree (bl_ui_draw_op.py) and available to be inherited here.
             If not included here the function in the superclass just returns 'False' and no termination is executed.
             When 'True" is returned below, the execution is auto terminated and the 'Remote Control' panel closes itself.
         '''
@@ -23,7 +23,7 @@ Reference Cameras add-on
 bl_info = {"name": "BL UI Widgets",
            "description": "UI Widgets to draw in the 3D view",
            "author": "Marcelo M. Marques (fork of Jayanam's original project)",
-           "version": (1, 0, 2),
+           "version": (1, 0, 3),
            "blender": (2, 80, 75),
            "location": "View3D > viewport area",
            "support": "COMMUNITY",
@@ -35,6 +35,22 @@ bl_info = {"name": "BL UI Widgets",
 
 # --- ### Change log
 
+# v1.0.3 (10.18.2026)
+# Added: Diagnostic count of the draw calls issued per frame (only when DEBUG), to compare the panel with and without its merged batch.
+# Added: 'subscribe_states' function which binds the widgets to the 'scene.var' OpState/OpStatM properties by means of 'bpy.msgbus',
+#         so that their enabled/pressed changes are pushed as soon as they happen, instead of polled by the timer.
+# Added: 'states_changed' and 'scene_changed' msgbus notification functions, and 'on_finish' override to clear the subscriptions.
+# Chang: Turned off the 'idle_timer', so the modal timer only runs while a tooltip is counting down its delay to be painted.
+# Chang: 'on_finish' function saves the panel position, in case the panel gets closed while it is being dragged.
+# Added: 'DP_Remote_Control' class (derived from 'BL_UI_Widget_Tree') with the panel itself, whereas the operator now just
+#         creates it in 'create_tree' function, so that several Remote Control panels can be open in different 3D views.
+# Chang: The panel is 'reusable', that is, it is kept after closed and reopened without building its widgets again; the new
+#         'on_reuse' function takes the saved panel position again, and the widget states are rebound from 'scene.var'.
+# Added: Diagnostic measurement of the operator's invoke latency (only when DEBUG), to compare newly built and reopened panels.
+# Added: 'rebind_states' function with the buttons' enabled states and the Blink Mesh(es) text derived from 'scene.var', which are
+#         set when the panel is built, reused or notified of a change (these were left stale when a kept panel was reopened).
+# Added: Diagnostic run of the widgets geometry cache benchmark when a panel is newly built (only when DEBUG).
+
 # v1.0.2 (10.31.2021) - by Marcelo M. Marques
 # Added: 'valid_modes' property to indicate the 'bpy.context.mode' valid values for displaying the panel.
 # Added: 'suppress_rendering' function that can be optionally used to control render bypass of the panel widget.
@@ -54,13 +70,15 @@ bl_info = {"name": "BL UI Widgets",
 
 # --- ### Imports
 import bpy
+import time
 
 from bpy.types import Operator
 
+from ..bl_ui_widgets.bl_ui_widget import BL_UI_Widget, geometry_cache_benchmark
 from ..bl_ui_widgets.bl_ui_patch import BL_UI_Patch
 from ..bl_ui_widgets.bl_ui_button import BL_UI_Button
 from ..bl_ui_widgets.bl_ui_tooltip import BL_UI_Tooltip
-from ..bl_ui_widgets.bl_ui_draw_op import BL_UI_OT_draw_operator
+from ..bl_ui_widgets.bl_ui_draw_op import BL_UI_OT_draw_operator, BL_UI_Widget_Tree, get_3d_area_and_region
 from ..bl_ui_widgets.bl_ui_drag_panel import BL_UI_Drag_Panel
 
 # from . reference_cameras import get_target   # <-- not needed anymore but left as example
@@ -100,10 +118,35 @@ class DP_OT_draw_operator(BL_UI_OT_draw_operator):  # in: bl_ui_draw_op.py ##
         # Show this panel in View_3D only:
         return (context.space_data.type == 'VIEW_3D' and context.mode == 'OBJECT')
 
+    # Overrides base class function
+    def create_tree(self, context):
+        return DP_Remote_Control()
+
+    # Overrides base class function
+    def invoke(self, context, event):
+        if not DEBUG:
+            return super().invoke(context, event)
+        reused = bool(self.tree_cache.get(self.bl_idname))
+        start = time.perf_counter()
+        result = super().invoke(context, event)
+        print("Remote Control invoke latency: {0:.1f} ms".format((time.perf_counter() - start) * 1000),
+              "(reopened panel)" if reused else "(newly built panel)")
+        if not reused:
+            geometry_cache_benchmark()
+        return result
+
+
+class DP_Remote_Control(BL_UI_Widget_Tree):  # in: bl_ui_draw_op.py ##
+
+    # --- methods
     def __init__(self):
 
         super().__init__()
 
+        self.reusable = True    # Panel is kept after closed, so that reopening it does not need to build all widgets again
+        self.__draw_calls = 0   # Latest count of draw calls per frame (used only when DEBUG)
+        self.__msgbus_owner = object()  # Owner of the 'bpy.msgbus' subscriptions, so that those can be cleared at once
+
         package = __package__[0:__package__.find(".")]
 
         # The values assigned to the self.valid_modes variable below will be used to restrict panel display
@@ -189,7 +232,6 @@ class DP_OT_draw_operator(BL_UI_OT_draw_operator):  # in: bl_ui_draw_op.py ##
         self.button4.rounded_corners = (0, 0, 0, 0)
         self.button4.set_mouse_up(self.button4_click)
         self.button4.set_button_pressed(self.button4_pressed)
-        self.button4.enabled = (not bpy.context.scene.var.OpState9)
         self.button4.description = "(RY: Tilt) - Target LOCAL mode; Pivot Point Active Element"
         self.button4.python_cmd = "bpy.ops.object.ref_camera_panelbutton_tilt()"
         if self.button4_pressed(self.button4):
@@ -206,7 +248,6 @@ class DP_OT_draw_operator(BL_UI_OT_draw_operator):  # in: bl_ui_draw_op.py ##
         self.button5.set_button_pressed(self.button5_pressed)
         self.button5.description = "(GXYZ: Translation) - Camera+Target GLOBAL mode; Pivot Point Active Element"
         self.button5.python_cmd = "bpy.ops.object.ref_camera_panelbutton_move()"
-        self.button5.enabled = (not bpy.context.scene.var.OpState8)
         if self.button5_pressed(self.button5):
             self.button5.state = 3
         btnC += 1
@@ -219,7 +260,6 @@ class DP_OT_draw_operator(BL_UI_OT_draw_operator):  # in: bl_ui_draw_op.py ##
         self.button6.rounded_corners = (0, 0, 0, 0)
         self.button6.set_mouse_up(self.button6_click)
         self.button6.set_button_pressed(self.button6_pressed)
-        self.button6.enabled = (not bpy.context.scene.var.OpState9)
         self.button6.description = "(RXY: Rotation) - Camera+Target GLOBAL mode; Pivot Point Active Element"
         self.button6.python_cmd = "bpy.ops.object.ref_camera_panelbutton_roll()"
         if self.button6_pressed(self.button6):
@@ -377,6 +417,8 @@ class DP_OT_draw_operator(BL_UI_OT_draw_operator):  # in: bl_ui_draw_op.py ##
 
         self.tooltip = BL_UI_Tooltip()     # This is for displaying the widgets tooltips. Only need one instance!
 
+        self.rebind_states()
+
         # -----------
         if DEBUG:
             # Display an 'UNRegister' button on screen
@@ -413,16 +455,94 @@ class DP_OT_draw_operator(BL_UI_OT_draw_operator):  # in: bl_ui_draw_op.py ##
 
         self.init_widgets(context, widgets, self.valid_modes)
 
-        self.panel.add_widgets(widgets_items)
+        if not self.panel.widgets:
+            # Panel being reopened has its child widgets already
+            self.panel.add_widgets(widgets_items)
 
         self.panel.set_location(self.panel.x, self.panel.y)
 
+        # Widget states are pushed by msgbus notifications, so the timer is not needed to poll them
+        self.subscribe_states(context)
+        self.states_changed()
+        self.idle_timer = False
+
+    # Overrides base class function
+    def on_reuse(self, context):
+        # Widgets are kept as they were when closed, so the states derived from 'scene.var' must be rebound (e.g. these may have been
+        # changed from the N-panel meanwhile), and the panel position is taken again from the saved one (e.g. it may have been moved
+        # by another panel meanwhile)
+        self.rebind_states()
+        x, y = self.panel.saved_coords(self.panel.over_scale(self.panel.x), self.panel.over_scale(self.panel.y))
+        self.panel.x = x / self.panel.over_scale(1)
+        self.panel.y = y / self.panel.over_scale(1)
+        for widget in self.panel.widgets:
+            if isinstance(widget, BL_UI_Button):
+                # Pressed/up state as per the 'scene.var' property (e.g. it may have been changed from the N-panel meanwhile)
+                widget.mouse_up_over()
+
+    # Overrides base class function
+    def on_finish(self, context):
+        bpy.msgbus.clear_by_owner(self.__msgbus_owner)
+        self.panel.commit_panel_coords()
+        super().on_finish(context)
+
+    def subscribe_states(self, context):
+        # Note: msgbus only notifies the changes done via the RNA system (e.g. by our operators), which is the case for these properties
+        bpy.msgbus.clear_by_owner(self.__msgbus_owner)
+        var = context.scene.var
+        for name in ["OpState1", "OpState2", "OpState3", "OpState4", "OpState5", "OpState6", "OpState7", "OpState8", "OpState9",
+                     "OpStateA", "OpStateB", "OpStatM0", "OpStatM1", "OpStatM2", "OpStatM3"]:
+            bpy.msgbus.subscribe_rna(key=var.path_resolve(name, False), owner=self.__msgbus_owner, args=(), notify=self.states_changed)
+        # Subscriptions above are bound to this scene's properties, so they must be renewed when user switches to another scene
+        bpy.msgbus.subscribe_rna(key=(bpy.types.Window, "scene"), owner=self.__msgbus_owner, args=(), notify=self.scene_changed)
+
+    def scene_changed(self):
+        self.subscribe_states(bpy.context)
+        self.states_changed()
+
+    def rebind_states(self):
+        # Widget attributes which derive from the 'scene.var' properties, other than the pressed states (see 'mouse_up_over')
+        package = __package__[0:__package__.find(".")]
+        preferences = bpy.context.preferences.addons[package].preferences
+        self.button4.enabled = (not bpy.context.scene.var.OpState9)
+        self.button5.enabled = (not bpy.context.scene.var.OpState8)
+        self.button6.enabled = (not bpy.context.scene.var.OpState9)
+        if preferences.RC_BLINK_ALT and bpy.context.scene.var.OpStateB:
+            self.buttonA.text = "Display Meshes"
+        else:
+            self.buttonA.text = "Blink Mesh(es)"
+
+    def states_changed(self):
+        # Same work the timer used to do at every tick, but now only when some of the bound properties has changed
+        if self.finished:
+            return None
+        self.activate()
+        self.rebind_states()
+        for widget in self.widgets:
+            widget.timer_event_func(widget, None, 0, 0)
+            widget.verify_visual_state()
+        if self.redraw_needed():
+            area = get_3d_area_and_region()[0]
+            if area:
+                area.tag_redraw()
+
+    # Overrides base class function
+    def draw_callback_px(self, op, context):
+        if not DEBUG:
+            return super().draw_callback_px(op, context)
+        BL_UI_Widget.g_draw_calls = 0
+        super().draw_callback_px(op, context)
+        if BL_UI_Widget.g_draw_calls and BL_UI_Widget.g_draw_calls != self.__draw_calls:
+            self.__draw_calls = BL_UI_Widget.g_draw_calls
+            print("Remote Control draw calls per frame:", self.__draw_calls,
+                  "(merged batch)" if self.panel.merged_batch else "(one batch per widget)")
+
     # -- Helper function
 
     def suppress_rendering(self, area, region):
         '''
             This is a special case 'overriding function' to allow subclass control for displaying (rendering) the panel.
-            Function is defined in class BL_UI_OT_draw_operator (bl_ui_draw_op.py) and available to be inherited here.
+            Function is defined in class BL_UI_Widget_Tree (bl_ui_draw_op.py) and available to be inherited here.
             If not included here the function in the superclass just returns 'False' and rendering is always executed.
             When 'True" is returned below, the rendering of the entire panel is bypassed and it is not drawn on screen.
         '''
@@ -445,7 +565,7 @@ class DP_OT_draw_operator(BL_UI_OT_draw_operator):  # in: bl_ui_draw_op.py ##
     def terminate_execution(self, area, region):
         '''
             This is a special case 'overriding function' to allow subclass control for terminating/closing the panel.
-            Function is defined in class BL_UI_OT_draw_operator (bl_ui_draw_op.py) and available to be inherited here.
+            Function is defined in class BL_UI_Widget_Tree (bl_ui_draw_op.py) and available to be inherited here.
             If not included here the function in the superclass just returns 'False' and no termination is executed.
             When 'True" is returned below, the execution is auto terminated and the 'Remote Control' panel closes itself.
         '''
@@ -522,7 +642,7 @@ class DP_OT_draw_operator(BL_UI_OT_draw_operator):  # in: bl_ui_draw_op.py ##
         # Lock Position: Locks Target Position properties and disables impacted buttons
         # Good to prevent accidental changes in target placement
         bpy.ops.object.ref_camera_panelbutton_lpos()
-        self.button5.enabled = (not bpy.context.scene.var.OpState8)
+        self.rebind_states()
 
     def button8_pressed(self, widget):
         return (bpy.context.scene.var.OpState8)
@@ -531,8 +651,7 @@ class DP_OT_draw_operator(BL_UI_OT_draw_operator):  # in: bl_ui_draw_op.py ##
         # Lock Rotation: Locks Target Rotation properties and disables impacted buttons
         # Good to prevent accidental changes in target placement
         bpy.ops.object.ref_camera_panelbutton_lrot()
-        self.button4.enabled = (not bpy.context.scene.var.OpState9)
-        self.button6.enabled = (not bpy.context.scene.var.OpState9)
+        self.rebind_states()
 
     def button9_pressed(self, widget):
         return (bpy.context.scene.var.OpState9)
@@ -540,13 +659,8 @@ class DP_OT_draw_operator(BL_UI_OT_draw_operator):  # in: bl_ui_draw_op.py ##
     def buttonA_click(self, widget, event, x, y):
         # Blink Mesh(es): Turns mesh visibility on/off
         # Good to precisely eyeball superposition of fine mesh details against the image background
-        package = __package__[0:__package__.find(".")]
-        preferences = bpy.context.preferences.addons[package].preferences
         result = bpy.ops.object.ref_camera_panelbutton_flsh(mode='REMOTE')
-        if preferences.RC_BLINK_ALT and bpy.context.scene.var.OpStateB:
-            widget.text = "Display Meshes"
-        else:
-            widget.text = "Blink Mesh(es)"
+        self.rebind_states()
         if result == {'CANCELLED'}:
             package = __package__[0:__package__.find(".")]
             collect = bpy.context.preferences.addons[package].preferences.RC_MESHES
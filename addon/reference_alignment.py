@@ -0,0 +1,841 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+'''
+Reference Cameras add-on
+'''
+# --- ### Header
+bl_info = {"name": "Reference Cameras",
+           "description": "Measures how well the working meshes line up with the reference photos",
+           "author": "Marcelo M. Marques (fork of Witold Jaworski's project)",
+           "version": (1, 0, 4),
+           "blender": (2, 80, 75),
+           "location": "View3D > side panel ([N]), [Cameras] tab",
+           "support": "COMMUNITY",
+           "category": "3D View",
+           "warning": "Version numbering diverges from Witold's original project",
+           "doc_url": "http://airplanes3d.net/scripts-257_e.xml",
+           "tracker_url": "https://github.com/mmmrqs/Blender-Reference-Camera-Panel-addon/issues"
+           }
+
+# --- ### Change log
+
+# v1.0.4 (10.18.2026)
+# Added: initial creation
+# Added: Landmarks (mesh vertex <-> photo pixel pairs) stored per reference camera.
+# Added: Reprojection error scorer for the memory slots, vectorized with NumPy (one batched projection for all slots).
+# Added: Auto refine mode: NumPy scanline silhouette rasterizer scored against a mask image (IoU or chamfer), optimized with
+#        a time-sliced Nelder-Mead solver running in 'bpy.app.timers'. The result is saved in the next free memory slot.
+# Fixed: Landmarks on meshes with topology changing modifiers are scored from the original mesh vertices (see 'get_landmark_vertices'),
+#        since their vertex indexes do not match the evaluated mesh.
+# Fixed: Proxy mask cache is cleared at the start of each auto refine run, so an edited or reloaded mask image is not ignored.
+
+# --- ### Imports
+import time
+import bpy
+import numpy as np
+
+from bpy.props import StringProperty, IntProperty, FloatProperty, FloatVectorProperty, EnumProperty, PointerProperty
+from mathutils import Euler, Vector
+
+from .reference_cameras import RC_MESHES, find_collection, get_image, get_image_size, get_target, is_object_mode
+
+# --- ### Diagnostic flag
+DEBUG = 0  # Set it to 0 in the production version; 1 to see diagnostic messages
+
+
+# --- ### Memory slots identification (element[0] is the auto backup slot)
+MEMORY_SLOTS = (("MR", "OpStatM0", "object.ref_camera_panelbutton_mr"),
+                ("M1", "OpStatM1", "object.ref_camera_panelbutton_m1"),
+                ("M2", "OpStatM2", "object.ref_camera_panelbutton_m2"),
+                ("M3", "OpStatM3", "object.ref_camera_panelbutton_m3"),
+                )
+
+
+# --- ### Helper functions
+def get_evaluated_vertices(obj, depsgraph):
+    """ Returns a (N, 3) float array with the world coordinates of the evaluated (modifiers applied) mesh vertices
+        Arguments:
+            @obj (Object):          a mesh object
+            @depsgraph (Depsgraph): the evaluated dependency graph
+        Remarks:
+        Vertex coordinates are fetched in a single 'foreach_get' call and transformed to world space in one
+        matrix multiply, so that even meshes with millions of vertices are handled in a few milliseconds.
+    """
+    obj_eval = obj.evaluated_get(depsgraph)
+    mesh = obj_eval.to_mesh()
+    try:
+        coords = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+        mesh.vertices.foreach_get("co", coords)
+    finally:
+        obj_eval.to_mesh_clear()
+    coords = coords.reshape(-1, 3)
+    matrix = np.array(obj_eval.matrix_world, dtype=np.float32)
+    return coords @ matrix[:3, :3].T + matrix[:3, 3]
+
+
+def get_landmark_vertices(obj, depsgraph):
+    """ Returns a (N, 3) float array with the world coordinates of the vertices the landmarks' 'VertexIndex' refers to
+        Arguments:
+            @obj (Object):          a mesh object
+            @depsgraph (Depsgraph): the evaluated dependency graph
+        Remarks:
+        Landmark indexes are taken from the selection on the original mesh, so the evaluated mesh is only used when its
+        modifiers keep the same vertices (e.g. armature, shape keys); topology changing ones (e.g. decimate, remesh,
+        boolean) would make the index point at another vertex, so the original coordinates are used instead.
+    """
+    coords = get_evaluated_vertices(obj, depsgraph)
+    if len(coords) == len(obj.data.vertices):
+        return coords
+    coords = np.empty(len(obj.data.vertices) * 3, dtype=np.float32)
+    obj.data.vertices.foreach_get("co", coords)
+    coords = coords.reshape(-1, 3)
+    matrix = np.array(obj.matrix_world, dtype=np.float32)
+    return coords @ matrix[:3, :3].T + matrix[:3, 3]
+
+
+def get_image_frame(camera, scene):
+    """ Returns the (width, height) in pixels of the photo frame the landmarks refer to
+        Arguments:
+            @camera (Object):     a camera object
+            @scene (Scene):       scene with the render settings (used when the camera has no image)
+    """
+    image = get_image(camera)
+    if image:
+        size = get_image_size(image)
+        if size[0] > 0 and size[1] > 0:
+            return size
+    return (scene.render.resolution_x, scene.render.resolution_y)
+
+
+def track_to_rotation(camera_location, target_location, target_rotation):
+    """ Returns the 3x3 world rotation matrix of a camera driven by the addon's TRACK_TO constraint
+        Arguments:
+            @camera_location (Vector):  camera position
+            @target_location (Vector):  target position
+            @target_rotation (Euler):   target rotation (its Z axis is used as the camera 'up' axis)
+        Remarks:
+        Mirrors the constraint set up by 'CreateNewCameraSet' (track -Z, up Y, use_target_z), so that a pose
+        stored in a memory slot can be evaluated without touching the objects in the scene.
+    """
+    forward = np.array(target_location, dtype=np.float64) - np.array(camera_location, dtype=np.float64)
+    length = np.linalg.norm(forward)
+    z_axis = -forward / length if length > 0 else np.array((0.0, 0.0, 1.0))
+    up = np.array(Euler(target_rotation).to_matrix() @ Vector((0.0, 0.0, 1.0)), dtype=np.float64)
+    x_axis = np.cross(up, z_axis)
+    if np.linalg.norm(x_axis) < 1e-9:
+        # Looking straight along the target's Z axis: any horizontal direction will do
+        x_axis = np.cross((0.0, 1.0, 0.0), z_axis)
+    x_axis /= np.linalg.norm(x_axis)
+    y_axis = np.cross(z_axis, x_axis)
+    return np.column_stack((x_axis, y_axis, z_axis))
+
+
+def camera_intrinsics(camera_data, lens, width, height):
+    """ Returns the (3, 3) matrix that maps camera space points to photo pixels (origin at the top left corner)
+        Arguments:
+            @camera_data (Camera):  camera data block (sensor size, sensor fit and shift values are read from it)
+            @lens (float):          focal length in millimeters
+            @width (int):           frame width in pixels
+            @height (int):          frame height in pixels
+        Remarks:
+        The camera looks down its -Z axis, so the third row yields the (positive) depth of the point.
+    """
+    if camera_data.sensor_fit == 'VERTICAL':
+        sensor, size = camera_data.sensor_height, height
+    elif camera_data.sensor_fit == 'HORIZONTAL':
+        sensor, size = camera_data.sensor_width, width
+    else:
+        sensor, size = camera_data.sensor_width, max(width, height)
+    focal = lens / sensor * size
+    max_size = max(width, height)
+    cx = width / 2 - camera_data.shift_x * max_size
+    cy = height / 2 + camera_data.shift_y * max_size
+    return np.array(((focal, 0.0, -cx),
+                     (0.0, -focal, -cy),
+                     (0.0, 0.0, -1.0)), dtype=np.float64)
+
+
+def pose_projection(camera_location, target_location, target_rotation, lens, camera_data, width, height):
+    """ Returns the (3, 4) projection matrix for a camera/target rig pose
+        Arguments:
+            @camera_location (Vector):  camera position
+            @target_location (Vector):  target position
+            @target_rotation (Euler):   target rotation
+            @lens (float):              focal length in millimeters
+            @camera_data (Camera):      camera data block
+            @width (int):               frame width in pixels
+            @height (int):              frame height in pixels
+    """
+    rotation = track_to_rotation(camera_location, target_location, target_rotation)
+    extrinsics = np.empty((3, 4), dtype=np.float64)
+    extrinsics[:, :3] = rotation.T
+    extrinsics[:, 3] = -rotation.T @ np.array(camera_location, dtype=np.float64)
+    return camera_intrinsics(camera_data, lens, width, height) @ extrinsics
+
+
+def slot_projection(slot, camera_data, width, height):
+    """ Returns the (3, 4) projection matrix for the camera pose stored in a memory slot
+        Arguments:
+            @slot (RC_memory_slot): memory slot data
+            @camera_data (Camera):  camera data block
+            @width (int):           frame width in pixels
+            @height (int):          frame height in pixels
+    """
+    return pose_projection(slot.CameraLocation, slot.TargetLocation, slot.TargetRotation, slot.CameraLens,
+                           camera_data, width, height)
+
+
+def project_points(projections, points):
+    """ Projects all points through all cameras at once
+        Arguments:
+            @projections (ndarray): (S, 3, 4) stack of projection matrices
+            @points (ndarray):      (N, 3) world coordinates
+        Returns a tuple with the (S, N, 2) pixel coordinates and the (S, N) depths in front of each camera
+    """
+    homogeneous = np.empty((points.shape[0], 4), dtype=np.float64)
+    homogeneous[:, :3] = points
+    homogeneous[:, 3] = 1.0
+    projected = np.matmul(projections, homogeneous.T)  # (S, 3, N)
+    depth = projected[:, 2, :]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        pixels = projected[:, :2, :] / depth[:, np.newaxis, :]
+    return (np.transpose(pixels, (0, 2, 1)), depth)
+
+
+def reprojection_errors(projections, points, landmarks, diagonal):
+    """ Returns the RMS distance in pixels between the projected points and the landmarks, one value per projection
+        Arguments:
+            @projections (ndarray): (S, 3, 4) stack of projection matrices
+            @points (ndarray):      (N, 3) world coordinates of the landmark vertices
+            @landmarks (ndarray):   (N, 2) photo coordinates of the landmarks
+            @diagonal (float):      penalty (frame diagonal) applied to points that fall behind the camera
+    """
+    pixels, depth = project_points(projections, points)
+    distances = np.linalg.norm(pixels - landmarks[np.newaxis, :, :], axis=2)
+    distances = np.where(depth > 1e-6, distances, diagonal)
+    return np.sqrt(np.mean(np.square(distances), axis=1))
+
+
+def gather_landmarks(camera, context):
+    """ Returns a tuple with the (N, 3) world positions of the landmark vertices, their (N, 2) photo coordinates
+        and the number of landmarks that could not be resolved (mesh missing or vertex index out of range)
+        Arguments:
+            @camera (Object):     a reference camera object
+            @context (Context):   current context
+    """
+    depsgraph = context.evaluated_depsgraph_get()
+    vertices = {}
+    points = []
+    coords = []
+    skipped = 0
+    for landmark in camera.landmarks_collection:
+        if landmark.MeshName not in vertices:
+            obj = context.scene.objects.get(landmark.MeshName, None)
+            vertices[landmark.MeshName] = get_landmark_vertices(obj, depsgraph) if obj and obj.type == 'MESH' else None
+        mesh_vertices = vertices[landmark.MeshName]
+        if mesh_vertices is None or not (0 <= landmark.VertexIndex < len(mesh_vertices)):
+            skipped += 1
+            continue
+        points.append(mesh_vertices[landmark.VertexIndex])
+        coords.append(tuple(landmark.ImageCoord))
+    return (np.array(points, dtype=np.float64).reshape(-1, 3), np.array(coords, dtype=np.float64).reshape(-1, 2), skipped)
+
+
+def score_memory_slots(context):
+    """ Computes the landmark reprojection error of every used memory slot and stores it in its 'AlignScore' property.
+        Returns the number of landmarks that were skipped, or None when there is nothing to be scored.
+        Arguments:
+            @context (Context):   current context
+    """
+    scn = context.scene
+    camera = scn.camera
+    slots = [i for i, (name, flag, idname) in enumerate(MEMORY_SLOTS)
+             if i < len(scn.memory_slots_collection) and getattr(scn.var, flag)]
+    if not slots:
+        return None
+    start = time.perf_counter()
+    points, coords, skipped = gather_landmarks(camera, context)
+    if len(points) == 0:
+        return None
+    width, height = get_image_frame(camera, scn)
+    projections = np.stack([slot_projection(scn.memory_slots_collection[i], camera.data, width, height) for i in slots])
+    errors = reprojection_errors(projections, points, coords, float(np.hypot(width, height)))
+    for i, error in zip(slots, errors):
+        scn.memory_slots_collection[i].AlignScore = float(error)
+    if DEBUG > 0:
+        print(f"score_memory_slots: {len(points)} landmarks, {len(slots)} slots in {(time.perf_counter() - start) * 1000:.2f} ms")
+    return skipped
+
+
+def selected_vertex_index(obj):
+    """ Returns the index of the first selected vertex of a mesh object, or -1 when none is selected
+        Arguments:
+            @obj (Object):     a mesh object
+    """
+    mesh = obj.data
+    selection = np.empty(len(mesh.vertices), dtype=bool)
+    mesh.vertices.foreach_get("select", selection)
+    indices = np.flatnonzero(selection)
+    return int(indices[0]) if len(indices) else -1
+
+
+# --- ### Silhouette alignment
+PROXY_SIZE = 256        # Long side (in pixels) of the proxy resolution used for silhouettes and masks
+RASTER_CHUNK = 200000   # Max triangles rasterized at once (bounds the memory used by the span arrays)
+CHAMFER_SAMPLES = 400   # Max contour pixels sampled from each silhouette for the chamfer distance
+
+mask_cache = {}         # Proxy masks by (image name, proxy width, proxy height), for the running job only
+RefineJob = None        # The running auto-refine job (only one at a time)
+
+
+def proxy_frame(width, height):
+    """ Returns the (width, height) of the proxy resolution that keeps the frame aspect ratio
+        Arguments:
+            @width (int):     frame width in pixels
+            @height (int):    frame height in pixels
+    """
+    scale = PROXY_SIZE / max(width, height)
+    return (max(1, round(width * scale)), max(1, round(height * scale)))
+
+
+def get_silhouette_geometry(context):
+    """ Returns a tuple with the (N, 3) world vertex positions and the (T, 3) triangle indices of all meshes
+        in the RC_MESHES collection, or None when there are no meshes
+        Arguments:
+            @context (Context):   current context
+    """
+    rc = find_collection(context.scene.collection, RC_MESHES())
+    if not rc:
+        return None
+    depsgraph = context.evaluated_depsgraph_get()
+    points = []
+    triangles = []
+    offset = 0
+    for obj in rc.all_objects:
+        if obj.type != 'MESH':
+            continue
+        obj_eval = obj.evaluated_get(depsgraph)
+        mesh = obj_eval.to_mesh()
+        try:
+            mesh.calc_loop_triangles()
+            coords = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+            mesh.vertices.foreach_get("co", coords)
+            tris = np.empty(len(mesh.loop_triangles) * 3, dtype=np.int32)
+            mesh.loop_triangles.foreach_get("vertices", tris)
+        finally:
+            obj_eval.to_mesh_clear()
+        matrix = np.array(obj_eval.matrix_world, dtype=np.float32)
+        points.append(coords.reshape(-1, 3) @ matrix[:3, :3].T + matrix[:3, 3])
+        triangles.append(tris.reshape(-1, 3) + offset)
+        offset += len(coords) // 3
+    if offset == 0:
+        return None
+    return (np.concatenate(points), np.concatenate(triangles))
+
+
+def rasterize_silhouette(pixels, depth, triangles, width, height):
+    """ Returns a (height, width) boolean image with the silhouette of the projected triangles
+        Arguments:
+            @pixels (ndarray):      (N, 2) projected vertex positions (proxy pixels, origin at the top left corner)
+            @depth (ndarray):       (N) vertex depths in front of the camera
+            @triangles (ndarray):   (T, 3) vertex indices
+            @width (int):           proxy width in pixels
+            @height (int):          proxy height in pixels
+        Remarks:
+        Vectorized scanline fill: every triangle is expanded into the rows its pixel centers cover, the left/right
+        edge crossings of each row are computed at once, and the spans are written into a difference image that
+        a cumulative sum turns into coverage. Triangles touching the camera plane are dropped (no near clipping).
+    """
+    diff = np.zeros((height, width + 1), dtype=np.int32)
+    for start in range(0, len(triangles), RASTER_CHUNK):
+        tris = triangles[start:start + RASTER_CHUNK]
+        tris = tris[np.all(depth[tris] > 1e-6, axis=1)]
+        if len(tris) == 0:
+            continue
+        xs = pixels[tris, 0]  # (T, 3)
+        ys = pixels[tris, 1]
+        row_min = np.clip(np.ceil(ys.min(axis=1) - 0.5), 0, height).astype(np.int64)
+        row_max = np.clip(np.floor(ys.max(axis=1) - 0.5), -1, height - 1).astype(np.int64)
+        rows = np.maximum(row_max - row_min + 1, 0)
+        total = int(rows.sum())
+        if total == 0:
+            continue
+        # Expand each triangle into (triangle, row) pairs
+        owner = np.repeat(np.arange(len(tris)), rows)
+        first = np.cumsum(rows) - rows
+        row = row_min[owner] + (np.arange(total) - first[owner])
+        yc = row + 0.5
+        left = np.full(total, np.inf)
+        right = np.full(total, -np.inf)
+        for a, b in ((0, 1), (1, 2), (2, 0)):
+            xa, ya = xs[owner, a], ys[owner, a]
+            xb, yb = xs[owner, b], ys[owner, b]
+            crossing = ((ya <= yc) & (yc < yb)) | ((yb <= yc) & (yc < ya))
+            with np.errstate(divide='ignore', invalid='ignore'):
+                x = xa + (yc - ya) * (xb - xa) / (yb - ya)
+            left = np.where(crossing, np.minimum(left, x), left)
+            right = np.where(crossing, np.maximum(right, x), right)
+        valid = left <= right
+        col_start = np.clip(np.ceil(left[valid] - 0.5), 0, width).astype(np.int64)
+        col_end = np.clip(np.ceil(right[valid] - 0.5), 0, width).astype(np.int64)
+        row = row[valid]
+        filled = col_end > col_start
+        np.add.at(diff, (row[filled], col_start[filled]), 1)
+        np.add.at(diff, (row[filled], col_end[filled]), -1)
+    return np.cumsum(diff, axis=1)[:, :width] > 0
+
+
+def get_proxy_mask(image, width, height):
+    """ Returns a (height, width) boolean image with the mask downsampled to the proxy resolution
+        Arguments:
+            @image (Image):   mask image (white/opaque where the object is)
+            @width (int):     proxy width in pixels
+            @height (int):    proxy height in pixels
+    """
+    key = (image.name, width, height)
+    if key not in mask_cache:
+        size_x, size_y = image.size[0], image.size[1]
+        if size_x == 0 or size_y == 0:
+            return None
+        pixels = np.empty(size_x * size_y * 4, dtype=np.float32)
+        image.pixels.foreach_get(pixels)
+        pixels = pixels.reshape(size_y, size_x, 4)[::-1]  # Blender stores the bottom row first
+        rows = ((np.arange(height) + 0.5) * size_y / height).astype(np.int64)
+        cols = ((np.arange(width) + 0.5) * size_x / width).astype(np.int64)
+        sample = pixels[rows][:, cols]
+        mask_cache[key] = (sample[..., :3].mean(axis=2) * sample[..., 3]) > 0.5
+    return mask_cache[key]
+
+
+def silhouette_contour(mask):
+    """ Returns the (K, 2) pixel positions of the contour of a silhouette, subsampled to CHAMFER_SAMPLES points
+        Arguments:
+            @mask (ndarray):  (height, width) boolean image
+    """
+    inner = mask.copy()
+    inner[1:, :] &= mask[:-1, :]
+    inner[:-1, :] &= mask[1:, :]
+    inner[:, 1:] &= mask[:, :-1]
+    inner[:, :-1] &= mask[:, 1:]
+    points = np.argwhere(mask & ~inner).astype(np.float64)
+    if len(points) > CHAMFER_SAMPLES:
+        points = points[np.linspace(0, len(points) - 1, CHAMFER_SAMPLES).astype(np.int64)]
+    return points
+
+
+def silhouette_cost(silhouette, mask, metric):
+    """ Returns the alignment cost between a rendered silhouette and the mask (0 means perfect match)
+        Arguments:
+            @silhouette (ndarray):  (height, width) boolean image
+            @mask (ndarray):        (height, width) boolean image
+            @metric (string):       'IOU' for (1 - intersection over union); 'CHAMFER' for the symmetric
+                                    contour distance, in units of the proxy diagonal
+    """
+    if metric == 'CHAMFER':
+        a = silhouette_contour(silhouette)
+        b = silhouette_contour(mask)
+        if len(a) == 0 or len(b) == 0:
+            return 1.0
+        distances = np.linalg.norm(a[:, np.newaxis, :] - b[np.newaxis, :, :], axis=2)
+        chamfer = (distances.min(axis=1).mean() + distances.min(axis=0).mean()) / 2
+        return float(chamfer / np.hypot(*mask.shape))
+    union = np.count_nonzero(silhouette | mask)
+    if union == 0:
+        return 1.0
+    return 1.0 - np.count_nonzero(silhouette & mask) / union
+
+
+def nelder_mead(func, x0, steps, max_evals, tolerance=1e-4):
+    """ Derivative free minimizer written as a generator, so it can be time-sliced:
+        it yields after every evaluation of <func> and the caller decides when to resume.
+        Arguments:
+            @func (function):     cost function of one (n) float array
+            @x0 (ndarray):        starting point
+            @steps (ndarray):     initial simplex size along each axis
+            @max_evals (int):     evaluation budget
+            @tolerance (float):   stops when the spread of the simplex costs falls below this value
+    """
+    n = len(x0)
+    simplex = [np.array(x0, dtype=np.float64)]
+    for i in range(n):
+        x = simplex[0].copy()
+        x[i] += steps[i]
+        simplex.append(x)
+    values = []
+    for x in simplex:
+        values.append(func(x))
+        yield
+    evals = n + 1
+    while evals < max_evals:
+        order = np.argsort(values)
+        simplex = [simplex[i] for i in order]
+        values = [values[i] for i in order]
+        if values[-1] - values[0] < tolerance:
+            break
+        centroid = np.mean(simplex[:-1], axis=0)
+        reflected = centroid + (centroid - simplex[-1])
+        f_reflected = func(reflected)
+        evals += 1
+        yield
+        if f_reflected < values[0]:
+            expanded = centroid + 2 * (centroid - simplex[-1])
+            f_expanded = func(expanded)
+            evals += 1
+            yield
+            if f_expanded < f_reflected:
+                simplex[-1], values[-1] = expanded, f_expanded
+            else:
+                simplex[-1], values[-1] = reflected, f_reflected
+        elif f_reflected < values[-2]:
+            simplex[-1], values[-1] = reflected, f_reflected
+        else:
+            if f_reflected < values[-1]:
+                contracted = centroid + 0.5 * (reflected - centroid)
+            else:
+                contracted = centroid + 0.5 * (simplex[-1] - centroid)
+            f_contracted = func(contracted)
+            evals += 1
+            yield
+            if f_contracted < min(f_reflected, values[-1]):
+                simplex[-1], values[-1] = contracted, f_contracted
+            else:
+                # Shrink the whole simplex towards the best point
+                for i in range(1, n + 1):
+                    simplex[i] = simplex[0] + 0.5 * (simplex[i] - simplex[0])
+                    values[i] = func(simplex[i])
+                    evals += 1
+                    yield
+
+
+class Silhouette_Refine_Job():
+    """ State of an auto-refine run. The rig parameters being optimized are the camera and target
+        positions (in steps of 2% of their distance) and the lens (in steps of 2% of its length).
+    """
+
+    def __init__(self, context, metric, max_evals):
+        scn = context.scene
+        camera = scn.camera
+        target = get_target(camera)
+        self.scene_name = scn.name
+        self.camera_name = camera.name
+        self.metric = metric
+        self.evals = 0
+        self.max_evals = max_evals
+        self.camera_location = np.array(camera.location, dtype=np.float64)
+        self.camera_rotation = tuple(camera.rotation_euler)
+        self.target_location = np.array(target.location, dtype=np.float64)
+        self.target_rotation = tuple(target.rotation_euler)
+        self.lens = camera.data.lens
+        self.step = max(np.linalg.norm(self.camera_location - self.target_location), 1e-3) * 0.02
+        width, height = get_image_frame(camera, scn)
+        self.width, self.height = proxy_frame(width, height)
+        self.points, self.triangles = get_silhouette_geometry(context) or (None, None)
+        # Mask may have been repainted, reloaded or replaced since the former run
+        mask_cache.clear()
+        self.mask = get_proxy_mask(camera.alignment_mask, self.width, self.height)
+        self.camera_data = camera.data
+        self.best_x = np.zeros(7)
+        self.start_cost = None
+        self.best_cost = None
+        self.solver = nelder_mead(self.cost, self.best_x, np.ones(7), max_evals)
+
+    def pose(self, x):
+        return (self.camera_location + x[0:3] * self.step,
+                self.target_location + x[3:6] * self.step,
+                self.target_rotation,
+                self.lens * (1 + 0.02 * x[6]))
+
+    def cost(self, x):
+        camera_location, target_location, target_rotation, lens = self.pose(x)
+        projection = pose_projection(camera_location, target_location, target_rotation, lens,
+                                     self.camera_data, self.width, self.height)
+        pixels, depth = project_points(projection[np.newaxis], self.points)
+        silhouette = rasterize_silhouette(pixels[0], depth[0], self.triangles, self.width, self.height)
+        value = silhouette_cost(silhouette, self.mask, self.metric)
+        self.evals += 1
+        if self.start_cost is None:
+            self.start_cost = value
+        if self.best_cost is None or value < self.best_cost:
+            self.best_cost = value
+            self.best_x = np.array(x)
+        return value
+
+    def run(self, budget):
+        """ Runs solver iterations for up to <budget> seconds; returns False when the solver is finished """
+        start = time.perf_counter()
+        try:
+            while time.perf_counter() - start < budget:
+                next(self.solver)
+        except StopIteration:
+            return False
+        return True
+
+    def store_result(self):
+        """ Saves the best pose found in the next available memory slot; returns the slot number or 0 """
+        scn = bpy.data.scenes.get(self.scene_name, None)
+        if not scn or not scn.camera or scn.camera.name != self.camera_name:
+            return 0
+        for i, (name, flag, idname) in enumerate(MEMORY_SLOTS):
+            if i > 0 and not getattr(scn.var, flag):
+                break
+        else:
+            return 0
+        while len(scn.memory_slots_collection) <= i:
+            scn.memory_slots_collection.add()  # element[0]: Backup, then Slots 1 to 3
+        camera_location, target_location, target_rotation, lens = self.pose(self.best_x)
+        memory_slot = scn.memory_slots_collection[i]
+        memory_slot.CameraLens = lens
+        memory_slot.CameraLocation = camera_location
+        memory_slot.CameraRotation = self.camera_rotation
+        memory_slot.TargetLocation = target_location
+        memory_slot.TargetRotation = target_rotation
+        memory_slot.AlignScore = -1
+        setattr(scn.var, flag, True)
+        return i
+
+
+def refine_timer():
+    """ bpy.app.timers callback that time-slices the running auto-refine job to keep the viewport interactive """
+    global RefineJob
+    if RefineJob is None:
+        return None
+    try:
+        running = RefineJob.run(0.03)
+    except Exception as e:
+        print("**WARNING** Auto refine aborted:", e)
+        RefineJob = None
+        return None
+    for window in bpy.context.window_manager.windows:
+        for area in window.screen.areas:
+            if area.type == 'VIEW_3D':
+                area.tag_redraw()
+    if running:
+        return 0.01
+    slot = RefineJob.store_result()
+    if DEBUG > 0:
+        print(f"refine_timer: {RefineJob.evals} evals, cost {RefineJob.start_cost:.4f} -> {RefineJob.best_cost:.4f}, slot {slot}")
+    if not slot:
+        print("**WARNING** Auto refine result discarded: camera changed or no memory slot available")
+    RefineJob = None
+    return None
+
+
+# --- ### Properties
+class RC_landmark(bpy.types.PropertyGroup):
+    MeshName: StringProperty(default="")
+    VertexIndex: IntProperty(default=-1)
+    ImageCoord: FloatVectorProperty(size=2, default=(0, 0))  # Pixels on the photo, origin at the top left corner
+
+
+# --- ### Operators
+class RefCameraLandmark_ADD(bpy.types.Operator):
+    bl_idname = "object.ref_camera_landmark_add"
+    bl_label = "Add Landmark"
+    bl_description = "Pairs the selected vertex of the active mesh with a pixel position on the current reference photo"
+    # --- parameters
+    image_x: FloatProperty(name="Photo X", description="Horizontal pixel position on the photo (from the left edge)", default=0)
+    image_y: FloatProperty(name="Photo Y", description="Vertical pixel position on the photo (from the top edge)", default=0)
+
+    # --- Blender interface methods
+    @classmethod
+    def poll(cls, context):
+        obj = context.object
+        return (is_object_mode(context) and context.scene.camera is not None and obj is not None and obj.type == 'MESH')
+
+    def invoke(self, context, event):
+        # Input validation:
+        rc = find_collection(context.scene.collection, RC_MESHES())
+        if not rc or context.object.name not in rc.objects:
+            self.report(type={'ERROR'}, message="Active object is not in collection '" + RC_MESHES() + "'")
+            return {'CANCELLED'}
+        if selected_vertex_index(context.object) < 0:
+            self.report(type={'ERROR'}, message="Select a vertex of '" + context.object.name + "' in Edit Mode first")
+            return {'CANCELLED'}
+        return context.window_manager.invoke_props_dialog(self)
+
+    def execute(self, context):
+        index = selected_vertex_index(context.object)
+        if index < 0:
+            return {'CANCELLED'}
+        landmark = context.scene.camera.landmarks_collection.add()
+        landmark.MeshName = context.object.name
+        landmark.VertexIndex = index
+        landmark.ImageCoord = (self.image_x, self.image_y)
+        return {'FINISHED'}
+
+
+class RefCameraLandmark_CLR(bpy.types.Operator):
+    bl_idname = "object.ref_camera_landmark_clr"
+    bl_label = "Clear Landmarks"
+    bl_description = "Removes all landmarks of the current reference camera"
+
+    # --- Blender interface methods
+    @classmethod
+    def poll(cls, context):
+        return (is_object_mode(context) and context.scene.camera is not None and len(context.scene.camera.landmarks_collection) > 0)
+
+    def execute(self, context):
+        context.scene.camera.landmarks_collection.clear()
+        for slot in context.scene.memory_slots_collection:
+            slot.AlignScore = -1
+        return {'FINISHED'}
+
+
+class RefCameraPanelbutton_SCOR(bpy.types.Operator):
+    bl_idname = "object.ref_camera_panelbutton_scor"
+    bl_label = "Score Slots"
+    bl_description = "Measures the landmark reprojection error (RMS, in pixels) of every used memory slot"
+
+    # --- Blender interface methods
+    @classmethod
+    def poll(cls, context):
+        return (is_object_mode(context) and context.scene.camera is not None and len(context.scene.camera.landmarks_collection) > 0)
+
+    def execute(self, context):
+        skipped = score_memory_slots(context)
+        if skipped is None:
+            self.report(type={'ERROR'}, message="No memory slots in use or no valid landmarks for this camera")
+            return {'CANCELLED'}
+        if skipped:
+            self.report(type={'WARNING'}, message=str(skipped) + " landmark(s) ignored: mesh not found or vertex index out of range")
+        return {'FINISHED'}
+
+
+class RefCameraPanelbutton_RFIN(bpy.types.Operator):
+    bl_idname = "object.ref_camera_panelbutton_rfin"
+    bl_label = "Auto Refine"
+    bl_description = "Nudges the Camera+Target set to match the meshes silhouette with the camera's mask image.\n" +\
+                     "Runs in the background and saves the result in the next available memory slot"
+    # --- parameters
+    metric: EnumProperty(name="Metric", description="Silhouette comparison method",
+                         items=[('IOU', "IoU", "Intersection over union of silhouette and mask areas"),
+                                ('CHAMFER', "Chamfer", "Average distance between silhouette and mask contours")],
+                         default='IOU')
+    max_evals: IntProperty(name="Evaluations", description="Maximum number of silhouettes rendered", default=300, min=20, max=5000)
+
+    # --- Blender interface methods
+    @classmethod
+    def poll(cls, context):
+        camera = context.scene.camera
+        if RefineJob is not None:
+            return True  # Allows cancelling the running job
+        return (is_object_mode(context) and camera is not None and camera.alignment_mask is not None and
+                get_target(camera) is not None and not context.scene.var.OpStatM3)
+
+    def execute(self, context):
+        global RefineJob
+        if RefineJob is not None:
+            RefineJob = None
+            if bpy.app.timers.is_registered(refine_timer):
+                bpy.app.timers.unregister(refine_timer)
+            return {'FINISHED'}
+        job = Silhouette_Refine_Job(context, self.metric, self.max_evals)
+        if job.points is None:
+            self.report(type={'ERROR'}, message="Collection '" + RC_MESHES() + "' not found or it has no meshes")
+            return {'CANCELLED'}
+        if job.mask is None:
+            self.report(type={'ERROR'}, message="Mask image '" + context.scene.camera.alignment_mask.name + "' has no pixels")
+            return {'CANCELLED'}
+        RefineJob = job
+        bpy.app.timers.register(refine_timer, first_interval=0, persistent=False)
+        return {'FINISHED'}
+
+
+# --- ### Panels
+class OBJECT_PT_RefAlignment(bpy.types.Panel):
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_category = "Cameras"
+    bl_label = "Alignment"
+    bl_parent_id = "OBJECT_PT_CameraLens"
+    bl_options = {'DEFAULT_CLOSED'}
+
+    # --- methods
+    @classmethod
+    def poll(cls, context):
+        camera = context.scene.camera
+        return (context.mode == 'OBJECT' and camera is not None and camera.type == 'CAMERA' and
+                get_image(camera) is not None and get_target(camera) is not None)
+
+    def draw(self, context):
+        scn = context.scene
+        layout = self.layout
+        row = layout.row(align=True)
+        row.label(text="Landmarks: " + str(len(scn.camera.landmarks_collection)))
+        row.operator(RefCameraLandmark_ADD.bl_idname, text="", icon='ADD')
+        row.operator(RefCameraLandmark_CLR.bl_idname, text="", icon='X')
+
+        # -- one row per memory slot with its last computed score
+        box = layout.box()
+        for i, (name, flag, idname) in enumerate(MEMORY_SLOTS):
+            split = box.split(factor=0.35, align=True)
+            col = split.column()
+            col.enabled = getattr(scn.var, flag)
+            col.operator(idname, text=name)
+            score = -1
+            if col.enabled and i < len(scn.memory_slots_collection):
+                score = scn.memory_slots_collection[i].AlignScore
+            split.label(text=(f"{score:.2f} px" if score >= 0 else "--"))
+        layout.operator(RefCameraPanelbutton_SCOR.bl_idname, text="Score Slots")
+
+        # -- silhouette auto refine
+        layout.separator()
+        layout.prop(scn.camera, "alignment_mask", text="Mask")
+        if RefineJob is None:
+            layout.operator(RefCameraPanelbutton_RFIN.bl_idname, text="Auto Refine")
+        else:
+            layout.label(text=f"Refining... {RefineJob.evals}/{RefineJob.max_evals}  cost {RefineJob.best_cost or 0:.4f}")
+            layout.operator(RefCameraPanelbutton_RFIN.bl_idname, text="Cancel", icon='CANCEL')
+
+
+# --- ### Register
+from bpy.utils import unregister_class, register_class
+
+# List of the classes in this add-on to be registered in Blender API:
+classes = [RC_landmark,
+           RefCameraLandmark_ADD,
+           RefCameraLandmark_CLR,
+           RefCameraPanelbutton_SCOR,
+           RefCameraPanelbutton_RFIN,
+           OBJECT_PT_RefAlignment,
+           ]
+
+
+def register():
+    for cls in classes:
+        register_class(cls)
+    bpy.types.Object.landmarks_collection = bpy.props.CollectionProperty(type=RC_landmark)
+    bpy.types.Object.alignment_mask = PointerProperty(type=bpy.types.Image, name="Mask",
+                                                      description="Black & white image of the object silhouette on the reference photo")
+
+
+def unregister():
+    global RefineJob
+    RefineJob = None
+    if bpy.app.timers.is_registered(refine_timer):
+        bpy.app.timers.unregister(refine_timer)
+    mask_cache.clear()
+    del bpy.types.Object.landmarks_collection
+    del bpy.types.Object.alignment_mask
+    for cls in reversed(classes):
+        unregister_class(cls)
+
+
+if __name__ == '__main__':
+    register()
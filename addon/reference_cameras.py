@@ -23,7 +23,7 @@ Reference Cameras add-on
 bl_info = {"name": "Reference Cameras",
            "description": "Handles cameras associated with reference photos",
            "author": "Marcelo M. Marques (fork of Witold Jaworski's project)",
-           "version": (1, 0, 3),
+           "version": (1, 0, 4),
            "blender": (2, 80, 75),
            "location": "View3D > side panel ([N]), [Cameras] tab",
            "support": "COMMUNITY",
@@ -35,6 +35,14 @@ bl_info = {"name": "Reference Cameras",
 
 # --- ### Change log
 
+# v1.0.4 (10.18.2026)
+# Added: 'AlignScore' property to the memory slots (landmark reprojection error computed by 'reference_alignment.py').
+# Added: 'RC_CACHE_DIR' and 'RC_EDGE_SIZE' proxy-constants for the reference image processing in 'reference_images.py'.
+# Added: 'RC_PIXEL_CACHE', 'RC_PIXEL_FORMAT' and 'RC_PIXEL_SIZE' proxy-constants plus 'get_image_size' helper function.
+# Chang: 'SetReferenceCamera' fills the reference image from the decoded pixels cache when it is enabled in the preferences.
+# Chang: 'SetRemoteControl' opens one more Remote Control panel when it is already open in other 3D view(s) but not in this one,
+#         and the side panel button shows "Open Remote Control" in such 3D views.
+
 # v1.0.3 (10.31.2021) - by Marcelo M. Marques
 # Added: Additional operation mode for the 'Blink Mesh(es)' operator.
 # Chang: Renamed the 'unreg' class to 'Self_Unregister'.
@@ -79,6 +87,7 @@ from bpy.props import StringProperty, IntProperty, BoolProperty, FloatProperty,
 from bpy_extras.io_utils import ImportHelper
 
 # from . drag_panel_op import DP_OT_draw_operator  <-- not needed anymore but left as example
+from ..bl_ui_widgets.bl_ui_draw_op import BL_UI_OT_draw_operator
 
 # --- ### Diagnostic flag
 DEBUG = 0  # Set it to 0 in the production version; 1 to see diagnostic messages; 2 to enable PyDev debugger
@@ -208,6 +217,36 @@ def RC_ACTION_REMO():
     return (bpy.context.preferences.addons[package].preferences.RC_ACTION_REMO)
 
 
+def RC_CACHE_DIR():
+    """ Folder where processed reference images are cached between sessions (blank means Blender's user config folder) """
+    package = __package__[0:__package__.find(".")]
+    return (bpy.context.preferences.addons[package].preferences.RC_CACHE_DIR)
+
+
+def RC_EDGE_SIZE():
+    """ Maximum width or height, in pixels, of the edge maps computed from the reference images """
+    package = __package__[0:__package__.find(".")]
+    return (bpy.context.preferences.addons[package].preferences.RC_EDGE_SIZE)
+
+
+def RC_PIXEL_CACHE():
+    """ If (ON) the decoded pixels of the reference images are cached on disk and loaded from there when a camera is set """
+    package = __package__[0:__package__.find(".")]
+    return (bpy.context.preferences.addons[package].preferences.RC_PIXEL_CACHE)
+
+
+def RC_PIXEL_FORMAT():
+    """ Pixel format of the decoded images cache: {UINT8, FLOAT16} """
+    package = __package__[0:__package__.find(".")]
+    return (bpy.context.preferences.addons[package].preferences.RC_PIXEL_FORMAT)
+
+
+def RC_PIXEL_SIZE():
+    """ Maximum width or height, in pixels, of the cached decoded images (zero keeps full resolution) """
+    package = __package__[0:__package__.find(".")]
+    return (bpy.context.preferences.addons[package].preferences.RC_PIXEL_SIZE)
+
+
 # --- ### Helper functions
 def get_active_object(context=None):
     """ Returns current active object
@@ -328,6 +367,20 @@ def get_image(camera):
         return None
 
 
+def get_image_size(image):
+    """ Returns the (width, height) of the original image file
+        Arguments:
+            @image (Image):     a reference image
+        Remarks:
+        Reading 'image.size' makes Blender decode the whole file, so the size recorded when the image
+        was served from the decoded pixels cache (see 'reference_images.py') is used whenever available.
+    """
+    size = image.get("rc_size", None)
+    if size is not None:
+        return (size[0], size[1])
+    return (image.size[0], image.size[1])
+
+
 def get_target(camera):
     """ Returns the camera target object, or None
         Arguments:
@@ -470,6 +523,7 @@ class RC_memory_slot(bpy.types.PropertyGroup):
     CameraRotation: FloatVectorProperty(size=3, default=(0, 0, 0), subtype='EULER')
     TargetLocation: FloatVectorProperty(size=3, default=(0, 0, 0), subtype='TRANSLATION')
     TargetRotation: FloatVectorProperty(size=3, default=(0, 0, 0), subtype='EULER')
+    AlignScore: FloatProperty(default=-1)  # Reprojection error in pixels; negative means not scored yet
 
 
 class CustomSceneList(bpy.types.PropertyGroup):
@@ -909,6 +963,7 @@ def save_backup_slot():
     backup_slot.CameraRotation = camera.rotation_euler
     backup_slot.TargetLocation = target.location
     backup_slot.TargetRotation = target.rotation_euler
+    backup_slot.AlignScore = -1
 
 
 def restore_memory_slot(slot):
@@ -1052,6 +1107,7 @@ class RefCameraPanelbutton_MS(bpy.types.Operator):
         memory_slot.CameraRotation = camera.rotation_euler
         memory_slot.TargetLocation = target.location
         memory_slot.TargetRotation = target.rotation_euler
+        memory_slot.AlignScore = -1
         # If the new save is a copy of what was in the backup slot, then release the backup slot
         slot = scn.memory_slots_collection[0]
         if slot.CameraLens == camera.data.lens and \
@@ -1234,6 +1290,10 @@ class SetRemoteControl(bpy.types.Operator):
         return self.execute(context)
 
     def execute(self, context):
+        if context.scene.var.RemoVisible and not BL_UI_OT_draw_operator.panel_in_area(context.area):
+            # Remote Control is open in other 3D view(s) only, so one more panel is opened in this one
+            context.scene.var.objRemote = bpy.ops.object.dp_ot_draw_operator('INVOKE_DEFAULT')
+            return {'FINISHED'}
         if context.scene.var.RemoVisible:
             context.scene.var.btnRemoText = "Open Remote Control"
         else:
@@ -1270,6 +1330,7 @@ class SetReferenceCamera(bpy.types.Operator):
             return {'CANCELLED'}
 
     def execute(self, context):
+        previous = context.scene.camera
         # Make sure that everyting is deselected to avoid moving them by accident
         bpy.ops.object.select_all(action='DESELECT')
         # Make sure that all cameras and targets are hidden from view to leave a clean scene
@@ -1306,9 +1367,10 @@ class SetReferenceCamera(bpy.types.Operator):
         set_active_object(camera)  # This line works if the <camera> object is visible in viewport.
         bpy.ops.view3d.object_as_camera()
         # Update current render settings (it determines the camera screen size)
-        image = get_image(camera)
-        context.scene.render.resolution_x = image.size[0]  # size:x
-        context.scene.render.resolution_y = image.size[1]  # size:y
+        from .reference_images import swap_pixel_cache  # Imported here because that module imports this one
+        size = swap_pixel_cache(previous, camera)
+        context.scene.render.resolution_x = size[0]  # size:x
+        context.scene.render.resolution_y = size[1]  # size:y
         # Turn visibility for the related target/constraint
         target = get_target(camera)
         target.hide_set(False)
@@ -1586,7 +1648,10 @@ class OBJECT_PT_CameraLens(bpy.types.Panel):
 
             if RC_SUBP_MODE() != 'EXTENDED' or context.scene.var.RemoVisible:
                 # -- remote control switch button
-                op = layout.operator(SetRemoteControl.bl_idname, text=context.scene.var.btnRemoText)
+                if context.scene.var.RemoVisible and not BL_UI_OT_draw_operator.panel_in_area(context.area):
+                    op = layout.operator(SetRemoteControl.bl_idname, text="Open Remote Control")
+                else:
+                    op = layout.operator(SetRemoteControl.bl_idname, text=context.scene.var.btnRemoText)
 
             # If remote control is active suppress buttons on N-Panel
             if context.scene.var.RemoVisible:
@@ -0,0 +1,830 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+'''
+Reference Cameras add-on
+'''
+# --- ### Header
+bl_info = {"name": "Reference Cameras",
+           "description": "Processing of the reference photos (cached on disk between sessions)",
+           "author": "Marcelo M. Marques (fork of Witold Jaworski's project)",
+           "version": (1, 0, 4),
+           "blender": (2, 80, 75),
+           "location": "View3D > side panel ([N]), [Cameras] tab",
+           "support": "COMMUNITY",
+           "category": "3D View",
+           "warning": "Version numbering diverges from Witold's original project",
+           "doc_url": "http://airplanes3d.net/scripts-257_e.xml",
+           "tracker_url": "https://github.com/mmmrqs/Blender-Reference-Camera-Panel-addon/issues"
+           }
+
+# --- ### Change log
+
+# v1.0.4 (10.18.2026)
+# Added: initial creation
+# Added: Sobel edge maps of the reference photos (downsampled and computed in tiles), cached on disk by source hash.
+# Added: Button to swap the camera background between the photo and its edge map.
+# Added: Batch operator to precompute the edge maps of every camera in a group using a pool of worker threads.
+# Added: Per-camera lens distortion coefficients (k1, k2, p1, p2) and undistorted background image. The remap lookup tables
+#        are cached as memory-mapped .npy files per resolution (base grid) and per coefficients; results are cached on disk.
+# Added: Optional cache of decoded (and optionally downsampled) reference images as memory-mapped .npy files; used by
+#        'SetReferenceCamera' to fill the image with 'pixels.foreach_set' instead of decoding the original file.
+# Fixed: Lookup tables in the disk cache are limited to the most recently used ones, and .tmp files left behind are deleted.
+# Fixed: Cache folder is escaped in the pixels cache glob pattern, and processed images without a file are recognized by
+#        an 'rc_processed' property rather than by their name.
+
+# --- ### Imports
+import os
+import glob
+import time
+import hashlib
+import bpy
+import numpy as np
+
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from bpy.props import StringProperty, FloatProperty, PointerProperty
+
+from bpy.app.handlers import persistent
+from .reference_cameras import RC_CACHE_DIR, RC_EDGE_SIZE, RC_OPACITY, RC_DEPTH, RC_TEMP
+from .reference_cameras import RC_PIXEL_CACHE, RC_PIXEL_FORMAT, RC_PIXEL_SIZE
+from .reference_cameras import find_collection, get_image, get_target, is_object_mode
+
+# --- ### Diagnostic flag
+DEBUG = 0  # Set it to 0 in the production version; 1 to see diagnostic messages
+
+EDGE_TILE_ROWS = 256        # Rows of the downsampled image processed at once (bounds the temporary arrays)
+EDGE_FILE_SUFFIX = ".edges.png"
+UNDISTORT_FILE_SUFFIX = ".undistorted.png"
+REMAP_TILE_ROWS = 512       # Rows remapped at once when undistorting a photo
+REMAP_TABLE_COUNT = 4       # Lookup tables kept in the disk cache (the least recently used ones are deleted)
+TEMP_FILE_AGE = 3600        # Seconds after which an unfinished .tmp file in the disk cache is deemed left behind
+PIXEL_CACHE_SUFFIX = ".pixels.npy"
+PIXEL_CACHE_IMAGE = "RC:Cached Pixels"  # Single image shared by all cameras to hold the pixels loaded from the cache
+
+hash_cache = {}             # Source hashes by (file path, file size, modification time)
+
+
+# --- ### Helper functions
+def cache_folder():
+    """ Returns the folder where the processed images are cached (it is created when missing) """
+    if RC_CACHE_DIR():
+        folder = bpy.path.abspath(RC_CACHE_DIR())
+    else:
+        folder = os.path.join(bpy.utils.user_resource('CONFIG'), "reference_cameras_cache")
+    os.makedirs(folder, exist_ok=True)
+    return folder
+
+
+def source_hash(image):
+    """ Returns a hash of the image source contents (file or packed data), or None for generated images
+        Arguments:
+            @image (Image):     a Blender image
+        Remarks:
+        Hashing the encoded file is much cheaper than decoding it, and it is only done once per session
+        for each (path, size, modification time), so a renamed or moved photo keeps its cached results.
+    """
+    if image.packed_file:
+        key = ("packed", image.name, image.packed_file.size)
+        if key not in hash_cache:
+            hash_cache[key] = hashlib.sha1(image.packed_file.data).hexdigest()[:20]
+        return hash_cache[key]
+    path = bpy.path.abspath(image.filepath, library=image.library)
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    key = (path, stat.st_size, stat.st_mtime)
+    if key not in hash_cache:
+        sha1 = hashlib.sha1()
+        with open(path, 'rb') as file:
+            for block in iter(lambda: file.read(1 << 20), b''):
+                sha1.update(block)
+        hash_cache[key] = sha1.hexdigest()[:20]
+    return hash_cache[key]
+
+
+def decode_pixels(image):
+    """ Returns the flat float32 pixel array of an image (Blender decodes the file if needed)
+        Arguments:
+            @image (Image):     a Blender image
+    """
+    pixels = np.empty(image.size[0] * image.size[1] * image.channels, dtype=np.float32)
+    image.pixels.foreach_get(pixels)
+    return pixels
+
+
+def compute_edge_map(pixels, width, height, channels, max_size):
+    """ Returns a (height, width) uint8 Sobel gradient magnitude image, downsampled so that it fits in <max_size>
+        Arguments:
+            @pixels (ndarray):  flat float pixel array, as returned by 'decode_pixels'
+            @width (int):       image width in pixels
+            @height (int):      image height in pixels
+            @channels (int):    number of channels per pixel
+            @max_size (int):    maximum width or height of the result
+        Remarks:
+        Pure NumPy (no bpy calls), so it can safely run on worker threads. Both the grayscale/downsampling
+        and the Sobel stages run in bands of rows to bound the memory used by the temporary arrays.
+    """
+    factor = max(1, -(-max(width, height) // max_size))
+    out_w, out_h = width // factor, height // factor
+    source = pixels.reshape(height, width, channels)
+    gray = np.empty((out_h + 2, out_w + 2), dtype=np.float32)
+    band = EDGE_TILE_ROWS * factor
+    for r0 in range(0, out_h * factor, band):
+        r1 = min(r0 + band, out_h * factor)
+        tile = source[r0:r1, :out_w * factor]
+        if channels >= 3:
+            tile = tile[..., 0] * 0.2126 + tile[..., 1] * 0.7152 + tile[..., 2] * 0.0722
+        else:
+            tile = tile[..., 0]
+        tile = tile.reshape((r1 - r0) // factor, factor, out_w, factor).mean(axis=(1, 3))
+        gray[1 + r0 // factor:1 + r1 // factor, 1:-1] = tile
+    # Replicate the borders so that the frame edges do not show up as gradients
+    gray[0], gray[-1] = gray[1], gray[-2]
+    gray[:, 0], gray[:, -1] = gray[:, 1], gray[:, -2]
+    edges = np.empty((out_h, out_w), dtype=np.float32)
+    for r0 in range(0, out_h, EDGE_TILE_ROWS):
+        r1 = min(r0 + EDGE_TILE_ROWS, out_h)
+        p = gray[r0:r1 + 2]
+        gx = (p[:-2, 2:] + 2 * p[1:-1, 2:] + p[2:, 2:]) - (p[:-2, :-2] + 2 * p[1:-1, :-2] + p[2:, :-2])
+        gy = (p[2:, :-2] + 2 * p[2:, 1:-1] + p[2:, 2:]) - (p[:-2, :-2] + 2 * p[:-2, 1:-1] + p[:-2, 2:])
+        edges[r0:r1] = np.hypot(gx, gy)
+    scale = np.percentile(edges, 99.5)
+    if scale <= 0:
+        scale = 1.0
+    return (np.clip(edges / scale, 0, 1) * 255).astype(np.uint8)
+
+
+def edge_map_path(image):
+    """ Returns the cache file path for the edge map of an image, or None when it has no source to hash
+        Arguments:
+            @image (Image):     a Blender image
+    """
+    digest = source_hash(image)
+    if digest is None:
+        return None
+    return os.path.join(cache_folder(), f"{digest}_{RC_EDGE_SIZE()}{EDGE_FILE_SUFFIX}")
+
+
+def save_edge_map(edges, path):
+    """ Writes an edge map to disk as a grayscale PNG and returns it loaded as a Blender image
+        Arguments:
+            @edges (ndarray):   (height, width) uint8 edge map (bottom row first, as Blender stores pixels)
+            @path (string):     destination file path
+    """
+    height, width = edges.shape
+    rgba = np.ones((height, width, 4), dtype=np.float32)
+    rgba[..., :3] = (edges / 255.0)[..., np.newaxis]
+    image = bpy.data.images.new("edges", width, height, alpha=False)
+    try:
+        image.pixels.foreach_set(rgba.ravel())
+        image.filepath_raw = path
+        image.file_format = 'PNG'
+        image.save()
+    finally:
+        bpy.data.images.remove(image)
+    return bpy.data.images.load(path, check_existing=True)
+
+
+def get_edge_map(image, compute=True):
+    """ Returns the edge map of an image as a Blender image, from the disk cache whenever possible
+        Arguments:
+            @image (Image):     the reference photo
+            @compute (bool):    compute the edge map when it is not cached yet (otherwise returns None)
+    """
+    path = edge_map_path(image)
+    if path is None:
+        return None
+    if os.path.isfile(path):
+        return bpy.data.images.load(path, check_existing=True)
+    if not compute:
+        return None
+    start = time.perf_counter()
+    edges = compute_edge_map(decode_pixels(image), image.size[0], image.size[1], image.channels, RC_EDGE_SIZE())
+    if DEBUG > 0:
+        print(f"get_edge_map: '{image.name}' processed in {(time.perf_counter() - start) * 1000:.1f} ms")
+    return save_edge_map(edges, path)
+
+
+def get_processed_background(camera, suffix):
+    """ Returns the camera background image slot holding a processed version of the photo, or None
+        Arguments:
+            @camera (Object):     a camera object
+            @suffix (String):     cache file suffix identifying the kind of processing (edge map, undistorted, ...)
+        Remarks:
+        Images without a file (e.g. the cached pixels one) are recognized by the 'rc_processed' property instead,
+        which 'show_processed_background' sets; their names are not reliable, as any image could be named alike.
+    """
+    for bg in camera.data.background_images[1:]:
+        if bg.image and (bg.image.filepath.endswith(suffix) or bg.image.get("rc_processed") == suffix):
+            return bg
+    return None
+
+
+def get_edge_background(camera):
+    """ Returns the camera background image slot holding an edge map, or None
+        Arguments:
+            @camera (Object):     a camera object
+    """
+    return get_processed_background(camera, EDGE_FILE_SUFFIX)
+
+
+def show_processed_background(camera, image, suffix):
+    """ Displays a processed image as the camera background in place of the photo (slot 0 is kept untouched,
+        because it is how the reference cameras are recognized), or the photo itself when <image> is None
+        Arguments:
+            @camera (Object):     a camera object
+            @image (Image):       processed image, or None to display the original photo
+            @suffix (String):     cache file suffix of the processed image
+    """
+    bgs = camera.data.background_images
+    if image is not None:
+        image["rc_processed"] = suffix
+        bg = get_processed_background(camera, suffix)
+        if not bg:
+            bg = bgs.new()
+            bg.alpha = RC_OPACITY()
+            bg.display_depth = RC_DEPTH()
+            bg.frame_method = 'CROP'
+        bg.image = image
+    for i, bg in enumerate(bgs):
+        if i == 0:
+            bg.show_background_image = image is None
+        else:
+            bg.show_background_image = image is not None and bg.image == image
+
+
+def get_group_cameras(context, collect_name):
+    """ Returns the reference cameras (with background image and target) of the given collection
+        Arguments:
+            @context (Context):       current context
+            @collect_name (String):   collection name
+    """
+    collection = find_collection(context.scene.collection, collect_name)
+    if not collection:
+        return []
+    return [obj for obj in collection.objects if obj.type == 'CAMERA' and get_image(obj) and get_target(obj)]
+
+
+def get_camera_group(camera):
+    """ Returns the name of the collection (group) a reference camera belongs to, ignoring the working collection
+        Arguments:
+            @camera (Object):     a camera object
+    """
+    for col in camera.users_collection:
+        if not col.name.endswith(RC_TEMP()):
+            return col.name
+    return ""
+
+
+def distortion_coefficients(camera):
+    """ Returns the (k1, k2, p1, p2) lens distortion coefficients of a camera
+        Arguments:
+            @camera (Object):     a camera object
+    """
+    dist = camera.data.lens_distortion
+    return (dist.K1, dist.K2, dist.P1, dist.P2)
+
+
+def get_base_grid(width, height):
+    """ Returns the (3, height, width) memory-mapped array with the normalized x, y and r^2 of every pixel center
+        Arguments:
+            @width (int):     image width in pixels
+            @height (int):    image height in pixels
+        Remarks:
+        Coordinates are centered on the image and normalized by half of its longest side; y grows downwards
+        (OpenCV convention) while rows are stored bottom first, as in Blender's pixel buffers. The grid only
+        depends on the resolution, so it is shared by every set of coefficients.
+    """
+    path = os.path.join(cache_folder(), f"grid_{width}x{height}.npy")
+    if not os.path.isfile(path):
+        norm = max(width, height) / 2
+        temp = path + ".tmp"
+        grid = np.lib.format.open_memmap(temp, mode='w+', dtype=np.float32, shape=(3, height, width))
+        x = ((np.arange(width, dtype=np.float32) + 0.5) - width / 2) / norm
+        for r0 in range(0, height, REMAP_TILE_ROWS):
+            r1 = min(r0 + REMAP_TILE_ROWS, height)
+            y = (height / 2 - (np.arange(r0, r1, dtype=np.float32) + 0.5)) / norm
+            grid[0, r0:r1] = x[np.newaxis, :]
+            grid[1, r0:r1] = y[:, np.newaxis]
+            grid[2, r0:r1] = np.square(grid[0, r0:r1]) + np.square(grid[1, r0:r1])
+        grid.flush()
+        del grid
+        os.replace(temp, path)
+    return np.load(path, mmap_mode='r')
+
+
+def get_remap_table(width, height, coefficients):
+    """ Returns the (2, height, width) memory-mapped lookup table with the source pixel (x, y) to be sampled for
+        each pixel of the undistorted image (Brown-Conrady model)
+        Arguments:
+            @width (int):             image width in pixels
+            @height (int):            image height in pixels
+            @coefficients (tuple):    (k1, k2, p1, p2) distortion coefficients
+    """
+    k1, k2, p1, p2 = coefficients
+    path = os.path.join(cache_folder(), f"lut_{width}x{height}_{k1:+.6f}_{k2:+.6f}_{p1:+.6f}_{p2:+.6f}.npy")
+    if os.path.isfile(path):
+        os.utime(path)  # Most recently used tables are the ones kept by 'prune_remap_tables'
+    else:
+        grid = get_base_grid(width, height)
+        norm = max(width, height) / 2
+        temp = path + ".tmp"
+        table = np.lib.format.open_memmap(temp, mode='w+', dtype=np.float32, shape=(2, height, width))
+        for r0 in range(0, height, REMAP_TILE_ROWS):
+            r1 = min(r0 + REMAP_TILE_ROWS, height)
+            x, y, r2 = grid[0, r0:r1], grid[1, r0:r1], grid[2, r0:r1]
+            radial = 1 + r2 * (k1 + k2 * r2)
+            xd = x * radial + 2 * p1 * x * y + p2 * (r2 + 2 * x * x)
+            yd = y * radial + p1 * (r2 + 2 * y * y) + 2 * p2 * x * y
+            table[0, r0:r1] = xd * norm + width / 2 - 0.5
+            table[1, r0:r1] = height / 2 - yd * norm - 0.5
+        table.flush()
+        del table
+        os.replace(temp, path)
+        prune_remap_tables(path)
+    return np.load(path, mmap_mode='r')
+
+
+def prune_remap_tables(keep):
+    """ Deletes the least recently used lookup tables beyond 'REMAP_TABLE_COUNT' (each one takes 8 bytes per pixel,
+        so tuning the coefficients would fill the cache folder otherwise) and the .tmp files left behind by an
+        interrupted write
+        Arguments:
+            @keep (String):     path of the lookup table just written
+    """
+    folder = glob.escape(cache_folder())
+    tables = sorted((path for path in glob.glob(os.path.join(folder, "lut_*.npy")) if path != keep),
+                    key=os.path.getmtime, reverse=True)
+    temps = [path for path in glob.glob(os.path.join(folder, "*.tmp")) if time.time() - os.path.getmtime(path) > TEMP_FILE_AGE]
+    for path in tables[REMAP_TABLE_COUNT - 1:] + temps:
+        try:
+            os.remove(path)
+        except OSError:
+            pass  # Still memory-mapped (on Windows) or removed meanwhile; it goes on the next pruning
+
+
+def remap_pixels(pixels, width, height, channels, table):
+    """ Returns the flat float32 pixel array resampled (bilinear) through a lookup table;
+        pixels mapped from outside of the source are made transparent (or black without alpha)
+        Arguments:
+            @pixels (ndarray):  flat float pixel array, as returned by 'decode_pixels'
+            @width (int):       image width in pixels
+            @height (int):      image height in pixels
+            @channels (int):    number of channels per pixel
+            @table (ndarray):   (2, height, width) lookup table from 'get_remap_table'
+    """
+    source = pixels.reshape(height, width, channels)
+    result = np.zeros((height, width, channels), dtype=np.float32)
+    for r0 in range(0, height, REMAP_TILE_ROWS):
+        r1 = min(r0 + REMAP_TILE_ROWS, height)
+        mx, my = table[0, r0:r1], table[1, r0:r1]
+        valid = (mx >= 0) & (mx <= width - 1) & (my >= 0) & (my <= height - 1)
+        x0 = np.clip(np.floor(mx).astype(np.int64), 0, width - 2)
+        y0 = np.clip(np.floor(my).astype(np.int64), 0, height - 2)
+        fx = np.clip(mx - x0, 0, 1)[..., np.newaxis]
+        fy = np.clip(my - y0, 0, 1)[..., np.newaxis]
+        top = source[y0, x0] * (1 - fx) + source[y0, x0 + 1] * fx
+        bottom = source[y0 + 1, x0] * (1 - fx) + source[y0 + 1, x0 + 1] * fx
+        result[r0:r1] = np.where(valid[..., np.newaxis], top * (1 - fy) + bottom * fy, 0)
+    return result.ravel()
+
+
+def undistorted_path(image, coefficients):
+    """ Returns the cache file path for the undistorted version of an image, or None when it has no source to hash
+        Arguments:
+            @image (Image):           a Blender image
+            @coefficients (tuple):    (k1, k2, p1, p2) distortion coefficients
+    """
+    digest = source_hash(image)
+    if digest is None:
+        return None
+    k1, k2, p1, p2 = coefficients
+    return os.path.join(cache_folder(), f"{digest}_{k1:+.6f}_{k2:+.6f}_{p1:+.6f}_{p2:+.6f}{UNDISTORT_FILE_SUFFIX}")
+
+
+def get_undistorted_image(image, coefficients):
+    """ Returns the undistorted version of an image as a Blender image, from the disk cache whenever possible
+        Arguments:
+            @image (Image):           the reference photo
+            @coefficients (tuple):    (k1, k2, p1, p2) distortion coefficients
+    """
+    path = undistorted_path(image, coefficients)
+    if path is None:
+        return None
+    if not os.path.isfile(path):
+        start = time.perf_counter()
+        width, height, channels = image.size[0], image.size[1], image.channels
+        table = get_remap_table(width, height, coefficients)
+        pixels = remap_pixels(decode_pixels(image), width, height, channels, table)
+        result = bpy.data.images.new("undistorted", width, height, alpha=(channels == 4))
+        try:
+            if channels != 4:
+                rgba = np.ones((width * height, 4), dtype=np.float32)
+                rgba[:, :channels] = pixels.reshape(-1, channels)
+                pixels = rgba.ravel()
+            result.pixels.foreach_set(pixels)
+            result.filepath_raw = path
+            result.file_format = 'PNG'
+            result.save()
+        finally:
+            bpy.data.images.remove(result)
+        if DEBUG > 0:
+            print(f"get_undistorted_image: '{image.name}' processed in {(time.perf_counter() - start) * 1000:.1f} ms")
+    return bpy.data.images.load(path, check_existing=True)
+
+
+def pixel_cache_pattern(image):
+    """ Returns the glob pattern of the decoded pixels cache file of an image (for the current preferences),
+        or None when it has no source to hash. File names also carry the original image size: <hash>_<W>x<H>_...
+        Arguments:
+            @image (Image):     a Blender image
+    """
+    digest = source_hash(image)
+    if digest is None:
+        return None
+    # Folder is escaped, since a path holding '[' or ']' would otherwise never match
+    return os.path.join(glob.escape(cache_folder()), f"{digest}_*_{RC_PIXEL_FORMAT()}_{RC_PIXEL_SIZE()}{PIXEL_CACHE_SUFFIX}")
+
+
+def build_pixel_cache(image):
+    """ Decodes an image and writes its (optionally downsampled) RGBA pixels into a memory-mappable .npy file;
+        returns the file path or None when the image has no source to hash
+        Arguments:
+            @image (Image):     a Blender image
+    """
+    pattern = pixel_cache_pattern(image)
+    if pattern is None:
+        return None
+    width, height, channels = image.size[0], image.size[1], image.channels
+    max_size = RC_PIXEL_SIZE()
+    factor = max(1, -(-max(width, height) // max_size)) if max_size > 0 else 1
+    out_w, out_h = width // factor, height // factor
+    source = decode_pixels(image).reshape(height, width, channels)
+    path = os.path.join(cache_folder(), os.path.basename(pattern).replace("*", f"{width}x{height}"))
+    temp = path + ".tmp"
+    dtype = np.uint8 if RC_PIXEL_FORMAT() == 'UINT8' else np.float16
+    cache = np.lib.format.open_memmap(temp, mode='w+', dtype=dtype, shape=(out_h, out_w, 4))
+    band = REMAP_TILE_ROWS * factor
+    for r0 in range(0, out_h * factor, band):
+        r1 = min(r0 + band, out_h * factor)
+        tile = source[r0:r1, :out_w * factor]
+        if factor > 1:
+            tile = tile.reshape((r1 - r0) // factor, factor, out_w, factor, channels).mean(axis=(1, 3))
+        rgba = np.ones((tile.shape[0], out_w, 4), dtype=np.float32)
+        rgba[..., :min(channels, 4)] = tile[..., :4]
+        if channels < 3:
+            rgba[..., 1:3] = rgba[..., :1]  # Grayscale
+        if dtype == np.uint8:
+            rgba = np.round(np.clip(rgba, 0, 1) * 255)
+        cache[r0 // factor:r1 // factor] = rgba
+    cache.flush()
+    del cache
+    os.replace(temp, path)
+    return path
+
+
+def load_pixel_cache(image):
+    """ Fills the shared cache image with the cached pixels of an image and returns a tuple with the cache image
+        and the original (width, height), or None when there is no cache file for it yet
+        Arguments:
+            @image (Image):     a Blender image (it is not decoded)
+    """
+    pattern = pixel_cache_pattern(image)
+    files = glob.glob(pattern) if pattern else []
+    if not files:
+        return None
+    width, height = (int(v) for v in os.path.basename(files[0]).split("_")[1].split("x"))
+    cache = np.load(files[0], mmap_mode='r')
+    out_h, out_w = cache.shape[0], cache.shape[1]
+    is_float = cache.dtype != np.uint8
+    proxy = bpy.data.images.get(PIXEL_CACHE_IMAGE, None)
+    if proxy and (bool(proxy.is_float) != is_float):
+        bpy.data.images.remove(proxy)
+        proxy = None
+    if not proxy:
+        proxy = bpy.data.images.new(PIXEL_CACHE_IMAGE, out_w, out_h, alpha=True, float_buffer=is_float)
+    elif tuple(proxy.size) != (out_w, out_h):
+        proxy.scale(out_w, out_h)
+    proxy.colorspace_settings.name = image.colorspace_settings.name
+    pixels = np.asarray(cache, dtype=np.float32).ravel()
+    if not is_float:
+        pixels *= (1 / 255)
+    proxy.pixels.foreach_set(pixels)
+    proxy.update()
+    image["rc_size"] = (width, height)
+    return (proxy, (width, height))
+
+
+def release_pixel_cache(camera):
+    """ Drops the cached pixels background of a camera, displaying its original image again
+        Arguments:
+            @camera (Object):     a camera object
+    """
+    bg = get_processed_background(camera, PIXEL_CACHE_IMAGE)
+    if bg:
+        camera.data.background_images.remove(bg)
+        camera.data.background_images[0].show_background_image = True
+
+
+def swap_pixel_cache(previous, camera):
+    """ Called by 'SetReferenceCamera' when switching cameras: releases the cached pixels of the previous camera
+        and, when the cache is enabled, displays the new camera image from it. Returns the original image size.
+        Arguments:
+            @previous (Object):   camera that was active (can be None)
+            @camera (Object):     camera being activated
+        Remarks:
+        On a cache miss the image is decoded as usual and the cache file is written for the next time.
+    """
+    if previous and previous != camera and previous.type == 'CAMERA':
+        release_pixel_cache(previous)
+    image = get_image(camera)
+    if not RC_PIXEL_CACHE():
+        release_pixel_cache(camera)
+        if "rc_size" in image:
+            del image["rc_size"]
+        return (image.size[0], image.size[1])
+    try:
+        cached = load_pixel_cache(image)
+        if cached is None:
+            build_pixel_cache(image)
+            return (image.size[0], image.size[1])
+        show_processed_background(camera, cached[0], PIXEL_CACHE_IMAGE)
+        return cached[1]
+    except Exception as e:
+        print("**WARNING** Decoded pixels cache failed for image '" + image.name + "':", e)
+        release_pixel_cache(camera)
+        return (image.size[0], image.size[1])
+
+
+@persistent
+def reload_pixel_cache(arg):
+    """ load_post handler: the shared cache image is saved blank with the blend file, so refill it for the
+        active camera and restore the original images for any other camera still pointing at it
+    """
+    for scn in bpy.data.scenes:
+        for obj in scn.objects:
+            if obj.type == 'CAMERA' and obj != scn.camera:
+                release_pixel_cache(obj)
+        camera = scn.camera
+        if camera and camera.type == 'CAMERA' and get_processed_background(camera, PIXEL_CACHE_IMAGE):
+            cached = load_pixel_cache(get_image(camera)) if RC_PIXEL_CACHE() else None
+            if cached is None:
+                release_pixel_cache(camera)
+
+
+def benchmark_pixel_cache(image, repeat=3):
+    """ Diagnostic: prints the time taken to decode an image from its file versus loading it from the pixels cache
+        Arguments:
+            @image (Image):     a reference image
+            @repeat (int):      number of runs of each method (the best time is reported)
+    """
+    cold = []
+    for i in range(repeat):
+        image.reload()
+        start = time.perf_counter()
+        decode_pixels(image)
+        cold.append(time.perf_counter() - start)
+    if load_pixel_cache(image) is None:
+        build_pixel_cache(image)
+    hot = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        load_pixel_cache(image)
+        hot.append(time.perf_counter() - start)
+    result = (min(cold) * 1000, min(hot) * 1000)
+    print(f"benchmark_pixel_cache: '{image.name}' {image.size[0]}x{image.size[1]}  "
+          f"cold decode {result[0]:.1f} ms  /  cache hit {result[1]:.1f} ms  ({RC_PIXEL_FORMAT()}, max size {RC_PIXEL_SIZE()})")
+    return result
+
+
+# --- ### Properties
+class RC_lens_distortion(bpy.types.PropertyGroup):
+    K1: FloatProperty(name="K1", description="First radial distortion coefficient (negative for barrel, positive for pincushion)",
+                      default=0, soft_min=-1, soft_max=1, step=0.1, precision=4)
+    K2: FloatProperty(name="K2", description="Second radial distortion coefficient",
+                      default=0, soft_min=-1, soft_max=1, step=0.1, precision=4)
+    P1: FloatProperty(name="P1", description="First tangential distortion coefficient",
+                      default=0, soft_min=-0.1, soft_max=0.1, step=0.01, precision=5)
+    P2: FloatProperty(name="P2", description="Second tangential distortion coefficient",
+                      default=0, soft_min=-0.1, soft_max=0.1, step=0.01, precision=5)
+
+
+# --- ### Operators
+class RefCameraPanelbutton_EDGE(bpy.types.Operator):
+    bl_idname = "object.ref_camera_panelbutton_edge"
+    bl_label = "Edge Map"
+    bl_description = "Swaps the camera background between the reference photo and its edge map"
+
+    # --- Blender interface methods
+    @classmethod
+    def poll(cls, context):
+        camera = context.scene.camera
+        return (is_object_mode(context) and camera is not None and camera.type == 'CAMERA' and get_image(camera) is not None)
+
+    def execute(self, context):
+        camera = context.scene.camera
+        bg = get_edge_background(camera)
+        if bg and bg.show_background_image:
+            show_processed_background(camera, None, EDGE_FILE_SUFFIX)
+            return {'FINISHED'}
+        edge_map = get_edge_map(get_image(camera))
+        if edge_map is None:
+            self.report(type={'ERROR'}, message="Image '" + get_image(camera).name + "' has no source file to be processed")
+            return {'CANCELLED'}
+        show_processed_background(camera, edge_map, EDGE_FILE_SUFFIX)
+        return {'FINISHED'}
+
+
+class RefCameraPanelbutton_UNDS(bpy.types.Operator):
+    bl_idname = "object.ref_camera_panelbutton_unds"
+    bl_label = "Undistort"
+    bl_description = "Swaps the camera background between the reference photo and its undistorted version\n" +\
+                     "(using the lens distortion coefficients of this camera)"
+
+    # --- Blender interface methods
+    @classmethod
+    def poll(cls, context):
+        camera = context.scene.camera
+        return (is_object_mode(context) and camera is not None and camera.type == 'CAMERA' and get_image(camera) is not None)
+
+    def execute(self, context):
+        camera = context.scene.camera
+        image = get_image(camera)
+        coefficients = distortion_coefficients(camera)
+        bg = get_processed_background(camera, UNDISTORT_FILE_SUFFIX)
+        path = undistorted_path(image, coefficients)
+        # Pressing it again while the current coefficients are displayed turns it off
+        if bg and bg.show_background_image and bg.image.filepath == path:
+            show_processed_background(camera, None, UNDISTORT_FILE_SUFFIX)
+            return {'FINISHED'}
+        if not any(coefficients):
+            show_processed_background(camera, None, UNDISTORT_FILE_SUFFIX)
+            self.report(type={'INFO'}, message="No lens distortion set for this camera")
+            return {'CANCELLED'}
+        undistorted = get_undistorted_image(image, coefficients)
+        if undistorted is None:
+            self.report(type={'ERROR'}, message="Image '" + image.name + "' has no source file to be processed")
+            return {'CANCELLED'}
+        show_processed_background(camera, undistorted, UNDISTORT_FILE_SUFFIX)
+        return {'FINISHED'}
+
+
+# This class only registers when DEBUG > 0
+class RefCameraPixelCache_BENCH(bpy.types.Operator):
+    bl_idname = "object.ref_camera_pixel_cache_bench"
+    bl_label = "Benchmark Pixels Cache"
+    bl_description = "Compares decoding the current reference image against loading it from the decoded pixels cache"
+
+    # --- Blender interface methods
+    @classmethod
+    def poll(cls, context):
+        camera = context.scene.camera
+        return (camera is not None and camera.type == 'CAMERA' and get_image(camera) is not None)
+
+    def execute(self, context):
+        cold, hot = benchmark_pixel_cache(get_image(context.scene.camera))
+        self.report(type={'INFO'}, message=f"Cold decode {cold:.1f} ms / cache hit {hot:.1f} ms")
+        return {'FINISHED'}
+
+
+class RefCameraEdgeMaps_BATCH(bpy.types.Operator):
+    bl_idname = "object.ref_camera_edge_maps_batch"
+    bl_label = "Precompute Edge Maps"
+    bl_description = "Computes and caches the edge maps for all reference cameras of this group"
+    # --- parameters
+    collect_name: StringProperty(name="collection", description="name of the camera group collection", default="")
+
+    # --- Blender interface methods
+    @classmethod
+    def poll(cls, context):
+        return is_object_mode(context)
+
+    def execute(self, context):
+        cameras = get_group_cameras(context, self.collect_name)
+        if not cameras:
+            self.report(type={'ERROR'}, message="No reference cameras found in collection '" + self.collect_name + "'")
+            return {'CANCELLED'}
+        start = time.perf_counter()
+        workers = max(1, (os.cpu_count() or 2) - 1)
+        max_size = RC_EDGE_SIZE()
+        cached = 0
+        computed = 0
+        pending = {}
+        wm = context.window_manager
+        wm.progress_begin(0, len(cameras))
+        # NumPy releases the GIL in its number crunching, so threads scale over the cores while
+        # every bpy call (decoding, saving) stays on the main thread, as Blender requires.
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for i, camera in enumerate(cameras):
+                image = get_image(camera)
+                path = edge_map_path(image)
+                if path is None or os.path.isfile(path):
+                    cached += 1
+                    continue
+                pixels = decode_pixels(image)
+                future = pool.submit(compute_edge_map, pixels, image.size[0], image.size[1], image.channels, max_size)
+                pending[future] = path
+                # Keep the number of decoded photos held in memory bounded
+                while len(pending) >= workers:
+                    done, not_done = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        save_edge_map(future.result(), pending.pop(future))
+                        computed += 1
+                wm.progress_update(i)
+            for future in list(pending):
+                save_edge_map(future.result(), pending.pop(future))
+                computed += 1
+        wm.progress_end()
+        if DEBUG > 0:
+            print(f"RefCameraEdgeMaps_BATCH: {computed} computed, {cached} cached in {time.perf_counter() - start:.2f} s")
+        self.report(type={'INFO'}, message=f"Edge maps: {computed} computed, {cached} already cached")
+        return {'FINISHED'}
+
+
+# --- ### Panels
+class OBJECT_PT_RefImages(bpy.types.Panel):
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_category = "Cameras"
+    bl_label = "Reference Image"
+    bl_parent_id = "OBJECT_PT_CameraLens"
+    bl_options = {'DEFAULT_CLOSED'}
+
+    # --- methods
+    @classmethod
+    def poll(cls, context):
+        camera = context.scene.camera
+        return (context.mode == 'OBJECT' and camera is not None and camera.type == 'CAMERA' and get_image(camera) is not None)
+
+    def draw(self, context):
+        camera = context.scene.camera
+        layout = self.layout
+        bg = get_edge_background(camera)
+        showing_edges = bool(bg and bg.show_background_image)
+        row = layout.row(align=True)
+        row.operator(RefCameraPanelbutton_EDGE.bl_idname, text="Edge Map", depress=showing_edges)
+        op = row.operator(RefCameraEdgeMaps_BATCH.bl_idname, text="", icon='FILE_REFRESH')
+        op.collect_name = get_camera_group(camera)
+
+        # -- lens distortion
+        box = layout.box()
+        box.label(text="Lens distortion:")
+        flow = box.grid_flow(row_major=True, columns=2, even_columns=True, align=True)
+        dist = camera.data.lens_distortion
+        flow.prop(dist, "K1")
+        flow.prop(dist, "K2")
+        flow.prop(dist, "P1")
+        flow.prop(dist, "P2")
+        bg = get_processed_background(camera, UNDISTORT_FILE_SUFFIX)
+        box.operator(RefCameraPanelbutton_UNDS.bl_idname, text="Undistort", depress=bool(bg and bg.show_background_image))
+        if DEBUG:
+            layout.operator(RefCameraPixelCache_BENCH.bl_idname, text="Benchmark Pixels Cache")
+
+
+# --- ### Register
+from bpy.utils import unregister_class, register_class
+
+# List of the classes in this add-on to be registered in Blender API:
+classes = [RC_lens_distortion,
+           RefCameraPanelbutton_EDGE,
+           RefCameraPanelbutton_UNDS,
+           RefCameraEdgeMaps_BATCH,
+           OBJECT_PT_RefImages,
+           ]
+if DEBUG:
+    classes.append(RefCameraPixelCache_BENCH)  # For debugging purposes this can be helpful
+
+
+def register():
+    for cls in classes:
+        register_class(cls)
+    bpy.types.Camera.lens_distortion = PointerProperty(type=RC_lens_distortion)
+    bpy.app.handlers.load_post.append(reload_pixel_cache)
+
+
+def unregister():
+    hash_cache.clear()
+    bpy.app.handlers.load_post.remove(reload_pixel_cache)
+    del bpy.types.Camera.lens_distortion
+    for cls in reversed(classes):
+        unregister_class(cls)
+
+
+if __name__ == '__main__':
+    register()
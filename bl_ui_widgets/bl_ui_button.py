@@ -20,7 +20,7 @@
 bl_info = {"name": "BL UI Widgets",
            "description": "UI Widgets to draw in the 3D view",
            "author": "Marcelo M. Marques (fork of Jayanam's original project)",
-           "version": (1, 0, 2),
+           "version": (1, 0, 3),
            "blender": (2, 80, 75),
            "location": "View3D > viewport area",
            "support": "COMMUNITY",
@@ -32,6 +32,13 @@ bl_info = {"name": "BL UI Widgets",
 
 # --- ### Change log
 
+# v1.0.3 (10.18.2026)
+# Chang: Renamed 'set_colors' function to 'get_bg_color' which now returns the color instead of setting the shader uniform,
+#         so that the container panel can also use it to paint the button in its merged batch.
+# Chang: 'draw_text' function now takes the text measurements from the shared 'text_dimensions' cache.
+# Added: 'visual_state' function override to include the button state, texts and pressed mode, so it only gets repainted on changes.
+# Chang: Theme and ui style are now taken by 'current_theme' and 'current_ui_style' functions (i.e. from the draw pass snapshot).
+
 # v1.0.2 (10.31.2021) - by Marcelo M. Marques
 # Chang: improved reliability on 'mouse_down' and 'mouse_up' overridable functions by conditioning the returned value
 
@@ -71,10 +78,10 @@ bl_info = {"name": "BL UI Widgets",
 
 # --- ### Imports
 import bpy
-import blf
 
 from . bl_ui_patch import BL_UI_Patch
 from . bl_ui_label import BL_UI_Label
+from . bl_ui_widget import text_dimensions
 
 
 class BL_UI_Button(BL_UI_Patch):
@@ -286,10 +293,10 @@ class BL_UI_Button(BL_UI_Patch):
         self._textpos = [x, y]
 
     # Overrides base class function
-    def set_colors(self):
+    def get_bg_color(self):
         if not self._is_enabled:
             if self._bg_color is None:
-                theme = bpy.context.preferences.themes[0]
+                theme = self.current_theme()
                 widget_style = getattr(theme.user_interface, self.my_style())
                 color = widget_style.inner
             else:
@@ -300,7 +307,7 @@ class BL_UI_Button(BL_UI_Patch):
             # Up
             if self.__state == 0:
                 if self._bg_color is None:
-                    theme = bpy.context.preferences.themes[0]
+                    theme = self.current_theme()
                     widget_style = getattr(theme.user_interface, self.my_style())
                     color = widget_style.inner
                 else:
@@ -308,7 +315,7 @@ class BL_UI_Button(BL_UI_Patch):
             # Down
             elif self.__state == 1:
                 if self._selected_color is None:
-                    theme = bpy.context.preferences.themes[0]
+                    theme = self.current_theme()
                     widget_style = getattr(theme.user_interface, self.my_style())
                     color = widget_style.inner_sel
                 else:
@@ -316,7 +323,7 @@ class BL_UI_Button(BL_UI_Patch):
             # Hover
             elif self.__state == 2:
                 if self._bg_color is None:
-                    theme = bpy.context.preferences.themes[0]
+                    theme = self.current_theme()
                     widget_style = getattr(theme.user_interface, self.my_style())
                     color = widget_style.inner
                 else:
@@ -326,7 +333,7 @@ class BL_UI_Button(BL_UI_Patch):
             # Pressed
             elif self.__state == 3:
                 if self._selected_color is None:
-                    theme = bpy.context.preferences.themes[0]
+                    theme = self.current_theme()
                     widget_style = getattr(theme.user_interface, self.my_style())
                     color = widget_style.inner_sel
                 else:
@@ -334,7 +341,7 @@ class BL_UI_Button(BL_UI_Patch):
             # Hover++ (special case used by 'NUMBER_CLICK' sliders only); this is similar to __state == 2
             elif self.__state == 4:
                 if self._bg_color is None:
-                    theme = bpy.context.preferences.themes[0]
+                    theme = self.current_theme()
                     widget_style = getattr(theme.user_interface, self.my_style())
                     basecolor = widget_style.inner
                 else:
@@ -345,7 +352,7 @@ class BL_UI_Button(BL_UI_Patch):
             # Down++ (special case used by 'NUMBER_CLICK' sliders only); this is similar to __state == 1
             elif self.__state == 5:
                 if self._selected_color is None:
-                    theme = bpy.context.preferences.themes[0]
+                    theme = self.current_theme()
                     widget_style = getattr(theme.user_interface, self.my_style())
                     basecolor = widget_style.inner_sel
                 else:
@@ -354,7 +361,7 @@ class BL_UI_Button(BL_UI_Patch):
                 color = self.tint_color(basecolor, (0.2 if basecolor[0] < 0.5 else 0.1))
                 color = self.tint_color(color, (0.2 if basecolor[0] < 0.5 else 0.1))
 
-        self.shader.uniform_float("color", color)
+        return color
 
     # Overrides base class function
     def draw_text(self):
@@ -364,7 +371,7 @@ class BL_UI_Button(BL_UI_Patch):
         if self._text == "" and self._textwo == "":
             return
 
-        theme = bpy.context.preferences.themes[0]
+        theme = self.current_theme()
         widget_style = getattr(theme.user_interface, self.my_style())
 
         if self._is_enabled and (self.button_pressed_func(self) or self.__state in [1, 3, 5]):
@@ -374,7 +381,7 @@ class BL_UI_Button(BL_UI_Patch):
             text_color = tuple(widget_style.text) + (1.0,) if self._text_color is None else self._text_color
             textwo_color = tuple(widget_style.text) + (1.0,) if self._textwo_color is None else self._textwo_color
 
-        theme = bpy.context.preferences.ui_styles[0]
+        theme = self.current_ui_style()
         widget_style = getattr(theme, "widget")
 
         if self._text_size is None:
@@ -389,15 +396,11 @@ class BL_UI_Button(BL_UI_Patch):
             text_kerning = False
         else:
             text_kerning = (widget_style.font_kerning_style == 'FITTED') if self._text_kerning is None else self._text_kerning
-            if text_kerning:
-                blf.enable(0, blf.KERNING_DEFAULT)
 
-        blf.size(0, leveraged_text_size, 72)
-        normal1 = blf.dimensions(0, "W")[1]  # This is to keep a regular pattern since letters differ in height
+        normal1 = text_dimensions(0, leveraged_text_size, text_kerning, "W")[1]  # This is to keep a regular pattern since letters differ in height
 
-        blf.size(0, scaled_size, 72)
-        length1 = blf.dimensions(0, self._text)[0]
-        height1 = blf.dimensions(0, "W")[1]
+        length1 = text_dimensions(0, scaled_size, text_kerning, self._text)[0]
+        height1 = text_dimensions(0, scaled_size, text_kerning, "W")[1]
 
         if self._textwo != "":
             if self._textwo_size is None:
@@ -407,19 +410,14 @@ class BL_UI_Button(BL_UI_Patch):
                 textwo_size = self._textwo_size
                 leveraged_text_size = self.leverage_text_size(textwo_size, "widget")
             scaled_size = int(self.over_scale(leveraged_text_size))
-            blf.size(0, leveraged_text_size, 72)
-            normal2 = blf.dimensions(0, "W")[1]  # This is to keep a regular pattern since letters differ in height
-            blf.size(0, scaled_size, 72)
-            length2 = blf.dimensions(0, self._textwo)[0]
-            height2 = blf.dimensions(0, "W")[1]
+            normal2 = text_dimensions(0, leveraged_text_size, text_kerning, "W")[1]  # This is to keep a regular pattern since letters differ in height
+            length2 = text_dimensions(0, scaled_size, text_kerning, self._textwo)[0]
+            height2 = text_dimensions(0, scaled_size, text_kerning, "W")[1]
         else:
             normal2 = 0
             length2 = 0
             height2 = 0
 
-        if text_kerning:
-            blf.disable(0, blf.KERNING_DEFAULT)
-
         if self._text == "" or self._textwo == "":
             middle_gap = 0
         else:
@@ -517,6 +515,10 @@ class BL_UI_Button(BL_UI_Patch):
             label.context_it(self.context)
             label.draw()
 
+    # Overrides base class function
+    def visual_state(self):
+        return super().visual_state() + (self.__state, self._text, self._textwo, self.button_pressed_func(self) == True)
+
     # Overrides base class function
     def mouse_down(self, event, x, y):
         if self.is_in_rect(x, y):
@@ -20,7 +20,7 @@
 bl_info = {"name": "BL UI Widgets",
            "description": "UI Widgets to draw in the 3D view",
            "author": "Marcelo M. Marques (fork of Jayanam's original project)",
-           "version": (1, 0, 1),
+           "version": (1, 0, 2),
            "blender": (2, 80, 75),
            "location": "View3D > viewport area",
            "support": "COMMUNITY",
@@ -32,6 +32,13 @@ bl_info = {"name": "BL UI Widgets",
 
 # --- ### Change log
 
+# v1.0.2 (10.18.2026)
+# Chang: Builtin shaders are now taken from the shared registry in 'bl_ui_shaders' instead of being fetched at every update/draw.
+# Chang: 'draw_text' function now takes the text measurements from the shared 'text_dimensions' cache.
+# Added: 'visual_state' function override to include the checkbox state and text, so it only gets repainted on changes.
+# Added: 'hit_rect' function override to include the label width, same as 'is_in_rect' function.
+# Chang: Theme and ui style are now taken by 'current_theme' and 'current_ui_style' functions (i.e. from the draw pass snapshot).
+
 # v1.0.1 (09.20.2021) - by Marcelo M. Marques
 # Chang: just some pep8 code formatting
 
@@ -60,14 +67,14 @@ bl_info = {"name": "BL UI Widgets",
 
 # --- ### Imports
 import bpy
-import gpu
 import bgl
-import blf
 
 from gpu_extras.batch import batch_for_shader
 
 from . bl_ui_patch import BL_UI_Patch
 from . bl_ui_label import BL_UI_Label
+from . bl_ui_shaders import get_builtin_shader
+from . bl_ui_widget import text_dimensions
 
 
 class BL_UI_Checkbox(BL_UI_Patch):
@@ -229,12 +236,18 @@ class BL_UI_Checkbox(BL_UI_Patch):
 
         return False
 
+    # Overrides base class function
+    def hit_rect(self):
+        extra_width = self.width + self.__label_width  # Extended width to include label size
+        return (self.over_scale(self.x_screen), self.over_scale(self.y_screen - self.height),
+                self.over_scale(self.x_screen + extra_width), self.over_scale(self.y_screen))
+
     # Overrides base class function
     def set_colors(self):
         # Up
         if self.__state == 0:
             if self._bg_color is None:
-                theme = bpy.context.preferences.themes[0]
+                theme = self.current_theme()
                 widget_style = getattr(theme.user_interface, "wcol_option")
                 color = widget_style.inner
             else:
@@ -242,7 +255,7 @@ class BL_UI_Checkbox(BL_UI_Patch):
         # Down
         elif self.__state == 1:
             if self._selected_color is None:
-                theme = bpy.context.preferences.themes[0]
+                theme = self.current_theme()
                 widget_style = getattr(theme.user_interface, "wcol_option")
                 color = widget_style.inner_sel
             else:
@@ -250,7 +263,7 @@ class BL_UI_Checkbox(BL_UI_Patch):
         # Hover
         elif self.__state == 2:
             if self._bg_color is None:
-                theme = bpy.context.preferences.themes[0]
+                theme = self.current_theme()
                 widget_style = getattr(theme.user_interface, "wcol_option")
                 color = widget_style.inner
             else:
@@ -276,7 +289,7 @@ class BL_UI_Checkbox(BL_UI_Patch):
             return None
 
         if self._mark_color is None:
-            theme = bpy.context.preferences.themes[0]
+            theme = self.current_theme()
             widget_style = getattr(theme.user_interface, "wcol_option")
             color = widget_style.item
         else:
@@ -286,7 +299,7 @@ class BL_UI_Checkbox(BL_UI_Patch):
             # Take the checkmark color and "dark" it by either 40% or 20%
             color = self.shade_color(color, (0.4 if color[0] > 0.5 else 0.2))
 
-        self.shader_mark = gpu.shader.from_builtin('2D_UNIFORM_COLOR')
+        self.shader_mark = get_builtin_shader('2D_UNIFORM_COLOR')
 
         self.shader_mark.bind()
         self.shader_mark.uniform_float("color", color)
@@ -317,7 +330,7 @@ class BL_UI_Checkbox(BL_UI_Patch):
         if not (self._is_visible and self._text != ""):
             return
 
-        theme = bpy.context.preferences.themes[0]
+        theme = self.current_theme()
         widget_style = getattr(theme.user_interface, "wcol_option")
 
         if self.__state == 0:
@@ -329,7 +342,7 @@ class BL_UI_Checkbox(BL_UI_Patch):
             # Take the "state 0" text color and "tint" it by either 20% or 10%
             text_color = self.tint_color(text_color, (0.2 if text_color[0] < 0.5 else 0.1))
 
-        theme = bpy.context.preferences.ui_styles[0]
+        theme = self.current_ui_style()
         widget_style = getattr(theme, "widget")
 
         if self._text_size is None:
@@ -344,24 +357,20 @@ class BL_UI_Checkbox(BL_UI_Patch):
             text_kerning = False
         else:
             text_kerning = (widget_style.font_kerning_style == 'FITTED') if self._text_kerning is None else self._text_kerning
-            if text_kerning:
-                blf.enable(0, blf.KERNING_DEFAULT)
 
         rounded_scale = int(round(self.over_scale(1)))
         margin_space = (" " * rounded_scale) if rounded_scale > 0 else " "
         spaced_text = margin_space + self._text + margin_space
 
-        blf.size(0, leveraged_text_size, 72)
-        normal = blf.dimensions(0, "W")[1]  # This is to keep a regular pattern since letters differ in height
+        normal = text_dimensions(0, leveraged_text_size, text_kerning, "W")[1]  # This is to keep a regular pattern since letters differ in height
 
-        blf.size(0, scaled_size, 72)
-        length = blf.dimensions(0, spaced_text)[0]
-        height = blf.dimensions(0, "W")[1]
+        length = text_dimensions(0, scaled_size, text_kerning, spaced_text)[0]
+        height = text_dimensions(0, scaled_size, text_kerning, "W")[1]
 
-        self.__label_width = length
-
-        if text_kerning:
-            blf.disable(0, blf.KERNING_DEFAULT)
+        if self.__label_width != length:
+            # The area reacting to the mouse has changed
+            self.__label_width = length
+            self.layout_changed()
 
         textpos_x = self.x_screen + self.width
 
@@ -401,6 +410,10 @@ class BL_UI_Checkbox(BL_UI_Patch):
         label.context_it(self.context)
         label.draw()
 
+    # Overrides base class function
+    def visual_state(self):
+        return super().visual_state() + (self.__state, self._text)
+
     # Overrides base class function
     def mouse_down(self, event, x, y):
         if self.is_in_rect(x, y):
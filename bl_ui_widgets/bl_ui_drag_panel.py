@@ -20,7 +20,7 @@
 bl_info = {"name": "BL UI Widgets",
            "description": "UI Widgets to draw in the 3D view",
            "author": "Marcelo M. Marques (fork of Jayanam's original project)",
-           "version": (1, 0, 1),
+           "version": (1, 0, 2),
            "blender": (2, 80, 75),
            "location": "View3D > viewport area",
            "support": "COMMUNITY",
@@ -32,6 +32,19 @@ bl_info = {"name": "BL UI Widgets",
 
 # --- ### Change log
 
+# v1.0.2 (10.18.2026)
+# Added: 'merged_batch' property to paint the background, outline and shadow of the panel and all its batchable child widgets
+#         with a few draw calls, from vertex buffers with per vertex color which are only rebuilt when some widget changes.
+# Added: 'draw_merged' function to (re)build and paint the merged batch.
+# Chang: Builtin shaders are now taken from the shared registry in 'bl_ui_shaders' instead of being fetched at every update/draw.
+# Chang: Dragging the panel now only sets the draw offset which translates all widgets, and the new position is applied
+#         to the panel and its child widgets (i.e. their geometry is rebuilt) once, when the drag finishes.
+# Added: 'commit_panel_coords' function to save the panel position once, at the end of the drag (or when the panel is closed),
+#         and only if it has changed since last saved, instead of writing the scene and the add-on preferences at every mouse move.
+# Added: 'saved_coords' function (split out of '__init__') to look up the panel position saved from last time, so that it can
+#         also be applied when a panel kept by the operator is reopened.
+# Fixed: The merged batch is also rebuilt when the theme changes (e.g. roundness), and not only when the widgets' colors change.
+
 # v1.0.1 (09.20.2021) - by Marcelo M. Marques
 # Chang: just some pep8 code formatting
 
@@ -54,37 +67,19 @@ bl_info = {"name": "BL UI Widgets",
 
 # --- ### Imports
 import bpy
+import bgl
+
+from gpu_extras.batch import batch_for_shader
 
 from . bl_ui_patch import BL_UI_Patch
+from . bl_ui_shaders import get_builtin_shader
 
 
 class BL_UI_Drag_Panel(BL_UI_Patch):
 
     def __init__(self, x, y, width, height):
 
-        try:
-            if __package__.find(".") != -1:
-                package = __package__[0:__package__.find(".")]
-            else:
-                package = __package__
-            RC_POSITION = bpy.context.preferences.addons[package].preferences.RC_POSITION
-            RC_POS_X = bpy.context.preferences.addons[package].preferences.RC_POS_X
-            RC_POS_Y = bpy.context.preferences.addons[package].preferences.RC_POS_Y
-        except Exception as e:
-            RC_POSITION = False
-
-        if RC_POSITION:
-            if RC_POS_X != -10000 and RC_POS_Y != -10000:
-                # Override input values with the ones saved from last time (any scene/session)
-                x = RC_POS_X
-                y = RC_POS_Y
-        else:
-            if bpy.context.scene.get("bl_ui_panel_saved_data") is None:
-                pass
-            else:
-                # Override input values with the ones saved from last session
-                x = bpy.context.scene.get("bl_ui_panel_saved_data")["panX"]
-                y = bpy.context.scene.get("bl_ui_panel_saved_data")["panY"]
+        x, y = self.saved_coords(x, y)
 
         # Need to apply scale to compensate for posterior calculations
         x = (x / self.over_scale(1))
@@ -105,10 +100,45 @@ class BL_UI_Drag_Panel(BL_UI_Patch):
         self._has_shadow = False                # Indicates whether a shadow must be drawn around the panel
 
         self._anchored = False                  # Indicates whether panel can be dragged around the viewport or not
+        self._merged_batch = True               # Indicates whether the child widgets are painted by the panel's merged batch
+
+        self.__batch_signature = None           # Widgets and colors that the current merged batch was built for
+        self.__batch_runs = []                  # Merged batches to paint, in order; values are (batch, smooth lines)
 
         self.__drag_offset_x = 0
         self.__drag_offset_y = 0
         self.__is_drag = False
+        self.__drag_position = None             # Latest position while dragging, applied to the widgets on mouse up
+        self.__pending_coords = None            # Position not yet saved to the scene and add-on preferences
+        self.__saved_coords = None              # Latest position saved to the scene and add-on preferences
+
+    def saved_coords(self, x, y):
+        """ Returns the panel position saved from last time (if any), otherwise the given x and y coordinates """
+        try:
+            if __package__.find(".") != -1:
+                package = __package__[0:__package__.find(".")]
+            else:
+                package = __package__
+            RC_POSITION = bpy.context.preferences.addons[package].preferences.RC_POSITION
+            RC_POS_X = bpy.context.preferences.addons[package].preferences.RC_POS_X
+            RC_POS_Y = bpy.context.preferences.addons[package].preferences.RC_POS_Y
+        except Exception as e:
+            RC_POSITION = False
+
+        if RC_POSITION:
+            if RC_POS_X != -10000 and RC_POS_Y != -10000:
+                # Override input values with the ones saved from last time (any scene/session)
+                x = RC_POS_X
+                y = RC_POS_Y
+        else:
+            if bpy.context.scene.get("bl_ui_panel_saved_data") is None:
+                pass
+            else:
+                # Override input values with the ones saved from last session
+                x = bpy.context.scene.get("bl_ui_panel_saved_data")["panX"]
+                y = bpy.context.scene.get("bl_ui_panel_saved_data")["panY"]
+
+        return (x, y)
 
     @property
     def anchored(self):
@@ -118,6 +148,18 @@ class BL_UI_Drag_Panel(BL_UI_Patch):
     def anchored(self, value):
         self._anchored = value
 
+    @property
+    def merged_batch(self):
+        return self._merged_batch
+
+    @merged_batch.setter
+    def merged_batch(self, value):
+        self._merged_batch = value
+        if not value:
+            for widget in [self] + self.widgets:
+                widget._is_merged = False
+        self.__batch_signature = None
+
     def add_widget(self, widget):
         self.widgets.append(widget)
 
@@ -153,6 +195,88 @@ class BL_UI_Drag_Panel(BL_UI_Patch):
         except Exception as e:
             pass
 
+    def commit_panel_coords(self):
+        # Writing the scene and the preferences is not cheap (e.g. it may trigger their autosave), so it is done only when needed
+        if self.__pending_coords is not None and self.__pending_coords != self.__saved_coords:
+            self.save_panel_coords(*self.__pending_coords)
+            self.__saved_coords = self.__pending_coords
+        self.__pending_coords = None
+
+    def draw_merged(self):
+        '''
+            Paints the background, outline and shadow of the panel and of its batchable child widgets at once.
+            Backgrounds are painted first (in widget order, so the children stay on top of the panel) and then all
+            outlines and shadows in a single 'LINES' batch. The vertex buffers are only rebuilt when some widget
+            has changed its geometry (i.e. it is marked dirty by 'update') or its colors (e.g. hover or theme change).
+        '''
+        area_height = self.get_area_height()
+        widgets = [widget for widget in [self] + self.widgets if widget.visible and widget.batchable()]
+        for widget in widgets:
+            # Same verification each widget does in its own 'draw' function, but it must happen before merging
+            widget.verify_screen_position(area_height)
+
+        colors = [(widget.get_bg_color(), widget.get_outline_color(), widget.get_shadow_color() if widget.shadow else None)
+                  for widget in widgets]
+        signature = [(id(widget), tuple(tuple(c) if c is not None else None for c in color)) for widget, color in zip(widgets, colors)]
+        # A theme change may also change the roundness, i.e. the shapes and not only the colors
+        signature.append(self.theme_version())
+        dirty = [widget for widget in widgets if widget._is_dirty]
+
+        if dirty or signature != self.__batch_signature:
+            runs = []
+            edges = ([], [])
+
+            def add_run(primitive, vertices, color, runs):
+                if not vertices:
+                    return
+                if runs and runs[-1][0] == primitive:
+                    runs[-1][1].extend(vertices)
+                    runs[-1][2].extend([color] * len(vertices))
+                else:
+                    runs.append((primitive, list(vertices), [color] * len(vertices)))
+
+            for widget, (bg_color, outline_color, shadow_color) in zip(widgets, colors):
+                fill_type, fill, outline, shadow = widget.merged_geometry()
+                add_run(fill_type, fill, tuple(bg_color), runs)
+                if outline_color is not None:
+                    edges[0].extend(outline)
+                    edges[1].extend([tuple(outline_color)] * len(outline))
+                if shadow_color is not None:
+                    edges[0].extend(shadow)
+                    edges[1].extend([tuple(shadow_color)] * len(shadow))
+                widget._is_dirty = False
+
+            self.shader_merged = get_builtin_shader('2D_FLAT_COLOR')
+            self.__batch_runs = [(batch_for_shader(self.shader_merged, primitive, {"pos": vertices, "color": vertex_colors}), False)
+                                 for primitive, vertices, vertex_colors in runs]
+            if edges[0]:
+                self.__batch_runs.append((batch_for_shader(self.shader_merged, 'LINES', {"pos": edges[0], "color": edges[1]}), True))
+            self.__batch_signature = signature
+
+        for widget in [self] + self.widgets:
+            widget._is_merged = (widget in widgets)
+
+        self.shader_merged.bind()
+        bgl.glEnable(bgl.GL_BLEND)
+        bgl.glLineWidth(1)
+        for batch, smooth in self.__batch_runs:
+            if smooth:
+                bgl.glEnable(bgl.GL_LINE_SMOOTH)
+            batch.draw(self.shader_merged)
+            if smooth:
+                bgl.glDisable(bgl.GL_LINE_SMOOTH)
+        bgl.glDisable(bgl.GL_BLEND)
+        self.count_draw_calls(len(self.__batch_runs))
+
+    # Overrides base class function
+    def draw(self):
+        if self._merged_batch and self._is_visible:
+            self.draw_merged()
+        else:
+            for widget in [self] + self.widgets:
+                widget._is_merged = False
+        super().draw()
+
     # Overrides base class function
     def update(self, x, y):
         super().update(x, y)
@@ -192,16 +316,24 @@ class BL_UI_Drag_Panel(BL_UI_Patch):
     # Overrides base class function
     def mouse_move(self, event, x, y):
         if self.__is_drag:
-            # Recalculate and update the new position on the viewport
+            # Recalculate the new position on the viewport, but just translate the widgets till the drag finishes
             new_x = x - self.__drag_offset_x
             new_y = y - self.__drag_offset_y
-            self.save_panel_coords(new_x, new_y)
-            self.update(new_x, new_y)
-            self.layout_widgets()
+            self.__pending_coords = (new_x, new_y)
+            self.__drag_position = (new_x, new_y)
+            self.set_draw_offset((self.over_scale(new_x - self.x_screen), self.over_scale(new_y - self.y_screen)))
+            self.request_redraw()
         return False
 
     # Overrides base class function
     def mouse_up(self, event, x, y):
+        if self.__drag_position is not None:
+            # Apply the final position to the panel and its widgets
+            self.set_draw_offset((0, 0))
+            self.update(*self.__drag_position)
+            self.layout_widgets()
+            self.__drag_position = None
+            self.commit_panel_coords()
         self.__is_drag = False
         self.__drag_offset_x = 0
         self.__drag_offset_y = 0
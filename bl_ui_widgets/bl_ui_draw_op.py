@@ -20,7 +20,7 @@
 bl_info = {"name": "BL UI Widgets",
            "description": "UI Widgets to draw in the 3D view",
            "author": "Marcelo M. Marques (fork of Jayanam's original project)",
-           "version": (1, 0, 2),
+           "version": (1, 0, 3),
            "blender": (2, 80, 75),
            "location": "View3D > viewport area",
            "support": "COMMUNITY",
@@ -32,6 +32,50 @@ bl_info = {"name": "BL UI Widgets",
 
 # --- ### Change log
 
+# v1.0.3 (10.18.2026)
+# Added: 'redraw_requested' class level property which the widgets set when something they paint has changed.
+# Added: 'redraw_needed' function to decide whether the area must be repainted on the current modal pass.
+# Added: 'area_region_cache' module level dictionary to keep the area and region resolved by 'get_3d_area_and_region' function.
+# Added: 'invalidate_area_and_region' function to discard the cached area and region.
+# Chang: 'get_3d_area_and_region' function now only walks all screens, areas and regions when the cached ones are no longer valid,
+#         that is when the screen or workspace has changed (e.g. maximizing/restoring an area), when the panel has been invoked on
+#         another region or when the cached region has been freed by Blender.
+# Added: 'build_hit_index' function and a hit-test index (uniform grid of screen cells) of the widgets, rebuilt when the layout changes.
+# Added: 'event_candidates' function to select which widgets must receive each event.
+# Chang: 'handle_widget_events' function now dispatches mouse moves only to the widgets under the mouse pointer plus the ones that
+#         it has just left (so that their enter/exit state still works), and 'handle_event_finalize' only for the mouse release.
+# Added: 'idle_timer' property to let the subclass stop the 0.1s timer whenever no tooltip is waiting to be painted (e.g. because
+#         it keeps its widgets updated by 'bpy.msgbus' subscriptions instead of by timer poll functions).
+# Added: 'start_timer', 'stop_timer' and 'update_timer' functions to add/remove the timer on demand.
+# Chang: 'draw_callback_px' function applies the widgets' draw offset (i.e. the panel's drag translation) via the gpu matrix stack.
+# Added: 'begin_frame', 'end_frame' and 'frame_snapshot' functions to take a snapshot of the theme, ui styles and scale factors
+#         once per draw pass, which all widgets read from instead of looking up the preferences many times per widget.
+# Chang: The area is no longer tagged for redraw at every modal pass (i.e. every timer tick and mouse move), but only when
+#        some widget has requested it or a tooltip is due to be painted.
+# Added: 'BL_UI_Widget_Tree' class with the widgets of one panel and its event handling/drawing functions (moved from the operator),
+#         so that the panel's subclass now derives from it and the operator subclass just returns it from 'create_tree' function.
+# Chang: 'BL_UI_OT_draw_operator' became a dispatcher: there is one modal operator (and one timer) per window and one draw handler
+#         shared by all windows, which route the events and draws to the panels by region. Invoking it on another region opens
+#         one more panel there (e.g. several 3D views on multiple monitors), instead of orphaning the former one.
+# Added: 'trees', 'dispatchers' and 'active_tree' class level properties; 'region_pointer' now refers to the active panel.
+# Added: 'panel_in_area' function to indicate whether some panel has been invoked on the given area.
+# Chang: 'area_region_cache' keeps one entry per region, so that switching between panels does not walk all screens again.
+# Added: 'handlers_valid' class level property, turned off by the new 'invalidate_handlers_handler' (on 'load_pre'), and 'cancel'
+#         function which removes the operator's own handlers, so that 'valid_handler' does not need to 'repr()' every operator
+#         at every draw pass anymore; it now only cleans up the handlers and panels left behind after another file is loaded.
+# Chang: 'invoke' no longer switches the workspace back and forth (which makes Blender rebuild the whole UI twice); the new
+#         'add_modal_handler' function adds the modal handler at window level instead (falls back to it in older versions).
+# Added: 'tree_cache' class level property plus 'acquire_tree', 'reuse' and overridable 'on_reuse' functions, so that panels which
+#         are 'reusable' are kept after closed and reopened without building their widgets again.
+# Added: 'report' function to the widget tree, which forwards the panel's reports to the dispatcher operator of its window.
+# Fixed: 'area_region_cache' is keyed by the panel's region and its entries are only trusted for the window layout (screen, workspace
+#         and areas count) they were resolved on, since reading a freed area does not raise; regions not found are kept as well.
+# Added: 'begin_pass' and 'end_pass' functions: the area and region of each panel are resolved once per modal and draw pass and then
+#         shared by all calls to 'get_3d_area_and_region' made by its widgets during that pass.
+# Chang: 'begin_frame' function also drops the shared shaders of closed windows (see 'prune_shaders' in bl_ui_shaders.py).
+# Chang: 'begin_frame' function resolves the theme and ui style values read by the widgets (colors, roundness, font points and
+#         shadows) into plain values once per draw pass, and increments the snapshot's 'theme_version' only when those change.
+
 # v1.0.2 (10.31.2021) - by Marcelo M. Marques
 # Added: 'region_pointer' class level property to indicate the region in which the drag_panel operator instance has been invoked().
 # Added: 'valid_modes' property to indicate the 'bpy.context.mode' valid values for displaying the panel.
@@ -62,48 +106,59 @@ bl_info = {"name": "BL UI Widgets",
 
 # --- ### Imports
 import bpy
+import gpu
 import sys
 
+from types import SimpleNamespace
 from bpy.types import Operator
+from bpy.app.handlers import persistent
 
+from . bl_ui_shaders import prune_shaders
 
-class BL_UI_OT_draw_operator(Operator):
-    bl_idname = "object.bl_ui_ot_draw_operator"
-    bl_label = "bl ui widgets operator"
-    bl_description = "Operator for bl ui widgets"
-    bl_options = {'REGISTER'}
 
-    handlers = []
-    region_pointer = 0  # Uniquely identifies the region that this (drag_panel) operator instance has been invoked()
+class BL_UI_Widget_Tree():
+    """ Widgets of one panel, which is drawn and handles the events only in the region it has been invoked on.
+        The trees are hosted by the dispatcher operator (BL_UI_OT_draw_operator) of their window, so that each
+        extra panel costs just its own widgets, instead of another modal operator, draw handler and timer.
+    """
 
     def __init__(self):
         self.widgets = []
         self.valid_modes = []
-        # self.__draw_handle = None  # <-- Was like this before implementing the 'lost handler detection logic'
-        # self.__draw_events = None  #     (ditto)
-        self.__finished = False
-        self.__informed = False
-
-    @classmethod
-    def valid_handler(cls):
-        """ A draw callback belonging to the space is persistent when another file is opened, whereas a modal operator is not.
-            Solution below removes the draw callback if the operator becomes invalid. The RNA is how Blender objects store their
-            properties under the hood. When the instance of the Blender operator is no longer required its RNA is trashed.
-            Using 'repr()' avoids using a try catch clause. Would be keen to find out if there is a nicer way to check for this.
-        """
-        invalids = [(type, op, context, handler) for type, op, context, handler in cls.handlers if repr(op).endswith("invalid>")]
-        valid = not(invalids)
-        while invalids:
-            type, op, context, handler = invalids.pop()
-            if type == 'H':
-                bpy.types.SpaceView3D.draw_handler_remove(handler, 'WINDOW')
-            if type == 'T':
-                context.window_manager.event_timer_remove(handler)
-            cls.handlers.remove((type, op, context, handler))
-        return valid
+        self.region_pointer = 0        # Uniquely identifies the region that this panel has been invoked on
+        self.window_pointer = 0        # Uniquely identifies the window whose dispatcher operator hosts this panel
+        self.finished = False
+        self.__widget_globals = None   # Widgets' class level state of this panel (e.g. tooltip), kept while another panel is active
+        self.__hit_index = {}          # Hit-test index; key is a (column, row) screen cell and value is the list of widget indexes
+        self.__hit_index_key = None    # Layout version, scale and widgets count that the hit-test index was built for
+        self.__hit_hovered = set()     # Indexes of the widgets hovered on the latest mouse move, or which have just been left
+        self.__mouse_down = False      # Indicates whether the left mouse button is currently pressed
+        self.idle_timer = True         # Indicates whether the timer must keep running even when nothing is waiting for it
+        self.reusable = False          # Indicates whether the panel is kept after closed, to be reopened without building its widgets
+        self.cache_key = None          # Identifies the operator that created the panel (i.e. which panels it can be reused as)
 
     def get_region_pointer(self):
-        return BL_UI_OT_draw_operator.region_pointer
+        return self.region_pointer
+
+    def activate(self):
+        """ Makes this panel the current one, so that 'get_3d_area_and_region' resolves its region and the widgets'
+            class level state (i.e. hovered tooltip widget, exclusive mode and draw offset) is the one of this panel.
+        """
+        current = BL_UI_OT_draw_operator.active_tree
+        BL_UI_OT_draw_operator.region_pointer = self.region_pointer
+        if current is self:
+            return None
+        if current is not None and current.widgets:
+            current.__widget_globals = current.widgets[0].get_widget_globals()
+        BL_UI_OT_draw_operator.active_tree = self
+        if self.widgets and self.__widget_globals is not None:
+            self.widgets[0].set_widget_globals(self.__widget_globals)
+
+    def report(self, type, message):
+        # A panel is not an operator, so its reports are issued by the dispatcher operator of its window
+        dispatcher = BL_UI_OT_draw_operator.dispatchers.get(self.window_pointer)
+        if dispatcher is not None:
+            dispatcher.report(type=type, message=message)
 
     def init_widgets(self, context, widgets, valid_modes):
         self.widgets = widgets
@@ -114,62 +169,7 @@ class BL_UI_OT_draw_operator(Operator):
         pass
 
     def on_finish(self, context):
-        self.__finished = True
-
-    def invoke(self, context, event):
-        # Avoid "internal error: modal gizmo-map handler has invalid area" terminal messages, after maximizing the viewport,
-        # by switching the workspace back and forth. Not pretty, but at least it avoids the terminal output getting spammed.
-        current = context.workspace
-        other = [ws for ws in bpy.data.workspaces if ws != current]
-        if other:
-            bpy.context.window.workspace = other[0]
-            bpy.context.window.workspace = current
-        # -----------------------------------------------------------------
-        BL_UI_OT_draw_operator.region_pointer = context.region.as_pointer()
-        # -----------------------------------------------------------------
-        self.on_invoke(context, event)
-        args = (self, context)
-        self.register_handlers(args, context)
-        context.window_manager.modal_handler_add(self)
-        return {'RUNNING_MODAL'}
-
-    def register_handlers(self, args, context):
-        BL_UI_OT_draw_operator.handlers = []
-        BL_UI_OT_draw_operator.handlers.append(('H', self, context, bpy.types.SpaceView3D.draw_handler_add(self.draw_callback_px, args, 'WINDOW', 'POST_PIXEL')))
-        BL_UI_OT_draw_operator.handlers.append(('T', self, context, context.window_manager.event_timer_add(0.1, window=context.window)))
-        # Was as below before implementing the 'lost handler detection logic'
-        # self.__draw_handle = bpy.types.SpaceView3D.draw_handler_add(self.draw_callback_px, args, "WINDOW", "POST_PIXEL")
-        # self.__draw_events = context.window_manager.event_timer_add(0.1, window=context.window)
-
-    def unregister_handlers(self, context):
-        for handler in BL_UI_OT_draw_operator.handlers:
-            if handler[0] == 'H':
-                bpy.types.SpaceView3D.draw_handler_remove(handler[3], 'WINDOW')
-            if handler[0] == 'T':
-                context.window_manager.event_timer_remove(handler[3])
-        BL_UI_OT_draw_operator.handlers = []
-        # Was as below before implementing the 'lost handler detection logic'
-        # context.window_manager.event_timer_remove(self.__draw_events)
-        # bpy.types.SpaceView3D.draw_handler_remove(self.__draw_handle, "WINDOW")
-        # self.__draw_handle = None
-        # self.__draw_events = None
-
-    def modal(self, context, event):
-        if self.__finished:
-            return {'FINISHED'}
-
-        valid, area, region = self.valid_scenario(context, event)
-        if area:
-            area.tag_redraw()
-        if valid:
-            if self.handle_widget_events(event, area, region):
-                return {'RUNNING_MODAL'}
-
-        # Not using this escape option, but left it here for documentation purpose
-        # if event.type in {"ESC"}:
-            # self.finish()
-
-        return {'PASS_THROUGH'}
+        self.finished = True
 
     def valid_scenario(self, context, event):
         valid = True
@@ -184,12 +184,6 @@ class BL_UI_OT_draw_operator(Operator):
             area.tag_redraw()
             self.finish()
             valid = False
-        elif event.type != 'TIMER':
-            # Check whether it is drawing on the same region where the panel was initially opened
-            mouse_region = get_quadview_index(context, event.mouse_x, event.mouse_y)[0]
-            if mouse_region is None or mouse_region.as_pointer() != self.get_region_pointer():
-                # Not the same region, so skip handling events at this time
-                valid = False
         return (valid, area, region)
 
     def handle_widget_events(self, event, area, region):
@@ -199,19 +193,72 @@ class BL_UI_OT_draw_operator(Operator):
             if self.suppress_rendering(area, region):
                 return False
 
+        candidates = self.event_candidates(event, region)
+        hovered = set(i for i in candidates if self.widgets[i].hovered())
+
         result = False
-        for widget in self.widgets:
+        for i in candidates:
+            widget = self.widgets[i]
             if widget.visible or event.type == 'TIMER':
                 if widget.handle_event(event):
                     result = True
                     break
-        if event.type != 'TIMER':
-            for widget in self.widgets:
-                if widget.visible:
-                    # Need to pass one more time to wrap up any pending change of state for widgets on the widgets list
-                    widget.handle_event_finalize(event)
+        if event.type == 'LEFTMOUSE':
+            self.__mouse_down = (event.value == 'PRESS')
+            if not self.__mouse_down:
+                for widget in self.widgets:
+                    if widget.visible:
+                        # Need to pass one more time to wrap up any pending change of state for widgets on the widgets list
+                        widget.handle_event_finalize(event)
+        if event.type == 'MOUSEMOVE':
+            # Widgets just left must still get the next mouse move (e.g. a button resets its hover state in there)
+            self.__hit_hovered = hovered | set(i for i in candidates if self.widgets[i].hovered())
+        for i in candidates:
+            # Catches also the changes not caused by the user input (e.g. buttons enabled by the timer poll functions)
+            self.widgets[i].verify_visual_state()
         return result
 
+    def event_candidates(self, event, region):
+        """ Returns the indexes (in widgets list order) of the widgets that must receive the event.
+            Only mouse moves are narrowed down, by means of the hit-test index, since all other events are either
+            not frequent or must reach every widget (e.g. timer polls, mouse release after a drag, keyboard input).
+        """
+        everyone = range(len(self.widgets))
+        if event.type != 'MOUSEMOVE' or self.__mouse_down or not self.widgets:
+            return everyone
+        if self.widgets[0].g_exclusive_mode is not None:
+            # A widget under an exclusive action (e.g. textbox editing) must get the events wherever the mouse is
+            return everyone
+
+        key = (self.widgets[0].g_layout_version, self.widgets[0].over_scale(1), len(self.widgets))
+        if key != self.__hit_index_key:
+            self.__hit_index = build_hit_index(self.widgets)
+            self.__hit_index_key = key
+            self.__hit_hovered = set(i for i in self.__hit_hovered if i in everyone)
+            self.__hit_hovered |= set(i for i in everyone if self.widgets[i].hovered())
+
+        x = (event.mouse_x - region.x)
+        y = (event.mouse_y - region.y)
+        cell = (int(x // HIT_CELL_SIZE), int(y // HIT_CELL_SIZE))
+        return sorted(set(self.__hit_index.get(cell, [])) | self.__hit_hovered)
+
+    def redraw_needed(self):
+        # Trying to save some runtime by only repainting the area when something on the panel has changed
+        needed = BL_UI_OT_draw_operator.redraw_requested
+        if not needed and self.widgets:
+            needed = self.widgets[0].tooltip_pending()
+        BL_UI_OT_draw_operator.redraw_requested = False
+        return needed
+
+    def timer_needed(self):
+        # When 'idle_timer' is off, the timer only runs while some tooltip is counting down its delay to be painted
+        if self.finished:
+            return False
+        if self.idle_timer:
+            return True
+        self.activate()
+        return bool(self.widgets) and self.widgets[0].tooltip_waiting()
+
     def suppress_rendering(self, area, region):
         # This might be overriden by one same named function in the derived (child) class
         return False
@@ -228,13 +275,289 @@ class BL_UI_OT_draw_operator(Operator):
         bpy.context.scene.var.btnRemoText = "Open Remote Control"
         # -- end of the personalized criteria for the given addon --
 
-        self.unregister_handlers(bpy.context)
-        self.on_finish(bpy.context)
+        self.close(bpy.context)
+
+    def close(self, context):
+        # Removes just this panel; its dispatcher operator finishes by itself once its window has no panels left
+        if self.finished:
+            return None
+        self.activate()
+        area = get_3d_area_and_region()[0]
+        if area:
+            area.tag_redraw()
+        BL_UI_OT_draw_operator.remove_tree(self)
+        self.on_finish(context)
+        if self.reusable and self.cache_key:
+            BL_UI_OT_draw_operator.tree_cache.setdefault(self.cache_key, []).append(self)
+
+    def reuse(self, context):
+        # Brings a closed panel back to the state of a newly created one, except for its widgets which are kept as they are
+        self.finished = False
+        self.__widget_globals = None
+        self.__hit_index = {}
+        self.__hit_index_key = None
+        self.__hit_hovered = set()
+        self.__mouse_down = False
+        self.idle_timer = True
+        self.on_reuse(context)
+
+    def on_reuse(self, context):
+        # This might be overriden by one same named function in the derived (child) class
+        pass
 
     # Draw handler to paint onto the screen
     def draw_callback_px(self, op, context):
+        # This is to detect when user moved into an undesired 'bpy.context.mode'
+        # and it will check also the programmer's defined suppress_rendering function
+        if valid_display_mode(self.valid_modes, self.suppress_rendering):
+            # While the panel is dragged all widgets are just translated, instead of having their geometry rebuilt
+            offset = self.widgets[0].g_draw_offset if self.widgets else (0, 0)
+            if offset != (0, 0):
+                gpu.matrix.push()
+                gpu.matrix.translate(offset)
+            begin_frame()
+            try:
+                for widget in self.widgets:
+                    widget.draw()
+            finally:
+                end_frame()
+            if offset != (0, 0):
+                gpu.matrix.pop()
+
+
+class BL_UI_OT_draw_operator(Operator):
+    bl_idname = "object.bl_ui_ot_draw_operator"
+    bl_label = "bl ui widgets operator"
+    bl_description = "Operator for bl ui widgets"
+    bl_options = {'REGISTER'}
+
+    handlers = []      # ('H', None, context, handle) is the draw handler shared by all windows; ('T', op, context, handle) is a window's timer
+    trees = {}         # Panels being displayed; key is the region pointer and value is the widget tree drawn in that region
+    dispatchers = {}   # Modal operators routing the events; key is the window pointer and value is the operator instance
+    active_tree = None  # Widget tree (panel) which is currently handling events or being drawn
+    tree_cache = {}    # Panels closed and kept to be reopened; key is the operator's 'bl_idname' and value is the list of widget trees
+    region_pointer = 0  # Uniquely identifies the region of the active widget tree (i.e. where that panel has been invoked)
+    redraw_requested = True  # Indicates whether some widget has changed since the area was last tagged for redraw
+    handlers_valid = True    # Turned off when the operators are going to be trashed by Blender (i.e. another file is being loaded)
+
+    def __init__(self):
+        self.window_pointer = 0
+        self.__finished = False
+
+    @classmethod
+    def valid_handler(cls):
+        """ A draw callback belonging to the space is persistent when another file is opened, whereas a modal operator is not.
+            The RNA is how Blender objects store their properties under the hood, and when the instance of the Blender operator
+            is no longer required its RNA is trashed, so it cannot be asked anymore. Instead, the 'handlers_valid' flag is turned
+            off right before another file is loaded (see 'invalidate_handlers_handler'), making the per frame check a single
+            attribute read, and the solution below then removes all the handlers and panels left behind by the former file.
+            Operators finished or cancelled otherwise remove their own handlers (see 'finish' and 'cancel' functions).
+        """
+        if cls.handlers_valid:
+            return True
+        for type, op, context, handler in cls.handlers:
+            if type == 'H':
+                bpy.types.SpaceView3D.draw_handler_remove(handler, 'WINDOW')
+            if type == 'T':
+                try:
+                    context.window_manager.event_timer_remove(handler)
+                except Exception as e:
+                    # Timer has already been freed along with the former window manager
+                    pass
+        cls.handlers = []
+        cls.dispatchers.clear()
+        cls.trees.clear()
+        cls.tree_cache.clear()
+        cls.active_tree = None
+        invalidate_area_and_region()
+        cls.handlers_valid = True
+        return False
+
+    @classmethod
+    def remove_tree(cls, tree):
+        if cls.trees.get(tree.region_pointer) is tree:
+            del cls.trees[tree.region_pointer]
+            area_region_cache.pop(tree.region_pointer, None)
+        if cls.active_tree is tree:
+            cls.active_tree = None
+
+    @classmethod
+    def remove_draw_handler(cls):
+        for handler in [handler for handler in cls.handlers if handler[0] == 'H']:
+            bpy.types.SpaceView3D.draw_handler_remove(handler[3], 'WINDOW')
+            cls.handlers.remove(handler)
+
+    @classmethod
+    def panel_in_area(cls, area):
+        # Indicates whether some panel has been invoked on (any region of) the given area
+        return any(region.as_pointer() in cls.trees for region in area.regions)
+
+    def create_tree(self, context):
+        # This must be overriden by one same named function in the derived (child) class, returning the panel to be displayed
+        return BL_UI_Widget_Tree()
+
+    def window_trees(self):
+        return [tree for tree in BL_UI_OT_draw_operator.trees.values() if tree.window_pointer == self.window_pointer]
+
+    def invoke(self, context, event):
+        BL_UI_OT_draw_operator.valid_handler()
+        region_pointer = context.region.as_pointer()
+        window_pointer = context.window.as_pointer()
+        former = BL_UI_OT_draw_operator.trees.get(region_pointer)
+        if former is not None:
+            # Invoking it again on the same region replaces the panel which is there
+            former.close(context)
+        BL_UI_OT_draw_operator.redraw_requested = True
+        invalidate_area_and_region()
+        # -----------------------------------------------------------------
+        tree = self.acquire_tree(context)
+        tree.region_pointer = region_pointer
+        tree.window_pointer = window_pointer
+        BL_UI_OT_draw_operator.trees[region_pointer] = tree
+        tree.activate()
+        tree.on_invoke(context, event)
+
+        dispatcher = BL_UI_OT_draw_operator.dispatchers.get(window_pointer)
+        if dispatcher is not None:
+            # This window has already an operator routing the events, which now takes care of this panel too
+            dispatcher.update_timer(context)
+            return {'FINISHED'}
+
+        self.window_pointer = window_pointer
+        BL_UI_OT_draw_operator.dispatchers[window_pointer] = self
+        self.register_handlers((context,), context)
+        self.add_modal_handler(context)
+        return {'RUNNING_MODAL'}
+
+    def acquire_tree(self, context):
+        # Reopens a panel formerly closed when there is one, which is much faster than building all of its widgets again
+        cached = BL_UI_OT_draw_operator.tree_cache.get(self.bl_idname)
+        if cached:
+            tree = cached.pop()
+            tree.reuse(context)
+        else:
+            tree = self.create_tree(context)
+        tree.cache_key = self.bl_idname
+        return tree
+
+    def add_modal_handler(self, context):
+        # Avoid "internal error: modal gizmo-map handler has invalid area" terminal messages, after maximizing the viewport,
+        # by adding the modal handler at window level (i.e. not bound to the area where the operator has been invoked).
+        if hasattr(context, "temp_override"):
+            with context.temp_override(area=None, region=None):
+                context.window_manager.modal_handler_add(self)
+        else:
+            # Older Blender versions: switch the workspace back and forth. Not pretty, and it makes Blender rebuild the
+            # whole UI twice, but at least it avoids the terminal output getting spammed.
+            current = context.workspace
+            other = [ws for ws in bpy.data.workspaces if ws != current]
+            if other:
+                bpy.context.window.workspace = other[0]
+                bpy.context.window.workspace = current
+            context.window_manager.modal_handler_add(self)
+
+    def register_handlers(self, args, context):
+        if not any(handler[0] == 'H' for handler in BL_UI_OT_draw_operator.handlers):
+            BL_UI_OT_draw_operator.handlers.append(('H', None, context, bpy.types.SpaceView3D.draw_handler_add(BL_UI_OT_draw_operator.draw_callback_px, args, 'WINDOW', 'POST_PIXEL')))
+        self.update_timer(context)
+        # Was as below before implementing the 'lost handler detection logic'
+        # self.__draw_handle = bpy.types.SpaceView3D.draw_handler_add(self.draw_callback_px, args, "WINDOW", "POST_PIXEL")
+        # self.__draw_events = context.window_manager.event_timer_add(0.1, window=context.window)
+
+    def start_timer(self, context):
+        if not any(handler[0] == 'T' and handler[1] is self for handler in BL_UI_OT_draw_operator.handlers):
+            BL_UI_OT_draw_operator.handlers.append(('T', self, context, context.window_manager.event_timer_add(0.1, window=context.window)))
+
+    def stop_timer(self, context):
+        for handler in [handler for handler in BL_UI_OT_draw_operator.handlers if handler[0] == 'T' and handler[1] is self]:
+            context.window_manager.event_timer_remove(handler[3])
+            BL_UI_OT_draw_operator.handlers.remove(handler)
+
+    def update_timer(self, context):
+        # One timer per window, running only while some of its panels needs it
+        if self.__finished:
+            return None
+        if any(tree.timer_needed() for tree in self.window_trees()):
+            self.start_timer(context)
+        else:
+            self.stop_timer(context)
+
+    def unregister_handlers(self, context):
+        self.stop_timer(context)
+        if BL_UI_OT_draw_operator.dispatchers.get(self.window_pointer) is self:
+            del BL_UI_OT_draw_operator.dispatchers[self.window_pointer]
+        if not BL_UI_OT_draw_operator.dispatchers:
+            BL_UI_OT_draw_operator.remove_draw_handler()
+        # Was as below before implementing the 'lost handler detection logic'
+        # context.window_manager.event_timer_remove(self.__draw_events)
+        # bpy.types.SpaceView3D.draw_handler_remove(self.__draw_handle, "WINDOW")
+        # self.__draw_handle = None
+        # self.__draw_events = None
+
+    def modal(self, context, event):
+        if self.__finished:
+            return {'FINISHED'}
+
+        trees = self.window_trees()
+        if not trees:
+            # All panels of this window have been closed
+            self.finish()
+            return {'FINISHED'}
+
+        # Mouse and keyboard events are only routed to the panel in the region under the mouse, whereas the timer reaches all
+        mouse_pointer = None
+        if event.type != 'TIMER':
+            mouse_region = get_quadview_index(context, event.mouse_x, event.mouse_y)[0]
+            mouse_pointer = (mouse_region.as_pointer() if mouse_region else None)
+
+        handled = False
+        begin_pass()
+        try:
+            for tree in trees:
+                tree.activate()
+                valid, area, region = tree.valid_scenario(context, event)
+                if valid and (event.type == 'TIMER' or tree.region_pointer == mouse_pointer):
+                    handled = tree.handle_widget_events(event, area, region) or handled
+                if area and tree.redraw_needed():
+                    area.tag_redraw()
+        finally:
+            end_pass()
+        self.update_timer(context)
+        if handled:
+            return {'RUNNING_MODAL'}
+
+        # Not using this escape option, but left it here for documentation purpose
+        # if event.type in {"ESC"}:
+            # self.finish()
+
+        return {'PASS_THROUGH'}
+
+    def finish(self):
+        # Closes the panels that are still open in this window and stops routing events to them
+        for tree in self.window_trees():
+            tree.close(bpy.context)
+        self.unregister_handlers(bpy.context)
+        self.__finished = True
+
+    def cancel(self, context):
+        # Called by Blender when it cancels this modal operator (e.g. its window is being closed)
+        if self.__finished or not BL_UI_OT_draw_operator.handlers_valid:
+            # Either it has already been done or it is left for 'valid_handler' (another file is being loaded)
+            return None
+        self.finish()
+        if not BL_UI_OT_draw_operator.trees:
+            # -- personalized criteria for the Remote Control panel addon --
+            # This is a temporary workaround till I figure out how to signal to
+            # the N-panel coding that the remote control panel has been finished.
+            bpy.context.scene.var.RemoVisible = False
+            bpy.context.scene.var.btnRemoText = "Open Remote Control"
+            # -- end of the personalized criteria for the given addon --
+
+    # Draw handler to paint onto the screen (shared by all windows and regions)
+    @classmethod
+    def draw_callback_px(cls, context):
         # Check whether handles are still valid
-        if not BL_UI_OT_draw_operator.valid_handler():
+        if not cls.handlers_valid and not cls.valid_handler():
             # -- personalized criteria for the Remote Control panel addon --
             # This is a temporary workaround till I figure out how to signal to
             # the N-panel coding that the remote control panel has been finished.
@@ -243,24 +566,151 @@ class BL_UI_OT_draw_operator(Operator):
             # -- end of the personalized criteria for the given addon --
             return
 
-        # Check whether it is drawing on the same region where the panel was initially opened
-        for region in context.area.regions:
-            if region.type == 'WINDOW':
-                if context.region == region:
-                    if region.as_pointer() != self.get_region_pointer():
-                        # Not the same region, so skip drawing there
-                        return
-                    break
-
-        # This is to detect when user moved into an undesired 'bpy.context.mode'
-        # and it will check also the programmer's defined suppress_rendering function
-        if valid_display_mode(self.valid_modes, self.suppress_rendering):
-            for widget in self.widgets:
-                widget.draw()
+        # Only paints the panel that has been invoked on the region being drawn (if any)
+        if context.region is None:
+            return
+        tree = cls.trees.get(context.region.as_pointer())
+        if tree is None or tree.finished:
+            return
+        tree.activate()
+        begin_pass()
+        try:
+            tree.draw_callback_px(cls.dispatchers.get(tree.window_pointer), context)
+        finally:
+            end_pass()
 
 
 # --- ### Helper functions
 
+# Preferences snapshot taken at the start of each draw pass; it is None outside of the draw passes.
+# The theme and ui style values resolved for the latest pass are kept along with their signature and version.
+frame_state = {"snapshot": None, "theme_signature": None, "theme_version": 0, "theme": None, "ui_style": None}
+
+# Theme and ui style values read by the widgets, which are resolved into plain values once per draw pass
+THEME_WIDGET_STYLES = ("wcol_regular", "wcol_tool", "wcol_radio", "wcol_text", "wcol_option", "wcol_toggle",
+                       "wcol_num", "wcol_numslider", "wcol_box", "wcol_tooltip")
+THEME_WIDGET_VALUES = ("inner", "inner_sel", "item", "outline", "text", "text_sel", "roundness")
+THEME_UI_VALUES = ("widget_emboss", "widget_text_cursor")
+THEME_SPACE_VALUES = ("button_text", "button_title")
+THEME_PANEL_VALUES = ("header", "back", "sub_back")
+FONT_STYLES = ("widget", "widget_label", "panel_title")
+FONT_VALUES = ("points", "font_kerning_style", "shadow", "shadow_offset_x", "shadow_offset_y", "shadow_value", "shadow_alpha")
+
+
+def resolve_values(struct, names):
+    # Colors become tuples; values that this Blender version does not have are left out (the widgets check the version first)
+    values = {}
+    for name in names:
+        if hasattr(struct, name):
+            value = getattr(struct, name)
+            values[name] = value if isinstance(value, (int, float, str)) else tuple(value)
+    return values
+
+
+def resolve_theme(theme, ui_style):
+    """ Returns the (theme, ui style) values read by the widgets as a dictionary of plain values per struct, so that the
+        widgets do not read them from the preferences again and again at every draw pass
+    """
+    resolved = {"user_interface": resolve_values(theme.user_interface, THEME_UI_VALUES),
+                "space": resolve_values(theme.view_3d.space, THEME_SPACE_VALUES),
+                "panelcolors": resolve_values(theme.view_3d.space.panelcolors, THEME_PANEL_VALUES),
+                }
+    for style in THEME_WIDGET_STYLES:
+        resolved[style] = resolve_values(getattr(theme.user_interface, style), THEME_WIDGET_VALUES)
+    for style in FONT_STYLES:
+        resolved[style] = resolve_values(getattr(ui_style, style), FONT_VALUES)
+    return resolved
+
+
+def theme_snapshot(resolved):
+    """ Builds the theme and ui style stand-ins, with the same attribute paths the widgets use on the preferences
+        (e.g. 'theme.user_interface.wcol_tool.inner', 'ui_style.widget.points') but holding the resolved values
+    """
+    user_interface = SimpleNamespace(**resolved["user_interface"])
+    for style in THEME_WIDGET_STYLES:
+        setattr(user_interface, style, SimpleNamespace(**resolved[style]))
+    space = SimpleNamespace(panelcolors=SimpleNamespace(**resolved["panelcolors"]), **resolved["space"])
+    theme = SimpleNamespace(user_interface=user_interface, view_3d=SimpleNamespace(space=space))
+    ui_style = SimpleNamespace(**{style: SimpleNamespace(**resolved[style]) for style in FONT_STYLES})
+    return (theme, ui_style)
+
+
+def begin_frame():
+    """ Takes the snapshot of the preferences used by the widgets to draw themselves. The theme and ui style values are
+        compared with the ones of the previous pass, and 'theme_version' is incremented only when they differ, so that
+        the widgets can tell a theme change by comparing a number.
+    """
+    if __package__.find(".") != -1:
+        package = __package__[0:__package__.find(".")]
+    else:
+        package = __package__
+    prefs = bpy.context.preferences
+    try:
+        addon_prefs = prefs.addons[package].preferences
+        bind = addon_prefs.RC_UI_BIND
+        scale = addon_prefs.RC_SCALE
+        slide = addon_prefs.RC_SLIDE
+    except Exception as e:
+        # Same defaults as in the widget's 'RC_UI_BIND', 'RC_SCALE' and 'RC_SLIDE' functions
+        bind = True
+        scale = 1.0
+        slide = True
+    theme = prefs.themes[0]
+    ui_style = prefs.ui_styles[0]
+    ui_scale = prefs.view.ui_scale
+    prune_shaders()
+    resolved = resolve_theme(theme, ui_style)
+    signature = tuple((key, tuple(values.items())) for key, values in resolved.items())
+    if signature != frame_state["theme_signature"]:
+        frame_state["theme_signature"] = signature
+        frame_state["theme_version"] += 1
+        frame_state["theme"], frame_state["ui_style"] = theme_snapshot(resolved)
+    frame_state["snapshot"] = {"RC_UI_BIND": bind,
+                               "RC_SCALE": scale,
+                               "RC_SLIDE": slide,
+                               "ui_scale": (ui_scale if bind else 1),
+                               "over_scale": (ui_scale if bind else 1) * scale,
+                               "theme": frame_state["theme"],
+                               "ui_style": frame_state["ui_style"],
+                               "theme_version": frame_state["theme_version"],
+                               "text_signature": (ui_scale, prefs.view.font_path_ui, resolved["widget"]["points"], theme.name),
+                               }
+
+
+def end_frame():
+    frame_state["snapshot"] = None
+
+
+def frame_snapshot():
+    return frame_state["snapshot"]
+
+
+HIT_CELL_SIZE = 64  # Size in pixels of the hit-test index cells
+
+
+def build_hit_index(widgets):
+    """ Distributes the widgets into a uniform grid of screen cells, so that the ones that may be under the mouse pointer
+        are found in a single lookup. Each widget is listed in every cell its 'hit_rect' overlaps.
+    """
+    index = {}
+    for i, widget in enumerate(widgets):
+        rect = widget.hit_rect()
+        if rect is None:
+            continue
+        left, bottom, right, top = rect
+        for column in range(int(left // HIT_CELL_SIZE), int(right // HIT_CELL_SIZE) + 1):
+            for row in range(int(bottom // HIT_CELL_SIZE), int(top // HIT_CELL_SIZE) + 1):
+                index.setdefault((column, row), []).append(i)
+    return index
+
+
+# Areas and regions found by 'get_3d_area_and_region'; key is the region pointer of a panel and value is the (scenario, area,
+# region) tuple, where scenario identifies the window layout they were resolved on (see 'area_region_scenario').
+area_region_cache = {}
+# Areas and regions resolved during the current modal or draw pass (see 'begin_pass'); it is None outside of the passes
+pass_state = {"resolved": None}
+
+
 def get_quadview_index(context, x, y):
     for area in context.screen.areas:
         if area.type != 'VIEW_3D':
@@ -278,9 +728,66 @@ def get_quadview_index(context, x, y):
     return (None, None, None)
 
 
+def area_region_scenario():
+    # Maximizing/restoring an area switches to another screen, whereas splitting/joining areas changes their count; the cached
+    # area and region are only trusted while these stay the same, since reading a struct freed by Blender does not raise.
+    window = bpy.context.window
+    if window is None:
+        return (0, 0, 0)
+    screen = window.screen
+    return (screen.as_pointer(), window.workspace.as_pointer(), len(screen.areas))
+
+
+def cached_area_and_region(region_pointer, scenario):
+    entry = area_region_cache.get(region_pointer)
+    if entry is None or entry[0] != scenario:
+        return None
+    area, region = entry[1], entry[2]
+    if area and area.type != 'VIEW_3D':
+        # Area has been switched to another editor, which frees its regions
+        return None
+    return (area, region)
+
+
+def begin_pass():
+    """ Starts a modal or draw pass: each panel's area and region are resolved once and then shared by all the calls
+        made by its widgets until 'end_pass'
+    """
+    pass_state["resolved"] = {}
+
+
+def end_pass():
+    pass_state["resolved"] = None
+
+
+def invalidate_area_and_region():
+    area_region_cache.clear()
+    if pass_state["resolved"] is not None:
+        pass_state["resolved"].clear()
+
+
+def remember_area_and_region(region_pointer, scenario, area, region):
+    area_region_cache[region_pointer] = (scenario, area, region)
+    if pass_state["resolved"] is not None:
+        pass_state["resolved"][region_pointer] = (area, region)
+
+
 def get_3d_area_and_region(prefs=None):
     abend = False
     try:
+        region_pointer = BL_UI_OT_draw_operator.region_pointer
+        resolved = pass_state["resolved"]
+        if resolved is not None and region_pointer in resolved:
+            # Already resolved in this modal or draw pass
+            area, region = resolved[region_pointer]
+            return (area, region, abend)
+        scenario = area_region_scenario()
+        cached = cached_area_and_region(region_pointer, scenario)
+        if cached is not None:
+            if resolved is not None:
+                resolved[region_pointer] = cached
+            return (cached[0], cached[1], abend)
+
         # Left this commented code for a while until I make sure it will not be needed.
         # Case we want to put this back, it will need to import parameter 'idx', and in
         # the calling module the 'idx' value must be set as follows:
@@ -309,8 +816,11 @@ def get_3d_area_and_region(prefs=None):
                 if area.type == 'VIEW_3D':
                     for region in area.regions:
                         if region.type == 'WINDOW':
-                            if region.as_pointer() == BL_UI_OT_draw_operator.region_pointer:
+                            if region.as_pointer() == region_pointer:
+                                remember_area_and_region(region_pointer, scenario, area, region)
                                 return (area, region, abend)
+        # Not found is kept as well, so that all screens are not walked again until the window layout changes
+        remember_area_and_region(region_pointer, scenario, None, None)
     except Exception as e:
         if __package__.find(".") != -1:
             package = __package__[0:__package__.find(".")]
@@ -338,3 +848,20 @@ def valid_display_mode(valid_modes, suppress_rendering=None):
             if suppress_rendering(area, region):
                 return False
     return True
+
+
+@persistent
+def invalidate_handlers_handler(dummy):
+    # All modal operators get trashed when another file is loaded, whereas the draw callback and the timers are left behind
+    BL_UI_OT_draw_operator.handlers_valid = False
+
+
+# --- ### Register
+def register():
+    if invalidate_handlers_handler not in bpy.app.handlers.load_pre:
+        bpy.app.handlers.load_pre.append(invalidate_handlers_handler)
+
+
+def unregister():
+    if invalidate_handlers_handler in bpy.app.handlers.load_pre:
+        bpy.app.handlers.load_pre.remove(invalidate_handlers_handler)
@@ -20,7 +20,7 @@
 bl_info = {"name": "BL UI Widgets",
            "description": "UI Widgets to draw in the 3D view",
            "author": "Marcelo M. Marques (fork of Jayanam's original project)",
-           "version": (1, 0, 1),
+           "version": (1, 0, 2),
            "blender": (2, 80, 75),
            "location": "View3D > viewport area",
            "support": "COMMUNITY",
@@ -32,6 +32,11 @@ bl_info = {"name": "BL UI Widgets",
 
 # --- ### Change log
 
+# v1.0.2 (10.18.2026)
+# Added: 'visual_state' function override to include the label text, so it only gets repainted on changes.
+# Added: 'hit_rect' function override, since this widget does not react to mouse events.
+# Chang: Theme and ui style are now taken by 'current_theme' and 'current_ui_style' functions (i.e. from the draw pass snapshot).
+
 # v1.0.1 (09.20.2021) - by Marcelo M. Marques
 # Chang: just some pep8 code formatting
 
@@ -188,6 +193,14 @@ class BL_UI_Label(BL_UI_Widget):
         # This type of object must not react to mouse events
         return False
 
+    # Overrides base class function
+    def hit_rect(self):
+        return None
+
+    # Overrides base class function
+    def visual_state(self):
+        return super().visual_state() + (self._text,)
+
     # Overrides base class function
     def update(self, x, y):
         self.x_screen = x
@@ -203,7 +216,7 @@ class BL_UI_Label(BL_UI_Widget):
         if self._style == 'REGULAR' or self._style == 'TOOLTIP':
             if self._text_color is None:
                 # From Preferences/Themes/3D Viewport/"Theme Space"
-                theme = bpy.context.preferences.themes[0]
+                theme = self.current_theme()
                 widget_style = getattr(theme.view_3d, "space")
                 text_color = tuple(widget_style.button_text) + (1.0,)
             else:
@@ -212,7 +225,7 @@ class BL_UI_Label(BL_UI_Widget):
         elif self._style == 'TITLE':
             if self._text_title is None:
                 # From Preferences/Themes/3D Viewport/"Theme Space"
-                theme = bpy.context.preferences.themes[0]
+                theme = self.current_theme()
                 widget_style = getattr(theme.view_3d, "space")
                 text_color = tuple(widget_style.button_title) + (1.0,)
             else:
@@ -221,7 +234,7 @@ class BL_UI_Label(BL_UI_Widget):
         elif self._style == 'BOX':
             if self._text_color is None:
                 # From Preferences/Themes/User Interface/"Box"
-                theme = bpy.context.preferences.themes[0]
+                theme = self.current_theme()
                 widget_style = getattr(theme.user_interface, "wcol_box")
                 text_color = tuple(widget_style.text) + (1.0,)
             else:
@@ -241,7 +254,7 @@ class BL_UI_Label(BL_UI_Widget):
                 # Take the text color and "tint" it by 30%
                 text_color = self.tint_color(text_color, 0.3)
 
-        theme = bpy.context.preferences.ui_styles[0]
+        theme = self.current_ui_style()
         widget_style = getattr(theme, self.my_style())
         if self._text_size is None:
             text_size = widget_style.points
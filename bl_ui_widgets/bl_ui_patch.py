@@ -20,7 +20,7 @@
 bl_info = {"name": "BL UI Widgets",
            "description": "UI Widgets to draw in the 3D view",
            "author": "Marcelo M. Marques",
-           "version": (1, 0, 1),
+           "version": (1, 0, 2),
            "blender": (2, 80, 75),
            "location": "View3D > viewport area",
            "support": "COMMUNITY",
@@ -32,6 +32,10 @@ bl_info = {"name": "BL UI Widgets",
 
 # --- ### Change log
 
+# v1.0.2 (10.18.2026)
+# Added: 'batchable' function to indicate whether the patch can have its background, outline and shadow merged by the panel.
+# Chang: The periodic image refresh is only done when the image is not painted from a shared 'gpu.texture'.
+
 # v1.0.1 (09.20.2021) - by Marcelo M. Marques
 # Chang: just some pep8 code formatting
 
@@ -46,6 +50,7 @@ import bpy
 import time
 
 from . bl_ui_widget import BL_UI_Widget
+from . bl_ui_shaders import texture_support, release_image_texture
 
 
 class BL_UI_Patch(BL_UI_Widget):
@@ -147,6 +152,8 @@ class BL_UI_Patch(BL_UI_Widget):
             self._image = bpy.data.images.load(self.__image_file, check_existing=True)
             self._image.gl_load()
             self._image.pack(as_png=True)
+            # Image may have been reloaded, so its shared texture must be created again
+            release_image_texture(self._image)
         except Exception as e:
             pass
 
@@ -165,6 +172,13 @@ class BL_UI_Patch(BL_UI_Widget):
         else:
             return super().is_in_rect(x, y)
 
+    # Overrides base class function
+    def batchable(self):
+        # Only the subclasses which are painted entirely by this 'draw' function can be merged into the panel's batch
+        if self._is_tooltip or self._is_mslider or self._style in {'NUMBER_SLIDE', 'NUMBER_CLICK'}:
+            return False
+        return (type(self).draw is BL_UI_Patch.draw)
+
     # Overrides base class function
     def draw(self):
 
@@ -174,6 +188,7 @@ class BL_UI_Patch(BL_UI_Widget):
             return
 
         # Attempt to refresh the image because it has an issue that causes it to black out after a while
-        if self._image is not None:
+        # (only happens with the bgl bindcode; images painted from a 'gpu.texture' do not need this refresh)
+        if self._image is not None and not texture_support():
             if time.time() - self.__image_time >= 10:
                 self.set_image(self.__image_file)
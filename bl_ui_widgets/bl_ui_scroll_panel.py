@@ -0,0 +1,285 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# --- ### Header
+bl_info = {"name": "BL UI Widgets",
+           "description": "UI Widgets to draw in the 3D view",
+           "author": "Marcelo M. Marques",
+           "version": (1, 0, 0),
+           "blender": (2, 80, 75),
+           "location": "View3D > viewport area",
+           "support": "COMMUNITY",
+           "category": "3D View",
+           "warning": "",
+           "doc_url": "https://github.com/mmmrqs/bl_ui_widgets",
+           "tracker_url": "https://github.com/mmmrqs/bl_ui_widgets/issues"
+           }
+
+# --- ### Change log
+
+# v1.0.0 (10.18.2026)
+# Added: initial creation
+# Added: This new class to paint a scrollable container, which can hold more child widgets than fit on screen.
+#        Child widgets are clipped to the container area (scissor rect) and shifted by the 'scroll' value, and only the ones
+#        intersecting the visible area are laid out, drawn and receive the events. These are found by bisection on an
+#        interval index of the children's y positions, so the cost per frame does not grow with the number of children.
+# Added: 'scroll' property with the scroll offset in pixels, and 'scroll_step' property with the mouse wheel increment.
+# Fixed: Child widgets hovered before a scroll are laid out at their scrolled position too, so they cannot take a click at their former place.
+# Fixed: Former scissor rect and enabled state are restored after drawing the children, so nested containers (clipped to both
+#        areas) or a host that clips keep working.
+
+# --- ### Imports
+import bgl
+import gpu
+
+from bisect import bisect_left
+
+from . bl_ui_patch import BL_UI_Patch
+from . bl_ui_draw_op import get_3d_area_and_region
+
+# Scissor rects of the scroll panels being drawn (more than one when nested), outermost first
+active_clips = []
+
+
+def scissor_enabled():
+    # 'gpu.state' has no getter for the scissor test flag, so it is asked to OpenGL (when still possible)
+    if active_clips:
+        return True
+    try:
+        return bool(bgl.glIsEnabled(bgl.GL_SCISSOR_TEST))
+    except Exception as e:
+        return False
+
+
+class BL_UI_Scroll_Panel(BL_UI_Patch):
+
+    def __init__(self, x, y, width, height):
+        super().__init__(x, y, width, height)
+
+        # Note: Child widgets must NOT be added to the operator's widgets list; this container initializes,
+        #       draws and dispatches the events to them. Their x and y are in relation to the container's top-left corner.
+        self.widgets = []
+
+        self._style = 'BOX'                     # Patch background color styles are: {HEADER,PANEL,SUBPANEL,BOX,TOOLTIP,NONE}
+        self._scroll = 0                        # Scroll offset in pixels (0 means the topmost children are displayed)
+        self._scroll_step = 20                  # Scroll offset increment per mouse wheel step, in pixels
+
+        self.__members = set()                  # Ids of the child widgets, to check membership at once
+        self.__index_order = []                 # Child widget indexes sorted by their y position
+        self.__index_tops = []                  # Child widgets y positions (top), in the same order as above
+        self.__index_reach = 0                  # Height of the tallest child widget (how far above the visible area one may start)
+        self.__content_height = 0               # Height of all child widgets together, as laid out
+        self.__visible_key = None               # Scroll value and height that the visible indexes below were computed for
+        self.__visible = []                     # Indexes (in widgets list order) of the child widgets within the visible area
+        self.__layout_key = None                # Screen position and scroll value that the placed widgets below were laid out for
+        self.__placed = set()                   # Indexes of the child widgets already laid out for the current layout key
+        self.__engaged = set()                  # Indexes of the child widgets hovered on the latest event (so they get their exit)
+
+    @property
+    def scroll(self):
+        return self._scroll
+
+    @scroll.setter
+    def scroll(self, value):
+        value = max(0, min(value, self.__content_height - self.height))
+        if value != self._scroll:
+            self._scroll = value
+            self.layout_visible()
+            self.request_redraw()
+
+    @property
+    def scroll_step(self):
+        return self._scroll_step
+
+    @scroll_step.setter
+    def scroll_step(self, value):
+        self._scroll_step = value
+
+    def add_widget(self, widget):
+        self.widgets.append(widget)
+        self.__members.add(id(widget))
+        self.content_changed()
+
+    def add_widgets(self, widgets):
+        for widget in widgets:
+            self.widgets.append(widget)
+            self.__members.add(id(widget))
+        self.content_changed()
+
+    def content_changed(self):
+        """ Rebuilds the interval index; must be called whenever the children's x, y or height have been changed
+            by the programmer after they were added (it is not needed for scrolling or dragging the container).
+        """
+        self.__index_order = sorted(range(len(self.widgets)), key=lambda i: self.widgets[i].y)
+        self.__index_tops = [self.widgets[i].y for i in self.__index_order]
+        self.__index_reach = max([widget.height for widget in self.widgets] + [0])
+        self.__content_height = max([widget.y + widget.height for widget in self.widgets] + [0])
+        self.__visible_key = None
+        self.__layout_key = None
+        self._scroll = max(0, min(self._scroll, self.__content_height - self.height))
+
+    def visible_indexes(self):
+        # Children intersecting the band [scroll, scroll + height]; only a child starting less than the tallest child's
+        # height above the band can reach into it, so the candidates are a contiguous slice of the sorted index.
+        key = (self._scroll, self.height)
+        if key != self.__visible_key:
+            top = self._scroll
+            bottom = self._scroll + self.height
+            first = bisect_left(self.__index_tops, top - self.__index_reach)
+            last = bisect_left(self.__index_tops, bottom)
+            self.__visible = sorted(i for i in self.__index_order[first:last]
+                                    if self.widgets[i].y + self.widgets[i].height > top)
+            self.__visible_key = key
+        return self.__visible
+
+    def layout_visible(self):
+        # Children are only laid out (i.e. their geometry rebuilt) when they come into the visible area. The hovered ones are
+        # laid out as well, so that once scrolled out they no longer catch clicks there and just get their exit on the next move.
+        key = (self.x_screen, self.y_screen, self._scroll)
+        if key != self.__layout_key:
+            self.__layout_key = key
+            self.__placed = set()
+        for i in sorted(set(self.visible_indexes()) | self.__engaged):
+            if i not in self.__placed:
+                widget = self.widgets[i]
+                widget.update(self.x_screen + widget.x, self.y_screen - widget.y + self._scroll)
+                self.__placed.add(i)
+
+    def set_clip(self):
+        """ Clips the drawing to the container area and returns the former scissor state (rect and enabled flag),
+            to be restored by 'clear_clip'; a container nested in another one is clipped to both areas.
+        """
+        # Scissor rect is not affected by the gpu matrix, so it must include the draw offset (i.e. while the panel is dragged)
+        offset_x, offset_y = self.g_draw_offset
+        x = int(self.over_scale(self.x_screen) + offset_x)
+        y = int(self.over_scale(self.y_screen - self.height) + offset_y)
+        width = int(self.over_scale(self.width))
+        height = int(self.over_scale(self.height))
+        if active_clips:
+            outer_x, outer_y, outer_width, outer_height = active_clips[-1]
+            right = min(x + width, outer_x + outer_width)
+            top = min(y + height, outer_y + outer_height)
+            x, y = max(x, outer_x), max(y, outer_y)
+            width, height = max(0, right - x), max(0, top - y)
+        enabled = scissor_enabled()
+        active_clips.append((x, y, width, height))
+        if hasattr(gpu, "state") and hasattr(gpu.state, "scissor_set"):
+            former = (tuple(gpu.state.scissor_get()), enabled)
+            gpu.state.scissor_test_set(True)
+            gpu.state.scissor_set(x, y, width, height)
+            return former
+        box = bgl.Buffer(bgl.GL_INT, 4)
+        bgl.glGetIntegerv(bgl.GL_SCISSOR_BOX, box)
+        former = (tuple(box), enabled)
+        bgl.glEnable(bgl.GL_SCISSOR_TEST)
+        bgl.glScissor(x, y, width, height)
+        return former
+
+    def clear_clip(self, former):
+        rect, enabled = former
+        active_clips.pop()
+        if hasattr(gpu, "state") and hasattr(gpu.state, "scissor_set"):
+            gpu.state.scissor_set(*rect)
+            gpu.state.scissor_test_set(enabled)
+        else:
+            bgl.glScissor(*rect)
+            if not enabled:
+                bgl.glDisable(bgl.GL_SCISSOR_TEST)
+
+    # Overrides base class function
+    def init(self, context, valid_modes):
+        for widget in self.widgets:
+            widget.init(context, valid_modes)
+        super().init(context, valid_modes)
+
+    # Overrides base class function
+    def update(self, x, y):
+        super().update(x, y)
+        self.__layout_key = None
+        self.layout_visible()
+
+    # Overrides base class function
+    def visual_state(self):
+        state = super().visual_state() + (self._scroll,)
+        for i in self.visible_indexes():
+            state = state + self.widgets[i].visual_state()
+        return state
+
+    # Overrides base class function
+    def draw(self):
+
+        super().draw()
+
+        if not self._is_visible:
+            return
+
+        self.layout_visible()
+        former = self.set_clip()
+        try:
+            for i in self.visible_indexes():
+                self.widgets[i].draw()
+        finally:
+            self.clear_clip(former)
+
+    # Overrides base class function
+    def handle_event(self, event):
+        exclusive_widget = self.g_exclusive_mode
+        if exclusive_widget is not None:
+            # While a child widget is undergoing an exclusive action (e.g: Textbox under edit action) only it gets the events
+            if id(exclusive_widget) in self.__members:
+                return exclusive_widget.handle_event(event)
+            return super().handle_event(event)
+
+        region = get_3d_area_and_region()[1]
+        if not region:
+            return False
+
+        x = (event.mouse_x - region.x)
+        y = (event.mouse_y - region.y)
+        inside = (self._is_visible and self.is_in_rect(x, y))
+
+        if event.type in {'WHEELUPMOUSE', 'WHEELDOWNMOUSE'} and inside:
+            if self.__content_height > self.height:
+                self.scroll = self._scroll + (self._scroll_step if event.type == 'WHEELDOWNMOUSE' else -self._scroll_step)
+                return True
+            return False
+
+        # Children hovered before must still get the next event even when scrolled out (e.g. a button resets its hover state)
+        candidates = sorted(set(self.visible_indexes()) | self.__engaged)
+        # Parts of the children clipped out of the container area must not react to clicks
+        clipped_click = (event.type == 'LEFTMOUSE' and event.value == 'PRESS' and not inside)
+        result = False
+        if (self._is_visible or event.type == 'TIMER') and not clipped_click:
+            for i in candidates:
+                widget = self.widgets[i]
+                if widget.visible or event.type == 'TIMER':
+                    if widget.handle_event(event):
+                        result = True
+                        break
+        self.__engaged = set(i for i in candidates if self.widgets[i].hovered())
+        if result:
+            return True
+        return super().handle_event(event)
+
+    # Overrides base class function
+    def handle_event_finalize(self, event):
+        for i in sorted(set(self.visible_indexes()) | self.__engaged):
+            widget = self.widgets[i]
+            if widget.visible:
+                widget.handle_event_finalize(event)
+        return super().handle_event_finalize(event)
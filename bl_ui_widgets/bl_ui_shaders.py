@@ -0,0 +1,149 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# --- ### Header
+bl_info = {"name": "BL UI Widgets",
+           "description": "UI Widgets to draw in the 3D view",
+           "author": "Marcelo M. Marques",
+           "version": (1, 0, 1),
+           "blender": (2, 80, 75),
+           "location": "View3D > viewport area",
+           "support": "COMMUNITY",
+           "category": "3D View",
+           "warning": "",
+           "doc_url": "https://github.com/mmmrqs/bl_ui_widgets",
+           "tracker_url": "https://github.com/mmmrqs/bl_ui_widgets/issues"
+           }
+
+# --- ### Change log
+
+# v1.0.1 (10.18.2026)
+# Added: Shared registry of the image textures ('gpu.texture' objects), so that all widgets using the same icon share one texture.
+# Fixed: Shaders are dropped when their window is closed ('prune_shaders' function), since checking the shader's 'program'
+#        attribute never failed in newer Blender versions, where it does not exist.
+# Fixed: Image textures are checked against the image's name, file, size, dirty state and bindcode before reuse ('image_signature'
+#        function), so that a removed, reloaded or edited image, or another one taking its address, does not get a stale texture.
+
+# v1.0.0 (10.18.2026)
+# Added: initial creation
+# Added: Shared registry of the builtin shaders, so that each one is fetched only once per GPU context (i.e. per window)
+#        and then reused by all widgets. Entries are checked for validity before reuse and dropped after a file is loaded.
+
+# --- ### Imports
+import bpy
+import gpu
+
+from bpy.app.handlers import persistent
+
+# Registry of builtin shaders; key is (shader name, window pointer) and value is the GPUShader object
+shaders = {}
+# Registry of image textures; key is the image pointer and value is the (GPUTexture object, image signature) tuple
+textures = {}
+
+
+def context_key():
+    # Each Blender window has its own GPU context
+    window = bpy.context.window
+    return (window.as_pointer() if window else 0)
+
+
+def prune_shaders():
+    """ Drops the shaders of the windows which have been closed, since their GPU contexts are gone and a window opened
+        afterwards may get the same pointer. A freed shader cannot be told apart by inspecting it (newer 'GPUShader'
+        objects have no 'program' attribute), so this is called once per draw pass instead (see 'begin_frame').
+    """
+    if not shaders:
+        return
+    windows = set(window.as_pointer() for window in bpy.context.window_manager.windows)
+    for key in [key for key in shaders if key[1] not in windows]:
+        del shaders[key]
+
+
+def get_builtin_shader(name):
+    """ Returns the builtin shader for the current GPU context, fetching it from Blender only once
+        Arguments:
+            @name (str):    builtin shader name (e.g. '2D_UNIFORM_COLOR', '2D_FLAT_COLOR', '2D_IMAGE')
+    """
+    key = (name, context_key())
+    shader = shaders.get(key)
+    if shader is None:
+        shader = gpu.shader.from_builtin(name)
+        shaders[key] = shader
+    return shader
+
+
+def clear_shaders():
+    shaders.clear()
+
+
+def texture_support():
+    # The 'gpu.texture' module is not available in older Blender versions, which must bind the image's 'bindcode' via bgl
+    return hasattr(gpu, "texture") and hasattr(gpu.texture, "from_image")
+
+
+def get_image_texture(image):
+    """ Returns the GPU texture of the image, loading it only once for all widgets which use that same image
+        Arguments:
+            @image (Image):     image datablock (e.g. a button icon)
+        Returns None when 'gpu.texture' is not supported by this Blender version.
+    """
+    if not texture_support():
+        return None
+    key = image.as_pointer()
+    entry = textures.get(key)
+    if entry is None or entry[1] != image_signature(image):
+        texture = gpu.texture.from_image(image)
+        textures[key] = (texture, image_signature(image))
+        return texture
+    return entry[0]
+
+
+def image_signature(image):
+    """ Attributes which change when the image is replaced, reloaded or edited, so that a stale texture is not reused;
+        the pointer alone is not enough, as a removed image's address may be taken by another one.
+        Note: 'bindcode' is reset by a reload (and set again by 'gpu.texture.from_image'), so it is read after the latter.
+    """
+    return (image.name, image.filepath_raw, image.source, tuple(image.size), image.is_dirty, getattr(image, "bindcode", 0))
+
+
+def release_image_texture(image):
+    textures.pop(image.as_pointer(), None)
+
+
+def clear_textures():
+    textures.clear()
+
+
+@persistent
+def clear_shaders_handler(dummy):
+    # Windows (and so their GPU contexts) are recreated and images are reloaded when another file is loaded
+    clear_shaders()
+    clear_textures()
+
+
+# --- ### Register
+def register():
+    if clear_shaders_handler not in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.append(clear_shaders_handler)
+
+
+def unregister():
+    if clear_shaders_handler in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(clear_shaders_handler)
+    clear_shaders()
+    clear_textures()
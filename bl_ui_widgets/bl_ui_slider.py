@@ -20,7 +20,7 @@
 bl_info = {"name": "BL UI Widgets",
            "description": "UI Widgets to draw in the 3D view",
            "author": "Marcelo M. Marques (fork of Jayanam's original project)",
-           "version": (1, 0, 2),
+           "version": (1, 0, 3),
            "blender": (2, 80, 75),
            "location": "View3D > viewport area",
            "support": "COMMUNITY",
@@ -32,6 +32,20 @@ bl_info = {"name": "BL UI Widgets",
 
 # --- ### Change log
 
+# v1.0.3 (10.18.2026)
+# Chang: Builtin shaders are now taken from the shared registry in 'bl_ui_shaders' instead of being fetched at every update/draw.
+# Added: 'visual_state' function override to include the value, text, edit mode and the state of the inner widgets,
+#         so it only gets repainted on changes.
+# Chang: 'draw' function keeps the percentage bar batch and only rebuilds it when the bar width (i.e. the value), position,
+#         size, roundness or scale change; the outline of the middle section is no longer forced to be rebuilt at every draw.
+# Added: 'coalesce_updates' property to deliver the intermediate values of a drag to the 'value_updated_func' callback at most
+#         once per redraw, or at most 'update_rate' times per second when that property is not zero; the final value is
+#         always delivered on mouse up. Useful when the callback is expensive (e.g. it writes properties that trigger a depsgraph update).
+# Added: 'flush_update' function to deliver the pending (coalesced) value to the 'value_updated_func' callback.
+# Chang: Theme and ui style are now taken by 'current_theme' and 'current_ui_style' functions (i.e. from the draw pass snapshot).
+# Fixed: Pending value of a coalesced drag is also delivered by a one-shot 'bpy.app.timers' call ('schedule_trailing' function)
+#        once due, so that it is applied even when the mouse stops moving before releasing the button.
+
 # v1.0.2 (10.31.2021) - by Marcelo M. Marques
 # Added: 'valid_modes' parm in the 'init' function and a call to 'super().init_mode' so we get everything correctly initialized.
 # Chang: improved reliability on 'mouse_exit' and 'button_mouse_down' overridable functions by conditioning the returned value
@@ -62,8 +76,8 @@ bl_info = {"name": "BL UI Widgets",
 
 # --- ### Imports
 import bpy
-import gpu
 import bgl
+import time
 
 from gpu_extras.batch import batch_for_shader
 
@@ -71,6 +85,9 @@ from . bl_ui_patch import BL_UI_Patch
 from . bl_ui_label import BL_UI_Label
 from . bl_ui_button import BL_UI_Button
 from . bl_ui_textbox import BL_UI_Textbox
+from . bl_ui_shaders import get_builtin_shader
+
+TRAILING_DELAY = 0.1  # Seconds after which the pending value of a paused drag is delivered (when 'update_rate' is 0)
 
 
 class BL_UI_Slider(BL_UI_Patch):
@@ -101,6 +118,8 @@ class BL_UI_Slider(BL_UI_Patch):
         self._step = 1                          # Step size to increase/decrease the displayed value (in precision units)
         self._unit = ""                         # Unit indicator for the displayed value
         self._max_input_chars = 20              # Maximum number of characters to be input by the textbox
+        self._coalesce_updates = False          # Indicates whether the 'value_updated_func' calls are coalesced during a drag
+        self._update_rate = 0                   # Maximum coalesced calls per second (0 means at most once per redraw)
 
         self._text_margin = 16                  # Slider text left/right margins (when 'NOT' in Textbox edit mode)
         self._text_size = None                  # Slider text size
@@ -118,6 +137,12 @@ class BL_UI_Slider(BL_UI_Patch):
         self.__mouse_moved = False
         self.__drag_origin = (0, 0, 0, 0)       # Represents (mouse_x, mouse_y, mouse_region_x, mouse_region_y)
         self.__drag_start_x = 0
+        self.__bar_key = None                   # Value and geometry that the percentage bar batch was built for
+        self.__pending_update = None            # Latest dragged value not yet delivered to 'value_updated_func' (when coalescing)
+        self.__accepted_value = 0               # Latest value accepted by 'value_updated_func' (restored when it refuses a new one)
+        self.__last_delivery = 0                # Latest time a coalesced value was delivered
+        self.__drawn = False                    # Indicates whether the slider has been drawn since the latest delivery
+        self.__trailing_timer = False           # Indicates whether 'deliver_trailing' is registered to deliver the pending value
 
     # Overrides base class function
     def init(self, context, valid_modes):
@@ -330,6 +355,22 @@ class BL_UI_Slider(BL_UI_Patch):
     def precision(self, value):
         self._precision = value
 
+    @property
+    def coalesce_updates(self):
+        return self._coalesce_updates
+
+    @coalesce_updates.setter
+    def coalesce_updates(self, value):
+        self._coalesce_updates = value
+
+    @property
+    def update_rate(self):
+        return self._update_rate
+
+    @update_rate.setter
+    def update_rate(self, value):
+        self._update_rate = value
+
     @property
     def step(self):
         return self._step
@@ -472,6 +513,14 @@ class BL_UI_Slider(BL_UI_Patch):
         if mode == 'FINAL':
             if self.value_changed_func(self, update_value):
                 self._value = round(update_value, self._precision)
+        elif mode == 'UPDATE' and self._coalesce_updates and self.__is_dragging:
+            # The value is displayed right away but only delivered to the callback when it is due
+            self.__pending_update = update_value
+            self._value = round(update_value, self._precision)
+            if self.update_due():
+                self.flush_update()
+            else:
+                self.schedule_trailing()
         elif mode == 'UPDATE':
             if self.value_updated_func(self, update_value):
                 self._value = round(update_value, self._precision)
@@ -484,6 +533,43 @@ class BL_UI_Slider(BL_UI_Patch):
             self.slider.textwo = self.textbox.text + " " + self._unit
         return self.slider.textwo
 
+    def update_due(self):
+        if self._update_rate:
+            return (time.time() - self.__last_delivery) >= (1.0 / self._update_rate)
+        return self.__drawn
+
+    def schedule_trailing(self):
+        # Otherwise the pending value would only be delivered by the next mouse move, so a drag paused midway would leave
+        # the displayed value ahead of the property it drives
+        if self.__trailing_timer:
+            return None
+        if self._update_rate:
+            delay = max(0, (1.0 / self._update_rate) - (time.time() - self.__last_delivery))
+        else:
+            delay = TRAILING_DELAY
+        self.__trailing_timer = True
+        bpy.app.timers.register(self.deliver_trailing, first_interval=delay, persistent=False)
+
+    def deliver_trailing(self):
+        self.__trailing_timer = False
+        if self.__pending_update is not None:
+            self.flush_update()
+            self.request_redraw()
+        return None
+
+    def flush_update(self):
+        if self.__pending_update is None:
+            return None
+        value = self.__pending_update
+        self.__pending_update = None
+        self.__last_delivery = time.time()
+        self.__drawn = False
+        if self.value_updated_func(self, value):
+            self.__accepted_value = self._value
+        else:
+            # Same as not coalescing, a refused value does not get committed
+            self.update_self_value(self.__accepted_value, 'GET')
+
     def calc_slider_bar(self, value):
         if value < self._min_value or value > self._max_value:
             percentage = 0
@@ -516,6 +602,8 @@ class BL_UI_Slider(BL_UI_Patch):
 
     # Overrides base class function
     def draw(self):
+        self.__drawn = True
+
         if not self._is_visible:
             area_height = self.get_area_height()
             if self._style == 'NUMBER_CLICK':
@@ -532,7 +620,7 @@ class BL_UI_Slider(BL_UI_Patch):
             roundness = self._roundness
         else:
             # From Preferences/Themes/User Interface/<style>
-            theme = bpy.context.preferences.themes[0]
+            theme = self.current_theme()
             widget_style = getattr(theme.user_interface, self.my_style())
             roundness = widget_style.roundness
         force_update = False
@@ -573,10 +661,15 @@ class BL_UI_Slider(BL_UI_Patch):
             capped_pos_x = slider_bar[1]
             if capped_width > 0:
 
-                self.shader_slider = gpu.shader.from_builtin('2D_UNIFORM_COLOR')
+                self.shader_slider = get_builtin_shader('2D_UNIFORM_COLOR')
 
+                bar_key = (capped_width, capped_pos_x, self.slider.x_screen, self.slider.y_screen, self.slider.width,
+                           self.slider.height, self._radius, tuple(self._rounded_corners), self.__last_roundness, self.over_scale(1))
+                if bar_key == self.__bar_key:
+                    # Trying to save some runtime by reusing the batch while value and layout have not changed
+                    pass
                 # used to be: if scaled_radius == 0 or scaled_radius > 10 or self._rounded_corners == (0, 0, 0, 0):
-                if self.scaled_radius(self._radius, self.slider.height) > 10:
+                elif self.scaled_radius(self._radius, self.slider.height) > 10:
                     vertices = self.calc_corners_for_trifan(self.slider.x_screen, self.slider.y_screen, self.slider.width, self.slider.height, self._radius, 'FULL')
                     if capped_width < self.slider.width:
                         # Cap the vertices x coord at percentage of width size (that is, at capped_pos_x)
@@ -604,6 +697,7 @@ class BL_UI_Slider(BL_UI_Patch):
                                     vertices.append((capped_pos_x, to_be_capped[i + 1][1]))
                             i = i + 2
                     self.batch_slider = batch_for_shader(self.shader_slider, 'LINES', {"pos": vertices})
+                self.__bar_key = bar_key
 
                 self.shader_slider.bind()
 
@@ -615,12 +709,8 @@ class BL_UI_Slider(BL_UI_Patch):
 
                 bgl.glEnable(bgl.GL_LINE_SMOOTH)
 
-                self.slider.set_update_shaders(True)
-
                 self.slider.draw_outline()
 
-                self.slider.set_update_shaders(False)
-
                 bgl.glDisable(bgl.GL_LINE_SMOOTH)
 
                 self.slider.draw_text()
@@ -653,7 +743,7 @@ class BL_UI_Slider(BL_UI_Patch):
 
     def set_slider_color(self):
         if self._selected_color is None:
-            theme = bpy.context.preferences.themes[0]
+            theme = self.current_theme()
             widget_style = getattr(theme.user_interface, self.my_style())
             color = widget_style.item
         else:
@@ -693,6 +783,14 @@ class BL_UI_Slider(BL_UI_Patch):
 
         return False
 
+    # Overrides base class function
+    def visual_state(self):
+        widgets = [self.slider, self.textbox]
+        if self._style == 'NUMBER_CLICK':
+            widgets += [self.decrease, self.increase]
+        return (super().visual_state() + (self.__state, self._value, self._text, self.__is_editing) +
+                tuple(widget.visual_state() for widget in widgets))
+
     # Overrides base class function
     def mouse_down(self, event, x, y):
         if self.is_in_rect(x, y):
@@ -707,6 +805,7 @@ class BL_UI_Slider(BL_UI_Patch):
                 self.__is_dragging = True
                 self.__drag_start_x = x
                 self.__drag_origin = (event.mouse_x, event.mouse_y, x, y, self._value)
+                self.__accepted_value = self._value
                 self.__mouse_moved = False
                 bpy.context.window.cursor_set('NONE')
                 if self._style == 'NUMBER_CLICK':
@@ -774,6 +873,8 @@ class BL_UI_Slider(BL_UI_Patch):
 
     # Overrides base class function
     def mouse_up(self, event, x, y):
+        # The final value of a coalesced drag is always delivered, wherever the mouse is released
+        self.flush_update()
         if self.__is_dragging and self.__mouse_moved:
             cursor = 'DEFAULT'
             if self._style == 'NUMBER_CLICK':
@@ -20,7 +20,7 @@
 bl_info = {"name": "BL UI Widgets",
            "description": "UI Widgets to draw in the 3D view",
            "author": "Marcelo M. Marques (fork of Jayanam's original project)",
-           "version": (1, 0, 2),
+           "version": (1, 0, 3),
            "blender": (2, 80, 75),
            "location": "View3D > viewport area",
            "support": "COMMUNITY",
@@ -32,6 +32,15 @@ bl_info = {"name": "BL UI Widgets",
 
 # --- ### Change log
 
+# v1.0.3 (10.18.2026)
+# Chang: Builtin shaders are now taken from the shared registry in 'bl_ui_shaders' instead of being fetched at every update/draw.
+# Chang: 'get_cursor_pos_px' and 'get_cursor_pos_char' functions now take the text measurements from the shared 'text_dimensions' cache.
+# Added: 'visual_state' function override to include the text, edit mode, cursor and selection, so it only gets repainted on changes.
+# Added: 'text_metrics' function which returns the text size and kerning used for the measurements.
+# Chang: 'get_cursor_pos_px' and 'get_cursor_pos_char' functions now look up the shared table of text prefix widths
+#         (a bisect search for the latter), instead of measuring the text one character at a time.
+# Chang: Theme and ui style are now taken by 'current_theme' and 'current_ui_style' functions (i.e. from the draw pass snapshot).
+
 # v1.0.2 (10.31.2021) - by Marcelo M. Marques
 # Added: Logic to change state during a mouse move action so that the textbox background color is correctly set
 
@@ -66,14 +75,15 @@ bl_info = {"name": "BL UI Widgets",
 
 # --- ### Imports
 import bpy
-import gpu
 import bgl
-import blf
 import time
 
+from bisect import bisect_right
 from gpu_extras.batch import batch_for_shader
 
 from . bl_ui_button import BL_UI_Button
+from . bl_ui_shaders import get_builtin_shader
+from . bl_ui_widget import text_prefix_widths
 
 
 class BL_UI_Textbox(BL_UI_Button):
@@ -261,41 +271,29 @@ class BL_UI_Textbox(BL_UI_Button):
         return position
 
     def get_cursor_pos_px(self):
-        theme = bpy.context.preferences.ui_styles[0]
-        widget_style = getattr(theme, "widget")
+        scaled_size, text_kerning = self.text_metrics()
+        widths = text_prefix_widths(0, scaled_size, text_kerning, self._text)
 
-        if self._text_size is None:
-            text_size = widget_style.points
-            leveraged_text_size = text_size
-        else:
-            text_size = self._text_size
-            leveraged_text_size = self.leverage_text_size(text_size, "widget")
-        scaled_size = int(self.over_scale(leveraged_text_size))
+        last = len(self._text)  # Same as text slicing, positions beyond the text length are taken as its end
+        start = widths[min(self.__marked_pos[0], last)]
+        length = widths[min(self.__marked_pos[1], last)] - start
 
-        if bpy.app.version >= (3, 0, 0):  # 3.00 issue: 'font_kerning_style' has become extinct
-            text_kerning = False
-        else:
-            text_kerning = (widget_style.font_kerning_style == 'FITTED') if self._text_kerning is None else self._text_kerning
-            if text_kerning:
-                blf.enable(0, blf.KERNING_DEFAULT)
-        blf.size(0, scaled_size, 72)
+        return [start, length]
 
-        if self.__marked_pos[0] == 0:
-            start = 0
-        else:
-            text_to_cursor = self._text[:self.__marked_pos[0]]
-            start = blf.dimensions(0, text_to_cursor)[0]
+    def get_cursor_pos_char(self):
+        scaled_size, text_kerning = self.text_metrics()
+        widths = text_prefix_widths(0, scaled_size, text_kerning, self._text)
 
-        text_to_cursor = self._text[self.__marked_pos[0]: self.__marked_pos[1]]
-        length = blf.dimensions(0, text_to_cursor)[0]
+        mark_target = self.__drag_start_x + self.__drag_length
+        text_startx = self.over_scale(self.x_screen + self._text_margin)
 
-        if text_kerning:
-            blf.disable(0, blf.KERNING_DEFAULT)
+        # Position of the first character whose right edge goes past the mouse pointer (or the text length if none does)
+        char_pos = bisect_right(widths, mark_target - text_startx, 1) - 1
 
-        return [start, length]
+        return char_pos
 
-    def get_cursor_pos_char(self):
-        theme = bpy.context.preferences.ui_styles[0]
+    def text_metrics(self):
+        theme = self.current_ui_style()
         widget_style = getattr(theme, "widget")
 
         if self._text_size is None:
@@ -310,27 +308,8 @@ class BL_UI_Textbox(BL_UI_Button):
             text_kerning = False
         else:
             text_kerning = (widget_style.font_kerning_style == 'FITTED') if self._text_kerning is None else self._text_kerning
-            if text_kerning:
-                blf.enable(0, blf.KERNING_DEFAULT)
-        blf.size(0, scaled_size, 72)
-
-        mark_target = self.__drag_start_x + self.__drag_length
-        text_startx = self.over_scale(self.x_screen + self._text_margin)
-        text_length = len(self._text)
-        char_pos = 0
-        text_line = ""
 
-        while char_pos < text_length:
-            text_line += self._text[char_pos]
-            text_width = blf.dimensions(0, text_line)[0]
-            if (text_startx + text_width) > mark_target:
-                break
-            char_pos += 1
-
-        if text_kerning:
-            blf.disable(0, blf.KERNING_DEFAULT)
-
-        return char_pos
+        return (scaled_size, text_kerning)
 
     def update_cursor(self):
         cursor_pos_px = self.get_cursor_pos_px()
@@ -353,8 +332,8 @@ class BL_UI_Textbox(BL_UI_Button):
     # Overrides base class function
     def update(self, x, y):
         super().update(x, y)
-        self.shader_cursor = gpu.shader.from_builtin('2D_UNIFORM_COLOR')
-        self.shader_marked = gpu.shader.from_builtin('2D_UNIFORM_COLOR')
+        self.shader_cursor = get_builtin_shader('2D_UNIFORM_COLOR')
+        self.shader_marked = get_builtin_shader('2D_UNIFORM_COLOR')
         self.update_cursor()
 
     # Overrides base class function
@@ -378,7 +357,7 @@ class BL_UI_Textbox(BL_UI_Button):
             if self.__marked_pos[0] != self.__marked_pos[1]:
                 if self._style in {'NUMBER_SLIDE', 'NUMBER_CLICK'}:
                     if self._selected_color is None:
-                        theme = bpy.context.preferences.themes[0]
+                        theme = self.current_theme()
                         widget_style = getattr(theme.user_interface, self.my_style())
                         color = widget_style.item
                     else:
@@ -386,7 +365,7 @@ class BL_UI_Textbox(BL_UI_Button):
                 else:
                     if self._marked_color is None:
                         # From Preferences/Themes/User Interface/"Text"
-                        theme = bpy.context.preferences.themes[0]
+                        theme = self.current_theme()
                         widget_style = getattr(theme.user_interface, "wcol_text")
                         color = widget_style.item
                     else:
@@ -405,7 +384,7 @@ class BL_UI_Textbox(BL_UI_Button):
             # Paint the editing cursor
             if self._cursor_color is None:
                 # From Preferences/Themes/User Interface/"Styles"
-                theme = bpy.context.preferences.themes[0]
+                theme = self.current_theme()
                 if bpy.app.version >= (2, 90, 0):
                     widget_style = theme.user_interface
                     color = tuple(widget_style.widget_text_cursor) + (1.0,)
@@ -566,6 +545,10 @@ class BL_UI_Textbox(BL_UI_Button):
         self.update_cursor()
         return True
 
+    # Overrides base class function
+    def visual_state(self):
+        return super().visual_state() + (self.__is_editing, self.__cursor_pos, tuple(self.__marked_pos))
+
     # Overrides base class function
     def mouse_down(self, event, x, y):
         if self.is_in_rect(x, y):
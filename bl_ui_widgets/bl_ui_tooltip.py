@@ -20,7 +20,7 @@
 bl_info = {"name": "BL UI Widgets",
            "description": "UI Widgets to draw in the 3D view",
            "author": "Marcelo M. Marques",
-           "version": (1, 0, 1),
+           "version": (1, 0, 2),
            "blender": (2, 80, 75),
            "location": "View3D > viewport area",
            "support": "COMMUNITY",
@@ -32,6 +32,12 @@ bl_info = {"name": "BL UI Widgets",
 
 # --- ### Change log
 
+# v1.0.2 (10.18.2026)
+# Chang: 'get_tooltip_measurements' and 'draw_text' functions now take the text measurements from the shared 'text_dimensions' cache.
+# Chang: 'text_wrap' function now calls the new 'wrap_text' function, which measures per word instead of per character
+#         (binary search for words that are too long to fit in one line) and memoizes the wrapped lines.
+# Chang: Theme and ui style are now taken by 'current_theme' and 'current_ui_style' functions (i.e. from the draw pass snapshot).
+
 # v1.0.1 (09.20.2021) - by Marcelo M. Marques
 # Chang: just some pep8 code formatting
 
@@ -42,10 +48,12 @@ bl_info = {"name": "BL UI Widgets",
 
 # --- ### Imports
 import bpy
-import blf
+
+from functools import lru_cache
 
 from . bl_ui_patch import BL_UI_Patch
 from . bl_ui_label import BL_UI_Label
+from . bl_ui_widget import text_dimensions, text_metrics_signature
 
 
 class BL_UI_Tooltip(BL_UI_Patch):
@@ -220,7 +228,7 @@ class BL_UI_Tooltip(BL_UI_Patch):
                 self.__area_height = area_height
                 self.__over_scale = self.over_scale(1)
             else:
-                theme = bpy.context.preferences.ui_styles[0]
+                theme = self.current_ui_style()
                 widget_style = getattr(theme, "widget")
                 text_size = widget_style.points if self._text_size is None else self._text_size
                 if bpy.app.version >= (3, 0, 0):  # 3.00 issue: 'font_kerning_style' has become extinct
@@ -263,7 +271,7 @@ class BL_UI_Tooltip(BL_UI_Patch):
             return (measurements)
 
         if self._text_size is None:
-            theme = bpy.context.preferences.ui_styles[0]
+            theme = self.current_ui_style()
             widget_style = getattr(theme, "widget")
             text_size = widget_style.points
         else:
@@ -279,14 +287,8 @@ class BL_UI_Tooltip(BL_UI_Patch):
         scaled_text_size = int(self.ui_scale(text_size))
         scaled_max_width = self.ui_scale(self.__max_tooltip_width)
 
-        if text_kerning:
-            blf.enable(0, blf.KERNING_DEFAULT)
-        blf.size(0, text_size, 72)
-        text_normal = blf.dimensions(0, "W")[1]  # This is to keep a regular pattern since letters differ in height
-        blf.size(0, scaled_text_size, 72)
-        text_height = blf.dimensions(0, "W")[1]
-        if text_kerning:
-            blf.disable(0, blf.KERNING_DEFAULT)
+        text_normal = text_dimensions(0, text_size, text_kerning, "W")[1]  # This is to keep a regular pattern since letters differ in height
+        text_height = text_dimensions(0, scaled_text_size, text_kerning, "W")[1]
 
         # From Preferences/Interface/"Display"
         prefs = bpy.context.preferences.view
@@ -359,60 +361,11 @@ class BL_UI_Tooltip(BL_UI_Patch):
         return (measurements)
 
     def text_wrap(self, text, text_size, text_kerning, max_width_px, max_lines_count):
-        line_break = "\n"
-        text = text.rstrip()
-
-        blf.size(0, text_size, 72)
-        if text_kerning:
-            blf.enable(0, blf.KERNING_DEFAULT)
-
         # Note: the '3*self.__text_margin' below came from 'get_tooltip_measurements' function
         # where it is added as margins to the total_width of the tooltip box, so it has to be discounted here.
         split_point = max_width_px - (3 * self.__text_margin)
-
-        line_array = []
-
-        cr = len(line_break)
-        lstrip_it = False
-        text_length = len(text)
-        text_line = ""
-        char_pos = 0
-
-        while char_pos < text_length and len(line_array) < max_lines_count:
-            next_chars = text[char_pos:(char_pos + cr)]
-            if next_chars == line_break:
-                text_line = text_line.lstrip() if lstrip_it else text_line
-                dimensions = blf.dimensions(0, text_line)
-                line_array.append((text_line, dimensions))
-                char_pos += len(line_break)
-                lstrip_it = False
-                text_line = ""
-            else:
-                text_line += next_chars[0]
-                dimensions = blf.dimensions(0, text_line)
-                if dimensions[0] > split_point:
-                    last_space = text_line.rfind(" ")
-                    if last_space == -1:
-                        # Have to break the one-word-sentence wherever it is
-                        sub_line = text_line[0:(len(text_line) - 1)]
-                        text_line = text_line[-1]
-                    else:
-                        # Cut the sentence at its closest space character
-                        sub_line = text_line[0:last_space]
-                        text_line = text_line[(last_space + 1):]
-                    sub_line = sub_line.lstrip() if lstrip_it else sub_line
-                    dimensions = blf.dimensions(0, sub_line)
-                    line_array.append((sub_line, dimensions))
-                    lstrip_it = True
-                char_pos += 1
-                if char_pos == text_length:
-                    text_line = text_line.lstrip() if lstrip_it else text_line
-                    dimensions = blf.dimensions(0, text_line)
-                    line_array.append((text_line, dimensions))
-                    break
-        if text_kerning:
-            blf.disable(0, blf.KERNING_DEFAULT)
-        return line_array
+        # The text metrics signature is part of the key so that wrapped results are dropped together with the measurements
+        return wrap_text(text, text_size, text_kerning, split_point, max_lines_count, text_metrics_signature())
 
     # Overrides base class function
     def draw_text(self):
@@ -424,13 +377,13 @@ class BL_UI_Tooltip(BL_UI_Patch):
                 return
         else:
             if self._text_color is None:
-                theme = bpy.context.preferences.themes[0]
+                theme = self.current_theme()
                 widget_style = getattr(theme.user_interface, "wcol_tooltip")
                 text_color = tuple(widget_style.text) + (1.0,)
             else:
                 text_color = self._text_color
 
-        theme = bpy.context.preferences.ui_styles[0]
+        theme = self.current_ui_style()
         widget_style = getattr(theme, "widget")
 
         if self._text_size is None:
@@ -449,14 +402,8 @@ class BL_UI_Tooltip(BL_UI_Patch):
         # text line because the font characters do not scale so well proportionally to the supplied factor.
         scaled_text_size = int(self.ui_scale(leveraged_text_size))
 
-        if text_kerning:
-            blf.enable(0, blf.KERNING_DEFAULT)
-        blf.size(0, leveraged_text_size, 72)
-        text_normal = blf.dimensions(0, "W")[1]  # This is to keep a regular pattern since letters differ in height
-        blf.size(0, scaled_text_size, 72)
-        text_height = blf.dimensions(0, "W")[1]  # This is to keep a regular pattern since letters differ in height
-        if text_kerning:
-            blf.disable(0, blf.KERNING_DEFAULT)
+        text_normal = text_dimensions(0, leveraged_text_size, text_kerning, "W")[1]  # This is to keep a regular pattern since letters differ in height
+        text_height = text_dimensions(0, scaled_text_size, text_kerning, "W")[1]  # This is to keep a regular pattern since letters differ in height
 
         # Need to unapply the over scale to compensate for posterior calculations.
         # This way when BL_UI_Label applies self.over_scale() function to the entire text,
@@ -553,3 +500,60 @@ class BL_UI_Tooltip(BL_UI_Patch):
                 # last_line = last_save[(len(last_save) - over_size):].lstrip()
 
         # return (this_line + " ... " + last_line)
+
+
+# --- ### Helper functions
+
+@lru_cache(maxsize=64)
+def wrap_text(text, text_size, text_kerning, split_point, max_lines_count, signature):
+    """ Splits the text into lines no wider than split_point, breaking at spaces (or anywhere inside a word which is too long).
+        Each word is measured once against the line being built, instead of measuring the line again at every character.
+        Returns a tuple of (text line, dimensions) pairs.
+    """
+    def width(line):
+        return text_dimensions(0, text_size, text_kerning, line)[0]
+
+    line_array = []
+
+    def append(line):
+        line_array.append((line, text_dimensions(0, text_size, text_kerning, line)))
+
+    text = text.rstrip()
+    if text == "":
+        return ()
+
+    for paragraph in text.split("\n"):
+        line = None
+        wrapped = False
+        for word in paragraph.split(" "):
+            if line is None and wrapped and word == "":
+                # Leading spaces are stripped from the lines that come from a wrap
+                continue
+            candidate = word if line is None else line + " " + word
+            if width(candidate) <= split_point:
+                line = candidate
+                continue
+            if line is not None:
+                # Cut the sentence at its closest space character (a line of blanks only is not worth a line)
+                if line.strip() != "":
+                    append(line)
+                wrapped = True
+            # Have to break the one-word-sentence wherever it is; binary search for the longest piece that fits
+            while len(word) > 1 and width(word) > split_point:
+                low, high = 1, len(word) - 1
+                while low < high:
+                    middle = (low + high + 1) // 2
+                    if width(word[:middle]) <= split_point:
+                        low = middle
+                    else:
+                        high = middle - 1
+                append(word[:low])
+                wrapped = True
+                word = word[low:]
+            line = word
+        append("" if line is None else line)
+        if len(line_array) >= max_lines_count:
+            break
+
+    return tuple(line_array[:max_lines_count])
+
@@ -20,7 +20,7 @@
 bl_info = {"name": "BL UI Widgets",
            "description": "UI Widgets to draw in the 3D view",
            "author": "Marcelo M. Marques (fork of Jayanam's original project)",
-           "version": (1, 0, 2),
+           "version": (1, 0, 3),
            "blender": (2, 80, 75),
            "location": "View3D > viewport area",
            "support": "COMMUNITY",
@@ -32,6 +32,41 @@ bl_info = {"name": "BL UI Widgets",
 
 # --- ### Change log
 
+# v1.0.3 (10.18.2026)
+# Added: 'trifan_corners', 'lines_corners' and 'mapped_coords' module level functions with a LRU cache of the widget shapes,
+#         calculated relative to the origin and keyed by the scaled width, height and radius, rounded corners and selection.
+# Added: 'geometry_cache_benchmark' diagnostic function to time a panel relayout with and without the geometry cache.
+# Added: 'merged_geometry' function which returns the widget's background, outline and shadow as primitives that the panel can merge.
+# Added: 'batchable' overridable function to indicate whether the widget can be merged into the panel's batch.
+# Added: 'get_bg_color', 'get_outline_color' and 'get_shadow_color' functions, split out of the drawing functions.
+# Added: 'g_draw_calls' class level property and 'count_draw_calls' function to count the draw calls issued by the widgets.
+# Chang: 'calc_corners_for_trifan' and 'calc_corners_for_lines' functions now just move the cached shape to the widget's position.
+# Chang: 'draw' function only paints image and text when the widget has been merged into the panel's batch.
+# Chang: Builtin shaders are now taken from the shared registry in 'bl_ui_shaders' instead of being fetched at every update/draw.
+# Added: 'text_dimensions' module level function with a LRU cache of the text measurements shared by all widgets,
+#         keyed by font id, size, kerning and text, and cleared whenever ui_scale, the interface font or the theme changes.
+# Chang: 'draw_image' function keeps the image quad batch and only rebuilds it when position, size, offset or scale change,
+#         and paints the image from the texture shared by all widgets (falls back to the bgl bindcode in older Blender versions).
+# Added: 'visual_state' overridable function which returns everything that affects how the widget looks (e.g. hover state, text),
+#         and 'verify_visual_state' function which compares it with the latest one painted, to request a redraw when it changed.
+# Added: 'request_redraw' function to flag the operator that the viewport must be repainted on its next modal pass.
+# Added: 'tooltip_pending' function to indicate whether the tooltip delay has expired and the tooltip is still to be painted.
+# Chang: 'handle_event' function now requests a redraw for mouse clicks, drags and keyboard input handled by the widget.
+# Added: 'g_layout_version' class level property and 'layout_changed' function to signal that the hit-test index must be rebuilt.
+# Added: 'hit_rect' overridable function which returns the screen area reacting to the mouse, and 'hovered' function.
+# Added: 'tooltip_waiting' function to indicate whether a tooltip is counting down its delay to be painted.
+# Added: 'text_prefix_widths' module level function with a LRU cache of the cumulative widths of all the text prefixes,
+#         so that textbox cursor and selection positions are looked up instead of measured.
+# Added: 'g_draw_offset' class level property and 'set_draw_offset' function with the translation (in pixels) that the operator
+#         applies to all widgets while the panel is dragged, so that their geometry does not need to be rebuilt at every mouse move.
+# Added: 'current_theme' and 'current_ui_style' functions which return the theme and ui style from the draw pass snapshot.
+# Chang: 'RC_UI_BIND', 'RC_SCALE', 'RC_SLIDE', 'ui_scale' and 'over_scale' functions, as well as the text measurements signature,
+#         take their values from the draw pass snapshot (see 'begin_frame' in bl_ui_draw_op.py) when drawing.
+# Added: 'get_widget_globals' and 'set_widget_globals' functions so that each panel (widget tree) keeps its own hovered
+#         tooltip widget, exclusive mode and draw offset when several panels are displayed at once.
+# Chang: 'current_theme' and 'current_ui_style' functions return the theme and ui style values already resolved to plain values
+#         during a draw pass, and the new 'theme_version' function tells whether any of those has changed.
+
 # v1.0.2 (10.31.2021) - by Marcelo M. Marques
 # Added: 'valid_modes' property to indicate the 'bpy.context.mode' valid values for displaying the panel.
 # Added: 'init_mode' function to allow the 'bl_ui_slider' subclass to call it without triggering an update from the former 'init' function.
@@ -70,21 +105,25 @@ bl_info = {"name": "BL UI Widgets",
 
 # --- ### Imports
 import bpy
-import gpu
 import bgl
 import blf
 import time
 
+from functools import lru_cache
 from gpu_extras.batch import batch_for_shader
 from math import pi, cos, sin
 
-from . bl_ui_draw_op import get_3d_area_and_region, valid_display_mode
+from . bl_ui_draw_op import BL_UI_OT_draw_operator, get_3d_area_and_region, valid_display_mode, frame_snapshot
+from . bl_ui_shaders import get_builtin_shader, get_image_texture
 
 
 class BL_UI_Widget():
 
     g_tooltip_widget = None   # Widget object which mouse pointer is currently over (e.g. some button)
     g_exclusive_mode = None   # Widget object which is undergoing an exclusive action (e.g. some textbox)
+    g_draw_calls = 0          # Number of draw calls issued by the widgets' background, outline, shadow and image routines
+    g_layout_version = 0      # Incremented whenever some widget changes position or size (used to rebuild the hit-test index)
+    g_draw_offset = (0, 0)    # Translation in pixels applied to all widgets at draw time (used while the panel is dragged)
 
     def __init__(self, x, y, width, height):
 
@@ -117,6 +156,10 @@ class BL_UI_Widget():
         self.__tooltip_shifted = False  # Indicates whether the container panel has been dragged to another position
 
         self.__update_shaders = True    # Indicates whether all other shaders need to be updated for the next draw
+        self._is_dirty = True           # Indicates whether the geometry has changed since the container panel last merged it
+        self._is_merged = False         # Indicates whether background, outline and shadow are drawn by the container panel batch
+        self.__image_key = None         # Screen position, size, offset and scale that the image batch was built for
+        self.__visual_state = None      # Latest 'visual_state' value, to detect when the widget must be repainted
         self.__mouse_down = False       # Indicates whether mouse button is currently pressed by user
         self.__inrect = False           # Indicates whether mouse pointer is currently over the widget area
 
@@ -185,6 +228,9 @@ class BL_UI_Widget():
 
     def RC_UI_BIND(self):
         """ General scaling for 'Remote Control' panel """
+        snapshot = frame_snapshot()
+        if snapshot is not None:
+            return snapshot["RC_UI_BIND"]
         if __package__.find(".") != -1:
             package = __package__[0:__package__.find(".")]
         else:
@@ -199,6 +245,9 @@ class BL_UI_Widget():
         """ Scaling to be applied on the Remote Control panel
             over (in addition to) the interface ui_scale.
         """
+        snapshot = frame_snapshot()
+        if snapshot is not None:
+            return snapshot["RC_SCALE"]
         if __package__.find(".") != -1:
             package = __package__[0:__package__.find(".")]
         else:
@@ -214,6 +263,9 @@ class BL_UI_Widget():
             If (ON): remote panel slides together with viewport's bottom border.
             If (OFF): remote panel stays in place regardless of viewport resizing;
         """
+        snapshot = frame_snapshot()
+        if snapshot is not None:
+            return snapshot["RC_SLIDE"]
         if __package__.find(".") != -1:
             package = __package__[0:__package__.find(".")]
         else:
@@ -225,6 +277,9 @@ class BL_UI_Widget():
         return (slide)
 
     def ui_scale(self, value):
+        snapshot = frame_snapshot()
+        if snapshot is not None:
+            return (value * snapshot["ui_scale"])
         if self.RC_UI_BIND():
             # From Preferences/Interface/"Display"
             return (value * bpy.context.preferences.view.ui_scale)
@@ -233,12 +288,30 @@ class BL_UI_Widget():
 
     def over_scale(self, value):
         # Applies the over scale as configured in the addon preferences
+        snapshot = frame_snapshot()
+        if snapshot is not None:
+            return (value * snapshot["over_scale"])
         return (self.ui_scale(value) * self.RC_SCALE())
 
+    def current_theme(self):
+        # During a draw pass the theme values come from the snapshot taken for that pass (already resolved to plain values)
+        snapshot = frame_snapshot()
+        return bpy.context.preferences.themes[0] if snapshot is None else snapshot["theme"]
+
+    def current_ui_style(self):
+        # During a draw pass the ui style values come from the snapshot taken for that pass (already resolved to plain values)
+        snapshot = frame_snapshot()
+        return bpy.context.preferences.ui_styles[0] if snapshot is None else snapshot["ui_style"]
+
+    def theme_version(self):
+        # Changes whenever some theme or ui style value used by the widgets has changed (None outside of the draw passes)
+        snapshot = frame_snapshot()
+        return None if snapshot is None else snapshot["theme_version"]
+
     def leverage_text_size(self, text_size, style):
         # Re-size the programmer's informed text size in relation to Blender's standard font types.
         # Depending on the selected theme, these numbers below may have a little discrepancy, sorry.
-        theme = bpy.context.preferences.ui_styles[0]
+        theme = self.current_ui_style()
         widget_style = getattr(theme, style)
         style_size = widget_style.points
         if style == "panel_title":
@@ -254,7 +327,7 @@ class BL_UI_Widget():
             roundness = self._roundness
         else:
             # From Preferences/Themes/User Interface/<style>
-            theme = bpy.context.preferences.themes[0]
+            theme = self.current_theme()
             widget_style = getattr(theme.user_interface, self.my_style())
             roundness = widget_style.roundness
         scaled_radius = self.ui_scale(radius) if self._is_tooltip else self.over_scale(radius)
@@ -304,6 +377,9 @@ class BL_UI_Widget():
         self.__tooltip_current = False
 
     def tooltip_clear(self):
+        if self.__tooltip_current:
+            # Tooltip is on screen, so it must be repainted to be removed
+            self.request_redraw()
         self.__tooltip_gotimer = 0
         self.__tooltip_current = False
 
@@ -311,6 +387,19 @@ class BL_UI_Widget():
         base_class = super().__thisclass__.__mro__[-2]  # This stunt only to avoid hard coding the Base class name
         base_class.g_exclusive_mode = value
 
+    def set_draw_offset(self, value):
+        base_class = super().__thisclass__.__mro__[-2]  # This stunt only to avoid hard coding the Base class name
+        base_class.g_draw_offset = value
+
+    def get_widget_globals(self):
+        # Class level state that belongs to one panel only, so that it can be kept apart while another panel is active
+        base_class = super().__thisclass__.__mro__[-2]  # This stunt only to avoid hard coding the Base class name
+        return (base_class.g_tooltip_widget, base_class.g_exclusive_mode, base_class.g_draw_offset)
+
+    def set_widget_globals(self, values):
+        base_class = super().__thisclass__.__mro__[-2]  # This stunt only to avoid hard coding the Base class name
+        base_class.g_tooltip_widget, base_class.g_exclusive_mode, base_class.g_draw_offset = values
+
     def set_location(self, x, y):
         self.x = x
         self.y = y
@@ -333,6 +422,7 @@ class BL_UI_Widget():
         self.__valid_modes = valid_modes
         self.tooltip_clear()
         self.set_exclusive_mode(None)
+        self.set_draw_offset((0, 0))
 
     def context_it(self, context):
         self.context = context
@@ -343,6 +433,8 @@ class BL_UI_Widget():
             not get their rounded corners adjusted in real time when user plays with the roundness
             values under Preferences/Themes, but eventually it will catch up and get updated.
         """
+        self.layout_changed()
+
         if self._is_tooltip:
             base_class = super().__thisclass__.__mro__[-2]
             widget = base_class.g_tooltip_widget
@@ -352,7 +444,7 @@ class BL_UI_Widget():
             self.x_screen = x
             self.y_screen = y
 
-        self.shader = gpu.shader.from_builtin('2D_UNIFORM_COLOR')
+        self.shader = get_builtin_shader('2D_UNIFORM_COLOR')
 
         # used to be: if scaled_radius == 0 or scaled_radius > 10 or self._rounded_corners == (0,0,0,0):
         # but unfortunately 'TRI_FAN' results in a worse smooth render
@@ -364,6 +456,7 @@ class BL_UI_Widget():
             self.batch_panel = batch_for_shader(self.shader, 'LINES', {"pos": vertices})
 
         self.__update_shaders = True
+        self._is_dirty = True
 
     def verify_screen_position(self, area_height):
         if self._is_tooltip:
@@ -416,6 +509,38 @@ class BL_UI_Widget():
 
         return False
 
+    def tooltip_pending(self):
+        # Indicates whether the tooltip must be painted now but it has not been yet
+        base_class = super().__thisclass__.__mro__[-2]
+        widget = base_class.g_tooltip_widget
+        return (not self.halt_tooltip() and not widget.__tooltip_current)
+
+    def tooltip_waiting(self):
+        # Indicates whether the mouse is over a widget with a tooltip which has not been painted yet
+        base_class = super().__thisclass__.__mro__[-2]
+        widget = base_class.g_tooltip_widget
+        prefs = bpy.context.preferences.view
+        if widget is None or widget.__tooltip_gotimer == 0 or widget.__tooltip_current or not prefs.show_tooltips:
+            return False
+        return not (widget._tooltip_text == "" and widget._tooltip_shortcut == "" and
+                    (widget._tooltip_python == "" or not prefs.show_tooltips_python))
+
+    def request_redraw(self):
+        # The operator only tags the area for redraw when some widget has requested it (see modal function in bl_ui_draw_op.py)
+        BL_UI_OT_draw_operator.redraw_requested = True
+
+    def visual_state(self):
+        """ Returns everything that affects how the widget is painted on screen, so that a redraw is only requested
+            when some of it changes. Subclasses extend it with their own state (e.g. hover/pressed state, text, value).
+        """
+        return (self._is_visible, self._is_enabled, self.x_screen, self.y_screen, self.width, self.height)
+
+    def verify_visual_state(self):
+        state = self.visual_state()
+        if state != self.__visual_state:
+            self.__visual_state = state
+            self.request_redraw()
+
     def draw(self):
         ''' Note:
             This function is used by BL_UI_Drag_Panel, BL_UI_Button and BL_UI_Tooltip classes.
@@ -437,6 +562,15 @@ class BL_UI_Widget():
 
         self.verify_screen_position(area_height)
 
+        if self._is_merged:
+            # Background, outline and shadow have already been painted by the container panel's merged batch
+            bgl.glEnable(bgl.GL_BLEND)
+            self.draw_image()
+            bgl.glDisable(bgl.GL_BLEND)
+            self.draw_text()
+            self.__update_shaders = False
+            return
+
         self.shader.bind()
 
         self.set_colors()
@@ -454,6 +588,7 @@ class BL_UI_Widget():
         #     bgl.glEnable(bgl.GL_LINE_SMOOTH)
 
         self.batch_panel.draw(self.shader)
+        self.count_draw_calls()
 
         # #used to be: if scaled_radius == 0 or scaled_radius > 10 or self._rounded_corners == (0, 0, 0, 0):
         # if scaled_radius > 10:
@@ -479,6 +614,9 @@ class BL_UI_Widget():
         self.__update_shaders = False
 
     def set_colors(self):
+        self.shader.uniform_float("color", self.get_bg_color())
+
+    def get_bg_color(self):
         if not (self._bg_color is None):
             bgColor = self._bg_color
         elif self._style == 'NONE':
@@ -486,17 +624,17 @@ class BL_UI_Widget():
             bgColor = (0, 0, 0, 0)
         elif self._style == 'TOOLTIP':
             # From Preferences/Themes/User Interface/"Tooltip"
-            theme = bpy.context.preferences.themes[0]
+            theme = self.current_theme()
             widget_style = getattr(theme.user_interface, "wcol_tooltip")
             bgColor = widget_style.inner
         elif self._style == 'BOX':
             # From Preferences/Themes/User Interface/"Box"
-            theme = bpy.context.preferences.themes[0]
+            theme = self.current_theme()
             widget_style = getattr(theme.user_interface, "wcol_box")
             bgColor = widget_style.inner
         else:
             # From Preferences/Themes/3D Viewport/"Panel Colors"
-            theme = bpy.context.preferences.themes[0]
+            theme = self.current_theme()
             widget_style = getattr(theme.view_3d.space, "panelcolors")
             if self._style == 'HEADER':
                 bgColor = widget_style.header
@@ -507,7 +645,7 @@ class BL_UI_Widget():
             else:
                 # Warning error out color :-)
                 bgColor = (1, 0, 0, 1)
-        self.shader.uniform_float("color", bgColor)
+        return bgColor
 
     def tint_color(self, input_color, amount):
         # Turns the input color into a tinted tone per some percent amount
@@ -533,20 +671,17 @@ class BL_UI_Widget():
             output_color = (r, g, b, input_color[3])
         return output_color
 
-    def draw_outline(self):
-        if not self._is_visible:
-            return
-
+    def get_outline_color(self):
         if not (self._outline_color is None):
             color = self._outline_color
         else:
             # From Preferences/Themes/User Interface/<style>
-            theme = bpy.context.preferences.themes[0]
+            theme = self.current_theme()
             widget_style = getattr(theme.user_interface, self.my_style())
             color = tuple(widget_style.outline) + (1.0,)
 
         if color[3] == 0:
-            # Means that the drawing will be invisible, so get out of here
+            # Means that the drawing will be invisible
             return None
 
         try:
@@ -564,8 +699,19 @@ class BL_UI_Widget():
             # Take the outline color and "dark" it by 30%
             color = self.shade_color(color, 0.3)
 
+        return color
+
+    def draw_outline(self):
+        if not self._is_visible:
+            return
+
+        color = self.get_outline_color()
+        if color is None:
+            # Means that the drawing will be invisible, so get out of here
+            return None
+
         if self.__update_shaders or not hasattr(self, 'shader_outline'):
-            self.shader_outline = gpu.shader.from_builtin('2D_UNIFORM_COLOR')
+            self.shader_outline = get_builtin_shader('2D_UNIFORM_COLOR')
 
         self.shader_outline.bind()
         self.shader_outline.uniform_float("color", color)
@@ -586,6 +732,7 @@ class BL_UI_Widget():
                             )
                 self.batch_outline = batch_for_shader(self.shader_outline, 'LINES', {"pos": vertices})
             self.batch_outline.draw(self.shader_outline)
+            self.count_draw_calls()
         else:
             # used to be: if scaled_radius == 0 or scaled_radius > 10 or self._rounded_corners == (0, 0, 0, 0):
             # but unfortunately 'TRI_FAN' results in a worse smooth render
@@ -595,6 +742,7 @@ class BL_UI_Widget():
                     vertices = self.calc_corners_for_trifan(self.x_screen, self.y_screen, self.width, self.height, self._radius, 'FULL')
                     self.batch_outline = batch_for_shader(self.shader_outline, 'LINE_LOOP', {"pos": vertices})
                 self.batch_outline.draw(self.shader_outline)
+                self.count_draw_calls()
             else:
                 # bgl.glPointSize(1)
                 # vertices = self.calc_corners_for_lines(self.x_screen, self.y_screen, self.width, self.height, self._radius, 'OUTLINE-A')
@@ -609,25 +757,34 @@ class BL_UI_Widget():
                     vertices = self.calc_corners_for_lines(self.x_screen, self.y_screen, self.width, self.height, self._radius, 'OUTLINE-A')
                     self.batch_outline = batch_for_shader(self.shader_outline, 'LINE_LOOP', {"pos": vertices})
                 self.batch_outline.draw(self.shader_outline)
+                self.count_draw_calls()
 
-    def draw_shadow(self):
-        if not (self._is_visible and self.shadow):
-            return None
-
-        # Paint shadow
-        if self.__update_shaders:
-            self.shader_shadow1 = gpu.shader.from_builtin('2D_UNIFORM_COLOR')
-            self.shader_shadow2 = gpu.shader.from_builtin('2D_UNIFORM_COLOR')
-
+    def get_shadow_color(self):
         if self._shadow_color is None:
             # From Preferences/Themes/User Interface/"Styles"
-            theme = bpy.context.preferences.themes[0]
+            theme = self.current_theme()
             widget_style = theme.user_interface
             color = widget_style.widget_emboss
         else:
             color = self._shadow_color
 
         if color[3] == 0:
+            # Means that the drawing will be invisible
+            return None
+
+        return color
+
+    def draw_shadow(self):
+        if not (self._is_visible and self.shadow):
+            return None
+
+        # Paint shadow
+        if self.__update_shaders:
+            self.shader_shadow1 = get_builtin_shader('2D_UNIFORM_COLOR')
+            self.shader_shadow2 = get_builtin_shader('2D_UNIFORM_COLOR')
+
+        color = self.get_shadow_color()
+        if color is None:
             # Means that the drawing will be invisible, so get out of here
             return None
 
@@ -651,6 +808,7 @@ class BL_UI_Widget():
                             )
                 self.batch_shadow1 = batch_for_shader(self.shader_shadow1, 'LINES', {"pos": vertices})
             self.batch_shadow1.draw(self.shader_shadow1)
+            self.count_draw_calls()
         else:
             # used to be: if scaled_radius == 0 or scaled_radius > 10 or self._rounded_corners == (0, 0, 0, 0):
             # but unfortunately 'TRI_FAN' results in a worse smooth render
@@ -660,22 +818,65 @@ class BL_UI_Widget():
                     vertices = self.calc_corners_for_trifan(self.x_screen, self.y_screen, self.width, self.height, self._radius, 'SHADOW')
                     self.batch_shadow1 = batch_for_shader(self.shader_shadow1, 'LINE_STRIP', {"pos": vertices})
                 self.batch_shadow1.draw(self.shader_shadow1)
+                self.count_draw_calls()
             else:
                 bgl.glPointSize(1)
                 if self.__update_shaders or not hasattr(self, 'batch_shadow1'):
                     vertices = self.calc_corners_for_lines(self.x_screen, self.y_screen, self.width, self.height, self._radius, 'SHADOW-A')
                     self.batch_shadow1 = batch_for_shader(self.shader_shadow1, 'POINTS', {"pos": vertices})
                 self.batch_shadow1.draw(self.shader_shadow1)
+                self.count_draw_calls()
                 bgl.glLineWidth(1)
                 if self.__update_shaders or not hasattr(self, 'batch_shadow2'):
                     vertices = self.calc_corners_for_lines(self.x_screen, self.y_screen, self.width, self.height, self._radius, 'SHADOW-B')
                     self.batch_shadow2 = batch_for_shader(self.shader_shadow2, 'LINES', {"pos": vertices})
                 self.batch_shadow2.draw(self.shader_shadow2)
+                self.count_draw_calls()
                 # bgl.glLineWidth(1)
                 # vertices = self.calc_corners_for_lines(self.x_screen, self.y_screen, self.width, self.height, self._radius, 'SHADOW')
                 # self.batch_shadow = batch_for_shader(self.shader_shadow, 'LINE_STRIP', {"pos": vertices})
                 # self.batch_shadow.draw(self.shader_shadow)
 
+    def count_draw_calls(self, count=1):
+        base_class = super().__thisclass__.__mro__[-2]  # This stunt only to avoid hard coding the Base class name
+        base_class.g_draw_calls += count
+
+    def batchable(self):
+        # This might be overriden by the subclasses which can have their background, outline and shadow merged by the panel
+        return False
+
+    def merged_geometry(self):
+        '''
+            Returns the same shapes painted by 'update', 'draw_outline' and 'draw_shadow' but converted to primitives
+            that can be concatenated with the other widgets' ones: (fill primitive, fill vertices, outline lines, shadow lines).
+            Fill primitive is either 'TRIS' or 'LINES'; outline and shadow are always pairs of vertices for 'LINES'.
+        '''
+        def loop_to_lines(vertices, closed):
+            count = len(vertices) if closed else len(vertices) - 1
+            return [v for i in range(count) for v in (vertices[i], vertices[(i + 1) % len(vertices)])]
+
+        if self.scaled_radius(self._radius, self.height) > 10:
+            fan = self.calc_corners_for_trifan(self.x_screen, self.y_screen, self.width, self.height, self._radius, 'FULL')
+            fill = [v for i in range(1, len(fan) - 1) for v in (fan[0], fan[i], fan[i + 1])]
+            fill_type = 'TRIS'
+            outline = loop_to_lines(fan, True)
+            shadow = []
+            if self.shadow:
+                vertices = self.calc_corners_for_trifan(self.x_screen, self.y_screen, self.width, self.height, self._radius, 'SHADOW')
+                shadow = loop_to_lines(vertices, False)
+        else:
+            fill = self.calc_corners_for_lines(self.x_screen, self.y_screen, self.width, self.height, self._radius, 'FULL')
+            fill_type = 'LINES'
+            vertices = self.calc_corners_for_lines(self.x_screen, self.y_screen, self.width, self.height, self._radius, 'OUTLINE-A')
+            outline = loop_to_lines(vertices, True)
+            shadow = []
+            if self.shadow:
+                # The shadow corner points become one pixel long lines, so that they can share the same 'LINES' buffer
+                vertices = self.calc_corners_for_lines(self.x_screen, self.y_screen, self.width, self.height, self._radius, 'SHADOW-A')
+                shadow = [v for x, y in vertices for v in ((x, y), (x + 1, y))]
+                shadow += self.calc_corners_for_lines(self.x_screen, self.y_screen, self.width, self.height, self._radius, 'SHADOW-B')
+        return (fill_type, fill, outline, shadow)
+
     def draw_text(self):
         # This one applies only to objects of BL_UI_Button and BL_UI_Tooltip classes,
         # so the full overriding functions are in their py module
@@ -688,33 +889,42 @@ class BL_UI_Widget():
 
         if self._image is not None:
             try:
-                off_x = self.over_scale(self._image_position[0])
-                off_y = self.over_scale(self._image_position[1])
+                # The image quad only needs to be rebuilt when the widget moves or the image layout or scale changes
+                key = (self.x_screen, self.y_screen, tuple(self._image_size), tuple(self._image_position), self.over_scale(1))
+                self.shader_img = get_builtin_shader('2D_IMAGE')
+                if key != self.__image_key or not hasattr(self, 'batch_img'):
+                    off_x = self.over_scale(self._image_position[0])
+                    off_y = self.over_scale(self._image_position[1])
 
-                sx = self.over_scale(self._image_size[0])
-                sy = self.over_scale(self._image_size[1])
+                    sx = self.over_scale(self._image_size[0])
+                    sy = self.over_scale(self._image_size[1])
 
-                x_screen = self.over_scale(self.x_screen)
-                y_screen = self.over_scale(self.y_screen)
+                    x_screen = self.over_scale(self.x_screen)
+                    y_screen = self.over_scale(self.y_screen)
 
-                # Bottom left, top left, top right, bottom right
-                vertices = ((x_screen + off_x, y_screen - off_y),
-                            (x_screen + off_x, y_screen - sy - off_y),
-                            (x_screen + off_x + sx, y_screen - sy - off_y),
-                            (x_screen + off_x + sx, y_screen - off_y))
+                    # Bottom left, top left, top right, bottom right
+                    vertices = ((x_screen + off_x, y_screen - off_y),
+                                (x_screen + off_x, y_screen - sy - off_y),
+                                (x_screen + off_x + sx, y_screen - sy - off_y),
+                                (x_screen + off_x + sx, y_screen - off_y))
 
-                self.shader_img = gpu.shader.from_builtin('2D_IMAGE')
-                self.batch_img = batch_for_shader(self.shader_img,
-                                                  'TRI_FAN', {"pos": vertices,
-                                                              "texCoord": ((0, 1), (0, 0), (1, 0), (1, 1)), },
-                                                  )
+                    self.batch_img = batch_for_shader(self.shader_img,
+                                                      'TRI_FAN', {"pos": vertices,
+                                                                  "texCoord": ((0, 1), (0, 0), (1, 0), (1, 1)), },
+                                                      )
+                    self.__image_key = key
 
-                bgl.glActiveTexture(bgl.GL_TEXTURE0)
-                bgl.glBindTexture(bgl.GL_TEXTURE_2D, self._image.bindcode)
+                texture = get_image_texture(self._image)
 
                 self.shader_img.bind()
-                self.shader_img.uniform_int("image", 0)
+                if texture is None:
+                    bgl.glActiveTexture(bgl.GL_TEXTURE0)
+                    bgl.glBindTexture(bgl.GL_TEXTURE_2D, self._image.bindcode)
+                    self.shader_img.uniform_int("image", 0)
+                else:
+                    self.shader_img.uniform_sampler("image", texture)
                 self.batch_img.draw(self.shader_img)
+                self.count_draw_calls()
             except Exception as e:
                 pass
 
@@ -747,6 +957,7 @@ class BL_UI_Widget():
             return self.timer_event(event, x, y)
 
         elif(event.type == 'LEFTMOUSE'):
+            self.request_redraw()
             if(event.value == 'PRESS'):
                 self.tooltip_clear()
                 if self._is_enabled:
@@ -778,10 +989,14 @@ class BL_UI_Widget():
                 return self.mouse_exit(event, x, y)
             else:
                 # We've been moving around
+                if self.__mouse_down:
+                    # Dragging (e.g. the panel or a slider value)
+                    self.request_redraw()
                 return self.mouse_move(event, x, y)
 
         elif(event.value == 'PRESS' and (event.ascii != '' or event.type in self.get_input_keys())):
             self.tooltip_clear()
+            self.request_redraw()
             return self.keyboard_press(event)
 
         elif('MOUSE' in event.type):
@@ -823,6 +1038,21 @@ class BL_UI_Widget():
         else:
             return self.__area_width
 
+    def layout_changed(self):
+        base_class = super().__thisclass__.__mro__[-2]  # This stunt only to avoid hard coding the Base class name
+        base_class.g_layout_version += 1
+
+    def hit_rect(self):
+        """ Returns the screen area (left, bottom, right, top in pixels) tested by 'is_in_rect' function,
+            or None when the widget never reacts to the mouse. Used to build the operator's hit-test index.
+        """
+        return (self.over_scale(self.x_screen), self.over_scale(self.y_screen - self.height),
+                self.over_scale(self.x_screen + self.width), self.over_scale(self.y_screen))
+
+    def hovered(self):
+        # Indicates whether the mouse pointer was over the widget area on the latest mouse move
+        return self.__inrect
+
     def is_in_rect(self, x, y):
         widget_x = self.over_scale(self.x_screen)
         widget_y = self.over_scale(self.y_screen)
@@ -916,99 +1146,9 @@ class BL_UI_Widget():
         width = self.ui_scale(width) if self._is_tooltip else self.over_scale(width)
         height = self.ui_scale(height) if self._is_tooltip else self.over_scale(height)
 
-        if r <= 0:
-            r = 0
-            rounded_corners = (0, 0, 0, 0)
-        else:
-            rounded_corners = self._rounded_corners
-
-        w = width - 1
-        h = height - 1
-
-        coords = []
-
-        if rounded_corners != (0, 0, 0, 0):
-            # Traditional Method
-            newco = []
-            segments = r + 1
-            m = (1.0 / (4 * r - 1)) * (pi * 2)
-            for p in range(segments):
-                x = cos(m * p) * r
-                y = sin(m * p) * r
-                newco.append((round(x), round(y)))
-            newco = sorted(newco, key=lambda c: (c[0], -c[1]))
-
-            # Alternative Method (not much good; kept for documentation)
-            # x = 0
-            # y = r
-            # d = int(3 - 2*r)
-
-            # coords.append((x, y))
-            # coords.append((y, x))
-            # while y >= x:
-            #   x = x + 1
-            #   if d > 0:
-            #       y = y - 1
-            #       d = d + 4*(x-y) + 10
-            #   else:
-            #       d = d + 4*x + 6
-            #   coords.append((x, y))
-            #   coords.append((y, x))
-            # newco = list(set(coords))
-            # newco = sorted(newco, key=lambda c: (c[0],-c[1]))
-            # coords.clear()
-
-        if selection == 'FULL':
-            # Top Left corners
-            if rounded_corners[1] == 0:
-                coords.append((x_screen, y_screen))
-            else:
-                corner_center = (x_screen + r, y_screen - r)
-                for c in reversed(newco):
-                    coords.append((corner_center[0] - c[0], corner_center[1] + c[1]))
-
-            # Top Right corners
-            if rounded_corners[2] == 0:
-                coords.append((x_screen + w, y_screen))
-            else:
-                corner_center = (x_screen + w - r, y_screen - r)
-                for c in newco:
-                    coords.append((corner_center[0] + c[0], corner_center[1] + c[1]))
-
-        # Shadow right border starting point
-        if selection == 'SHADOW':
-            coords.append((x_screen + w + 1, y_screen - int(h / 2)))
-
-        # Bottom Right corners
-        if rounded_corners[3] == 0:
-            if selection == 'SHADOW':
-                # Apply an offset of some pixels
-                coords.append((x_screen + w + 1, y_screen - h - 1))
-            else:
-                coords.append((x_screen + w, y_screen - h))
-        else:
-            corner_center = (x_screen + w - r, y_screen - h + r)
-            for c in reversed(newco):
-                if selection == 'SHADOW':
-                    # Apply an offset of some pixels
-                    coords.append((corner_center[0] + c[0] + 1, corner_center[1] - c[1] - 1))
-                else:
-                    coords.append((corner_center[0] + c[0], corner_center[1] - c[1]))
-
-        # Bottom Left corners
-        if rounded_corners[0] == 0 or selection == 'SHADOW':
-            if selection == 'SHADOW':
-                # Apply an offset of some pixels
-                k = 0 if rounded_corners[0] == 0 else r
-                coords.append((x_screen + k + 1, y_screen - h - 1))
-            else:
-                coords.append((x_screen, y_screen - h))
-        else:
-            corner_center = (x_screen + r, y_screen - h + r)
-            for c in newco:
-                coords.append((corner_center[0] - c[0], corner_center[1] - c[1]))
-
-        return coords
+        # The shape is calculated only once per size and then just moved to the widget's position
+        coords = trifan_corners(width, height, r, tuple(self._rounded_corners), selection)
+        return [(x_screen + cx, y_screen + cy) for cx, cy in coords]
 
     def calc_corners_for_lines(self, x_screen, y_screen, width, height, radius, selection):
         '''
@@ -1030,144 +1170,361 @@ class BL_UI_Widget():
         width = self.ui_scale(width) if self._is_tooltip else self.over_scale(width)
         height = self.ui_scale(height) if self._is_tooltip else self.over_scale(height)
 
-        x = x_screen
-        y = y_screen
-
-        w = width - 1
-        h = height - 1
-
-        coords = self._get_mapped_coords(r)
-
-        if selection != 'FULL':
-            # Building the contour coordinates by determining points in the 4 corners
-            if selection != 'SHADOW-A':
-                o0 = []
-                o2 = []
-                for c in coords:
-                    # Bottom Left corners
-                    offset = 0 if self._rounded_corners[0] == 0 else c[0]
-                    o0.append((x + 0 + offset, y - h + c[1]))
-                    # Top Right corners
-                    offset = 0 if self._rounded_corners[2] == 0 else c[0]
-                    o2.append((x + w - offset, y - 0 - c[1]))
-            o1 = []
-            o3 = []
-            for c in reversed(coords):
-                # Top Left corners
-                offset = 0 if self._rounded_corners[1] == 0 else c[0]
-                o1.append((x + 0 + offset, y - 0 - c[1]))
-                # Bottom Right corners
-                offset = 0 if self._rounded_corners[3] == 0 else c[0]
-                o3.append((x + w - offset, y - h + c[1]))
-
-        if selection == 'OUTLINE-A':
-            # Building a list with only the contour corners
-            outline = o0 + o1 + o2 + o3
-            return outline
-
-        if selection == 'OUTLINE-B':
-            # Determining the 4 borders lines to use with outline contour corners
-            borders = []
-            if o0[-1] != o1[0]:
-                borders.append(o0[-1])
-                borders.append(o1[0])
-            if o1[-1] != o2[0]:
-                borders.append(o1[-1])
-                borders.append(o2[0])
-            if o2[-1] != o3[0]:
-                borders.append(o2[-1])
-                borders.append(o3[0])
-            if o3[-1] != o0[0]:
-                borders.append(o3[-1])
-                borders.append(o0[0])
-            return borders
+        # The shape is calculated only once per size and then just moved to the widget's position
+        coords = lines_corners(width, height, r, tuple(self._rounded_corners), selection)
+        return [(x_screen + cx, y_screen + cy) for cx, cy in coords]
+
+    def _get_mapped_coords(self, radius):
+        return list(mapped_coords(radius))
+
+
+# --- ### Geometry cache
+# The functions below return the vertices relative to the widget's top left corner (0, 0).
+# Width, height and radius are informed already scaled, so that any change of ui_scale or
+# of the addon's over scale produces a new cache key and the stale shapes simply age out.
+
+GEOMETRY_CACHE_SIZE = 512
+
+
+@lru_cache(maxsize=GEOMETRY_CACHE_SIZE)
+def trifan_corners(width, height, r, rounded_corners, selection):
+    x = 0
+    y = 0
+
+    if r <= 0:
+        r = 0
+        rounded_corners = (0, 0, 0, 0)
+
+    w = width - 1
+    h = height - 1
+
+    coords = []
+
+    if rounded_corners != (0, 0, 0, 0):
+        # Traditional Method
+        newco = []
+        segments = r + 1
+        m = (1.0 / (4 * r - 1)) * (pi * 2)
+        for p in range(segments):
+            px = cos(m * p) * r
+            py = sin(m * p) * r
+            newco.append((round(px), round(py)))
+        newco = sorted(newco, key=lambda c: (c[0], -c[1]))
+
+        # Alternative Method (not much good; kept for documentation)
+        # x = 0
+        # y = r
+        # d = int(3 - 2*r)
+
+        # coords.append((x, y))
+        # coords.append((y, x))
+        # while y >= x:
+        #   x = x + 1
+        #   if d > 0:
+        #       y = y - 1
+        #       d = d + 4*(x-y) + 10
+        #   else:
+        #       d = d + 4*x + 6
+        #   coords.append((x, y))
+        #   coords.append((y, x))
+        # newco = list(set(coords))
+        # newco = sorted(newco, key=lambda c: (c[0],-c[1]))
+        # coords.clear()
+
+    if selection == 'FULL':
+        # Top Left corners
+        if rounded_corners[1] == 0:
+            coords.append((x, y))
+        else:
+            corner_center = (x + r, y - r)
+            for c in reversed(newco):
+                coords.append((corner_center[0] - c[0], corner_center[1] + c[1]))
+
+        # Top Right corners
+        if rounded_corners[2] == 0:
+            coords.append((x + w, y))
+        else:
+            corner_center = (x + w - r, y - r)
+            for c in newco:
+                coords.append((corner_center[0] + c[0], corner_center[1] + c[1]))
+
+    # Shadow right border starting point
+    if selection == 'SHADOW':
+        coords.append((x + w + 1, y - int(h / 2)))
 
+    # Bottom Right corners
+    if rounded_corners[3] == 0:
         if selection == 'SHADOW':
-            # Building shadow entire profile
-            shadow = []
-            shadow.append((o0[0][0] + 0, o0[0][1] - 1))
-            for c in reversed(o3):
-                shadow.append((c[0] + 1, c[1] - 1))
-            shadow.append((o2[-1][0] + 1, y - (h / 2) - 0))
-            return shadow
-
-        if selection == 'SHADOW-A':
-            # Building shadow corner
-            shadow_curve = []
-            for c in o3:
-                shadow_curve.append((c[0] + 1, c[1] - 1))
-            return shadow_curve
-
-        if selection == 'SHADOW-B':
-            # Determining the 2 borders lines to use with shadow contour corner
-            shadow_lines = []
-            shadow_lines.append((o0[ 0][0] + 0, o0[ 0][1] - 1))
-            shadow_lines.append((o3[-1][0] + 1, o3[-1][1] - 1))
-            shadow_lines.append((o3[ 0][0] + 1, o3[ 0][1] - 0))
-            shadow_lines.append((o2[-1][0] + 1, y - (h/2) - 0))
-            return shadow_lines
-
-        if selection == 'FULL':
-            # Building array of horizontal lines for entire background
-            lines = []
-            # Top section
-            prior = coords[0]
-            for c in coords:
-                if c[1] != prior[1]:
-                    cy = y - prior[1]
-                    offset = 0 if self._rounded_corners[1] == 0 else prior[0]  # Top Left corners
-                    lines.append((x + 0 + offset, cy))
-                    offset = 0 if self._rounded_corners[2] == 0 else prior[0]  # Top Right corners
-                    lines.append((x + w - offset, cy))
-                prior = c
-            cy = y - prior[1]
-            offset = 0 if self._rounded_corners[1] == 0 else prior[0]  # Top Left corners
-            lines.append((x + 0 + offset, cy))
-            offset = 0 if self._rounded_corners[2] == 0 else prior[0]  # Top Right corners
-            lines.append((x + w - offset, cy))
-            # Middle section
-            next_y = cy - 1
-            last_y = y - h + coords[-1][1]
-            while next_y > last_y:
-                lines.append((x + 0, next_y))
-                lines.append((x + w, next_y))
-                next_y -= 1
-            # Bottom section
-            prior = (-1, -1)
-            for c in reversed(coords):
-                if c[1] != prior[1]:
-                    cy = y - h + c[1]
-                    offset = 0 if self._rounded_corners[0] == 0 else c[0]  # Bottom Left corners
-                    lines.append((x + 0 + offset, cy))
-                    offset = 0 if self._rounded_corners[3] == 0 else c[0]  # Bottom Right corners
-                    lines.append((x + w - offset, cy))
-                prior = c
-            return lines
+            # Apply an offset of some pixels
+            coords.append((x + w + 1, y - h - 1))
+        else:
+            coords.append((x + w, y - h))
+    else:
+        corner_center = (x + w - r, y - h + r)
+        for c in reversed(newco):
+            if selection == 'SHADOW':
+                # Apply an offset of some pixels
+                coords.append((corner_center[0] + c[0] + 1, corner_center[1] - c[1] - 1))
+            else:
+                coords.append((corner_center[0] + c[0], corner_center[1] - c[1]))
 
-    def _get_mapped_coords(self, radius):
-        '''
-            Disclaimer:  I decided to use a combination of LINES and POINTS shaders instead of TRIS
-            because the BGL was making some funny business with the rounded corners by not respecting
-            the set of informed points, thus causing ugly assymetric results. The maps in here were
-            manually created by me and they should always give a nice contour.
-            May the god of I.T. forgive me!
-        '''
-        map = [( 0,),
-               ( 1, 0),
-               ( 2, 0, 1),
-               ( 3, 0, 2, 1, 1),
-               ( 4, 0, 3, 1, 2, 1),
-               ( 5, 0, 4, 1, 3, 1, 2),
-               ( 6, 0, 5, 1, 4, 1, 3, 2, 2),
-               ( 7, 0, 6, 1, 5, 1, 4, 2, 3, 2),
-               ( 8, 0, 7, 1, 6, 1, 5, 2, 4, 2, 3),
-               ( 9, 0, 8, 1, 7, 1, 6, 2, 5, 2, 4, 3),
-               (10, 0, 9, 1, 8, 1, 7, 1, 6, 2, 5, 2, 4, 3),
-               ]
-        i = 0
-        coords = []
-        pointset = map[radius] + tuple(reversed(map[radius]))
-        while i < len(pointset):
-            coords.append((pointset[i], pointset[i+1]))
-            i = i + 2
-        return coords
+    # Bottom Left corners
+    if rounded_corners[0] == 0 or selection == 'SHADOW':
+        if selection == 'SHADOW':
+            # Apply an offset of some pixels
+            k = 0 if rounded_corners[0] == 0 else r
+            coords.append((x + k + 1, y - h - 1))
+        else:
+            coords.append((x, y - h))
+    else:
+        corner_center = (x + r, y - h + r)
+        for c in newco:
+            coords.append((corner_center[0] - c[0], corner_center[1] - c[1]))
+
+    return tuple(coords)
+
+
+@lru_cache(maxsize=GEOMETRY_CACHE_SIZE)
+def lines_corners(width, height, r, rounded_corners, selection):
+    x = 0
+    y = 0
+
+    w = width - 1
+    h = height - 1
+
+    coords = mapped_coords(r)
+
+    if selection != 'FULL':
+        # Building the contour coordinates by determining points in the 4 corners
+        if selection != 'SHADOW-A':
+            o0 = []
+            o2 = []
+            for c in coords:
+                # Bottom Left corners
+                offset = 0 if rounded_corners[0] == 0 else c[0]
+                o0.append((x + 0 + offset, y - h + c[1]))
+                # Top Right corners
+                offset = 0 if rounded_corners[2] == 0 else c[0]
+                o2.append((x + w - offset, y - 0 - c[1]))
+        o1 = []
+        o3 = []
+        for c in reversed(coords):
+            # Top Left corners
+            offset = 0 if rounded_corners[1] == 0 else c[0]
+            o1.append((x + 0 + offset, y - 0 - c[1]))
+            # Bottom Right corners
+            offset = 0 if rounded_corners[3] == 0 else c[0]
+            o3.append((x + w - offset, y - h + c[1]))
+
+    if selection == 'OUTLINE-A':
+        # Building a list with only the contour corners
+        outline = o0 + o1 + o2 + o3
+        return tuple(outline)
+
+    if selection == 'OUTLINE-B':
+        # Determining the 4 borders lines to use with outline contour corners
+        borders = []
+        if o0[-1] != o1[0]:
+            borders.append(o0[-1])
+            borders.append(o1[0])
+        if o1[-1] != o2[0]:
+            borders.append(o1[-1])
+            borders.append(o2[0])
+        if o2[-1] != o3[0]:
+            borders.append(o2[-1])
+            borders.append(o3[0])
+        if o3[-1] != o0[0]:
+            borders.append(o3[-1])
+            borders.append(o0[0])
+        return tuple(borders)
+
+    if selection == 'SHADOW':
+        # Building shadow entire profile
+        shadow = []
+        shadow.append((o0[0][0] + 0, o0[0][1] - 1))
+        for c in reversed(o3):
+            shadow.append((c[0] + 1, c[1] - 1))
+        shadow.append((o2[-1][0] + 1, y - (h / 2) - 0))
+        return tuple(shadow)
+
+    if selection == 'SHADOW-A':
+        # Building shadow corner
+        shadow_curve = []
+        for c in o3:
+            shadow_curve.append((c[0] + 1, c[1] - 1))
+        return tuple(shadow_curve)
+
+    if selection == 'SHADOW-B':
+        # Determining the 2 borders lines to use with shadow contour corner
+        shadow_lines = []
+        shadow_lines.append((o0[ 0][0] + 0, o0[ 0][1] - 1))
+        shadow_lines.append((o3[-1][0] + 1, o3[-1][1] - 1))
+        shadow_lines.append((o3[ 0][0] + 1, o3[ 0][1] - 0))
+        shadow_lines.append((o2[-1][0] + 1, y - (h/2) - 0))
+        return tuple(shadow_lines)
+
+    if selection == 'FULL':
+        # Building array of horizontal lines for entire background
+        lines = []
+        # Top section
+        prior = coords[0]
+        for c in coords:
+            if c[1] != prior[1]:
+                cy = y - prior[1]
+                offset = 0 if rounded_corners[1] == 0 else prior[0]  # Top Left corners
+                lines.append((x + 0 + offset, cy))
+                offset = 0 if rounded_corners[2] == 0 else prior[0]  # Top Right corners
+                lines.append((x + w - offset, cy))
+            prior = c
+        cy = y - prior[1]
+        offset = 0 if rounded_corners[1] == 0 else prior[0]  # Top Left corners
+        lines.append((x + 0 + offset, cy))
+        offset = 0 if rounded_corners[2] == 0 else prior[0]  # Top Right corners
+        lines.append((x + w - offset, cy))
+        # Middle section
+        next_y = cy - 1
+        last_y = y - h + coords[-1][1]
+        while next_y > last_y:
+            lines.append((x + 0, next_y))
+            lines.append((x + w, next_y))
+            next_y -= 1
+        # Bottom section
+        prior = (-1, -1)
+        for c in reversed(coords):
+            if c[1] != prior[1]:
+                cy = y - h + c[1]
+                offset = 0 if rounded_corners[0] == 0 else c[0]  # Bottom Left corners
+                lines.append((x + 0 + offset, cy))
+                offset = 0 if rounded_corners[3] == 0 else c[0]  # Bottom Right corners
+                lines.append((x + w - offset, cy))
+            prior = c
+        return tuple(lines)
+
+
+# --- ### Text metrics cache
+# The measurements depend on the font and on its size, so the cache is cleared whenever any preference that
+# changes the interface font or its rendering is modified (the scaled sizes are already part of the key).
+
+TEXT_CACHE_SIZE = 1024
+text_metrics_state = [None]
+
+
+def text_metrics_signature():
+    snapshot = frame_snapshot()
+    if snapshot is not None:
+        return snapshot["text_signature"]
+    prefs = bpy.context.preferences
+    return (prefs.view.ui_scale, prefs.view.font_path_ui, prefs.ui_styles[0].widget.points, prefs.themes[0].name)
+
+
+def text_dimensions(font_id, size, kerning, text):
+    """ Returns the same (width, height) as blf.dimensions() for the text in the given font size
+        Arguments:
+            @font_id (int):     font id as used by blf (0 is Blender's interface font)
+            @size (float):      font size
+            @kerning (bool):    whether the font kerning must be enabled for the measurement
+            @text (str):        text to be measured
+    """
+    verify_text_metrics()
+    return measure_text(font_id, size, kerning, text)
+
+
+def text_prefix_widths(font_id, size, kerning, text):
+    """ Returns a tuple with the width of every prefix of the text, from the empty one up to the full text,
+        so that item [i] is the width of text[:i]. Arguments are the same as for 'text_dimensions' function.
+    """
+    verify_text_metrics()
+    return measure_prefixes(font_id, size, kerning, text)
+
+
+def verify_text_metrics():
+    # Cached measurements are no longer valid when any of these settings has changed
+    signature = text_metrics_signature()
+    if signature != text_metrics_state[0]:
+        measure_text.cache_clear()
+        measure_prefixes.cache_clear()
+        text_metrics_state[0] = signature
+
+
+@lru_cache(maxsize=TEXT_CACHE_SIZE)
+def measure_text(font_id, size, kerning, text):
+    if kerning:
+        blf.enable(font_id, blf.KERNING_DEFAULT)
+    blf.size(font_id, size, 72)
+    dimensions = tuple(blf.dimensions(font_id, text))
+    if kerning:
+        blf.disable(font_id, blf.KERNING_DEFAULT)
+    return dimensions
+
+
+@lru_cache(maxsize=64)
+def measure_prefixes(font_id, size, kerning, text):
+    if kerning:
+        blf.enable(font_id, blf.KERNING_DEFAULT)
+    blf.size(font_id, size, 72)
+    widths = (0,) + tuple(blf.dimensions(font_id, text[:i])[0] for i in range(1, len(text) + 1))
+    if kerning:
+        blf.disable(font_id, blf.KERNING_DEFAULT)
+    return widths
+
+
+@lru_cache(maxsize=16)
+def mapped_coords(radius):
+    '''
+        Disclaimer:  I decided to use a combination of LINES and POINTS shaders instead of TRIS
+        because the BGL was making some funny business with the rounded corners by not respecting
+        the set of informed points, thus causing ugly assymetric results. The maps in here were
+        manually created by me and they should always give a nice contour.
+        May the god of I.T. forgive me!
+    '''
+    map = [( 0,),
+           ( 1, 0),
+           ( 2, 0, 1),
+           ( 3, 0, 2, 1, 1),
+           ( 4, 0, 3, 1, 2, 1),
+           ( 5, 0, 4, 1, 3, 1, 2),
+           ( 6, 0, 5, 1, 4, 1, 3, 2, 2),
+           ( 7, 0, 6, 1, 5, 1, 4, 2, 3, 2),
+           ( 8, 0, 7, 1, 6, 1, 5, 2, 4, 2, 3),
+           ( 9, 0, 8, 1, 7, 1, 6, 2, 5, 2, 4, 3),
+           (10, 0, 9, 1, 8, 1, 7, 1, 6, 2, 5, 2, 4, 3),
+           ]
+    i = 0
+    coords = []
+    pointset = map[radius] + tuple(reversed(map[radius]))
+    while i < len(pointset):
+        coords.append((pointset[i], pointset[i+1]))
+        i = i + 2
+    return tuple(coords)
+
+
+def geometry_cache_benchmark(count=200, passes=10):
+    """ Diagnostic: prints the time taken to relayout a panel of widgets with and without the geometry cache
+        (run by the Remote Control operator only when its DEBUG flag is set)
+        Arguments:
+            @count (int):       number of widgets in the panel (a mix of a few sizes and roundness, as in a real panel)
+            @passes (int):      number of relayouts (the best time is reported)
+    """
+    shapes = [(90 + (i % 4) * 10, 22 + (i % 3) * 2, i % 8, (1, 1, 1, 1) if i % 5 else (1, 1, 0, 0)) for i in range(count)]
+    selections = (('trifan', 'FULL'), ('trifan', 'SHADOW'), ('lines', 'FULL'), ('lines', 'OUTLINE-A'), ('lines', 'OUTLINE-B'))
+
+    def relayout(trifan, lines):
+        for i, (width, height, r, corners) in enumerate(shapes):
+            x = 10 + (i % 10) * 100
+            y = 600 - (i // 10) * 25
+            for method, selection in selections:
+                calc = trifan if method == 'trifan' else lines
+                [(x + cx, y + cy) for cx, cy in calc(width, height, r, corners, selection)]
+
+    timings = []
+    for trifan, lines in ((trifan_corners.__wrapped__, lines_corners.__wrapped__), (trifan_corners, lines_corners)):
+        best = None
+        for p in range(passes):
+            start = time.perf_counter()
+            relayout(trifan, lines)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        timings.append(best * 1000)
+    print(f"geometry_cache_benchmark: {count} widgets  uncached {timings[0]:.2f} ms  /  cached {timings[1]:.2f} ms  "
+          f"({trifan_corners.cache_info().currsize + lines_corners.cache_info().currsize} shapes in cache)")
+    return tuple(timings)
@@ -23,7 +23,7 @@ Reference Cameras add-on
 bl_info = {"name": "Reference Cameras Control Panel",
            "description": "Handles cameras associated with reference photos",
            "author": "Marcelo M. Marques (fork of Witold Jaworski's & Jayanam's projects)",
-           "version": (1, 0, 2),
+           "version": (1, 0, 3),
            "blender": (2, 80, 75),
            "location": "View3D > side panel ([N]), [Cameras] tab",
            "support": "COMMUNITY",
@@ -35,6 +35,10 @@ bl_info = {"name": "Reference Cameras Control Panel",
 
 # --- ### Change log
 
+# v1.0.3 (10.18.2026)
+# Added: new 'RC_CACHE_DIR' and 'RC_EDGE_SIZE' properties for the reference image processing cache (edge maps)
+# Added: new 'RC_PIXEL_CACHE', 'RC_PIXEL_FORMAT' and 'RC_PIXEL_SIZE' properties for the decoded pixels cache
+
 # v1.0.2 (10.31.2021) - by Marcelo M. Marques
 # Added: new 'RC_BLINK_ALT' property to configure alternative operation mode of the Blink Mesh(es) function
 # Added: new 'update_subpanel' helper function to reinitialize the "panel_switch" variables after property's been updated.
@@ -200,6 +204,49 @@ class ReferenceCameraPreferences(AddonPreferences):
         default='FRONT'
     )
 
+    RC_CACHE_DIR: StringProperty(
+        name="",
+        description="Folder where processed reference images (edge maps, etc) are cached between sessions.\nIf left blank a folder inside Blender's user configuration folder is used",
+        default="",
+        subtype='DIR_PATH'
+    )
+
+    RC_EDGE_SIZE: IntProperty(
+        name="",
+        description="Maximum width or height, in pixels, of the edge maps computed from the reference images",
+        default=2048,
+        max=8192,
+        min=256,
+        soft_max=4096,
+        soft_min=256
+    )
+
+    RC_PIXEL_CACHE: BoolProperty(
+        name="Cache decoded reference images",
+        description="If (ON): the decoded pixels of the reference images are cached on disk and loaded from there when a camera is set,\ninstead of decoding the original image file again",
+        default=False
+    )
+
+    # items=[identifier, name, description, icon, number]
+    RC_PIXEL_FORMAT: EnumProperty(
+        name="Pixel format of the decoded images cache",
+        items=[
+            ('UINT8',   "8 bits",  "One byte per channel (compact, good for regular JPG/PNG photos).", '', 0),
+            ('FLOAT16', "16 bits", "Half float per channel (keeps the precision of 16 bits or HDR images).", '', 1)
+        ],
+        default='UINT8'
+    )
+
+    RC_PIXEL_SIZE: IntProperty(
+        name="",
+        description="Maximum width or height, in pixels, of the cached images (they are downsampled when larger).  Set it to zero to keep full resolution",
+        default=0,
+        max=16384,
+        min=0,
+        soft_max=8192,
+        soft_min=0
+    )
+
     RC_UI_BIND: BoolProperty(
         name="General scaling for 'Remote Control' panel",
         description="If (ON): remote panel size changes per Blender interface's resolution scale.\nIf (OFF): remote panel size can only change per its own addon scaling factor",
@@ -387,6 +434,36 @@ class ReferenceCameraPreferences(AddonPreferences):
         row = splat.row()
         row.prop(self, 'RC_DEPTH', expand=True)
 
+        # -- Reference image processing
+
+        layout.separator()
+        box = layout.box()
+        box.ui_units_y = 1
+
+        layout.label(text=" Reference image processing")
+
+        split = layout.split(factor=0.45, align=True)
+        split.label(text="Cache folder:", icon='DECORATE')
+        splat = split.split(factor=0.8, align=True)
+        splat.prop(self, 'RC_CACHE_DIR', text="")
+
+        split = layout.split(factor=0.45, align=True)
+        split.label(text="Edge map max size (pixels):", icon='DECORATE')
+        splat = split.split(factor=0.4, align=True)
+        splat.prop(self, 'RC_EDGE_SIZE', text="")
+
+        split = layout.split(factor=0.45, align=True)
+        split.label(text="Decoded images cache:", icon='DECORATE')
+        splat = split.split(factor=0.8, align=True)
+        splat.prop(self, 'RC_PIXEL_CACHE', text=" Load reference images from cache")
+
+        split = layout.split(factor=0.45, align=True)
+        split.label(text="Cache pixel format / max size:", icon='DECORATE')
+        splat = split.split(factor=0.8, align=True)
+        row = splat.row()
+        row.prop(self, 'RC_PIXEL_FORMAT', expand=True)
+        row.prop(self, 'RC_PIXEL_SIZE', text="")
+
         # -- Remote Control Panel configuration
 
         layout.separator()